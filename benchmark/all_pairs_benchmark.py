@@ -0,0 +1,50 @@
+"""
+Compares the all-pairs shortest path engines (Floyd-Warshall, Dijkstra from every vertex, Bellman-Ford from every
+vertex) on random directed graphs of growing density
+Usage (from the root of the project): python -m benchmark.all_pairs_benchmark [nr of vertices]
+"""
+import random
+import sys
+import time
+
+from domain.graph import Graph
+from service.service import Service
+
+
+def random_directed_graph(n, m, seed=0):
+    """:return: a directed graph with n vertices, m distinct random edges and costs between 1 and 100"""
+    rng = random.Random(seed)
+    graph = Graph(0, 0)
+    for v in range(n):
+        graph.add_vertex(v)
+    while graph.get_nr_edges() < m:
+        v1, v2 = rng.randrange(n), rng.randrange(n)
+        if v1 != v2 and not graph.is_edge(v1, v2):
+            graph.add_edge(v1, v2, rng.randint(1, 100))
+    return graph
+
+
+def timed(function, *args):
+    start = time.perf_counter()
+    result = function(*args)
+    return time.perf_counter() - start, result
+
+
+def main():
+    n = int(sys.argv[1]) if len(sys.argv) > 1 else 200
+    print("%6s %8s %14s %14s %14s" % ("V", "E", "floyd", "dijkstra loop", "bellman loop"))
+    for density in (0.02, 0.1, 0.5):
+        m = int(n * (n - 1) * density)
+        srv = Service()
+        srv.add_graph(random_directed_graph(n, m))
+        floyd_time, (vertices, matrix) = timed(srv.floyd_warshall, 0)
+        dijkstra_time, rows = timed(lambda: [srv.single_source_distances(0, v) for v in vertices])
+        bellman_time, _ = timed(lambda: [srv.bellman_ford(0, v) for v in vertices])
+        for i, row in enumerate(rows):
+            for j, v in enumerate(vertices):
+                assert matrix[i][j] == row.get(v, float("inf"))
+        print("%6d %8d %13.3fs %13.3fs %13.3fs" % (n, m, floyd_time, dijkstra_time, bellman_time))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,111 @@
+"""
+Stress test of the thread-safe Service: reader threads run quick queries on one undirected graph for a fixed time,
+while a writer thread adds, removes and changes edges (both directions at once, with apply_batch) and another thread
+keeps running Prim's algorithm on snapshots of the graph.
+For every number of reader threads it prints the read throughput, the write throughput and the p99 and worst write
+latencies, so that it shows how the reads scale with the threads and that the long Prim runs do not block the writer
+(with the global interpreter lock the reads of pure Python code can not run in parallel, so their throughput only
+grows with the threads on a free-threaded build of Python, and the worst latencies mostly measure how long a thread
+waits for the interpreter lock)
+Usage (from the root of the project):
+    python -m benchmark.concurrency_benchmark [--vertices 10000] [--threads 1 2 4 8] [--seconds 2] [--no-writer]
+                                              [--no-prim]
+"""
+import argparse
+import os
+import random
+import sys
+import tempfile
+import threading
+import time
+
+from benchmark.suite import random_edges, write_undirected
+from console.batch import percentile
+from service.service import Service
+
+
+def reader(srv, gi, vertices, stop, counts, seed):
+    rng = random.Random(seed)
+    done = 0
+    while not stop.is_set():
+        v1, v2 = rng.choice(vertices), rng.choice(vertices)
+        srv.check_if_edge(v1, v2, gi)
+        srv.get_out_degree(v1, gi)
+        srv.get_outbound_edges(v2, gi)
+        done += 3
+    counts.append(done)
+
+
+def writer(srv, gi, vertices, stop, latencies, seed):
+    rng = random.Random(seed)
+    while not stop.is_set():
+        v1, v2 = rng.choice(vertices), rng.choice(vertices)
+        cost = rng.randint(1, 1000)
+        start = time.perf_counter()
+        if srv.check_if_edge(v1, v2, gi):
+            srv.apply_batch(gi, [("set_cost", v1, v2, cost), ("set_cost", v2, v1, cost)])
+        elif v1 != v2:
+            srv.apply_batch(gi, [("add", v1, v2, cost), ("add", v2, v1, cost)])
+            srv.apply_batch(gi, [("remove", v1, v2), ("remove", v2, v1)])
+        latencies.append(time.perf_counter() - start)
+
+
+def long_reader(srv, gi, start_vertex, stop, runs):
+    while not stop.is_set():
+        srv.prim_algorithm(gi, start_vertex)
+        runs.append(1)
+
+
+def run(srv, gi, threads, seconds, with_writer, with_prim):
+    """:return: the tuple (reads per second, writes per second, sorted write latencies in seconds, Prim runs)"""
+    vertices = list(srv.get_vertices(gi))
+    stop = threading.Event()
+    counts, latencies, runs = [], [], []
+    workers = [threading.Thread(target=reader, args=(srv, gi, vertices, stop, counts, i)) for i in range(threads)]
+    if with_writer:
+        workers.append(threading.Thread(target=writer, args=(srv, gi, vertices, stop, latencies, -1)))
+    if with_prim:
+        workers.append(threading.Thread(target=long_reader, args=(srv, gi, vertices[0], stop, runs)))
+    for worker in workers:
+        worker.start()
+    time.sleep(seconds)
+    stop.set()
+    for worker in workers:
+        worker.join()
+    return sum(counts) / seconds, len(latencies) / seconds, sorted(latencies), len(runs)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Measures the Service under concurrent readers and writers.")
+    parser.add_argument("--vertices", type=int, default=10000, help="the number of vertices of the random graph")
+    parser.add_argument("--degree", type=int, default=8, help="the average degree of the random graph")
+    parser.add_argument("--threads", type=int, nargs="+", default=[1, 2, 4, 8], help="the numbers of reader threads")
+    parser.add_argument("--seconds", type=float, default=2.0, help="the duration of every measurement")
+    parser.add_argument("--no-writer", dest="writer", action="store_false", help="do not run the writer thread")
+    parser.add_argument("--no-prim", dest="prim", action="store_false", help="do not run Prim's algorithm meanwhile")
+    args = parser.parse_args()
+
+    srv = Service()
+    handle, path = tempfile.mkstemp(suffix=".txt")
+    os.close(handle)
+    try:
+        write_undirected(path, random_edges(args.vertices, args.degree, random.Random(0)))
+        gi = srv.load_graph(path)
+    finally:
+        os.remove(path)
+    edges = sum(srv.get_out_degree(v, gi) for v in srv.get_vertices(gi))
+    gil = getattr(sys, "_is_gil_enabled", lambda: True)()
+    print("random undirected graph: " + str(srv.get_nr_vertices(gi)) + " vertices, " + str(edges) + " edges, GIL " +
+          ("enabled" if gil else "disabled"))
+    print("%8s %12s %12s %16s %18s %10s" % ("readers", "reads/s", "writes/s", "p99 write (ms)", "worst write (ms)",
+                                            "prim runs"))
+    for threads in args.threads:
+        reads, writes, latencies, runs = run(srv, gi, threads, args.seconds, args.writer, args.prim)
+        print("%8d %12.0f %12.0f %16.3f %18.3f %10d" % (threads, reads, writes, percentile(latencies, 0.99) * 1000,
+                                                        (latencies[-1] if latencies else 0) * 1000, runs))
+    if sum(srv.get_out_degree(v, gi) for v in srv.get_vertices(gi)) != edges:
+        raise SystemExit("the writer must leave the graph with as many edges as it had!")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,51 @@
+"""
+Compares full copies of a graph against copy-on-write snapshots, in time and in memory
+Usage (from the root of the project): python -m benchmark.copy_benchmark [graph file] [nr of copies]
+"""
+import sys
+import time
+import tracemalloc
+
+from domain.graph import Graph
+
+
+def full_copy(graph):
+    copy = Graph(graph.get_nr_vertices(), graph.get_nr_edges())
+    copy.set_n_out(graph.get_copy_of_outs())
+    copy.set_n_in(graph.get_copy_of_ins())
+    copy.set_costs(graph.get_copy_of_edges())
+    return copy
+
+
+def make_copies(graph, copy_function, count):
+    """
+    :return: the pair (seconds, peak bytes) of making count copies of the graph and changing one edge in each
+    """
+    v1 = next(v for v in graph.get_vertices() if graph.get_out_degree(v) > 0)
+    v2 = graph.get_n_out(v1)[0]
+    tracemalloc.start()
+    start = time.perf_counter()
+    copies = []
+    for _ in range(count):
+        copy = copy_function(graph)
+        copy.remove_edge(v1, v2)
+        copies.append(copy)
+    elapsed = time.perf_counter() - start
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+    return elapsed, peak
+
+
+def main():
+    path = sys.argv[1] if len(sys.argv) > 1 else "graph10k.txt"
+    count = int(sys.argv[2]) if len(sys.argv) > 2 else 20
+    graph = Graph.from_file(path)
+    print("graph: " + path + " (" + str(graph.get_nr_vertices()) + " vertices, " + str(graph.get_nr_edges()) +
+          " edges), " + str(count) + " copies with one edge removed from each")
+    for name, function in (("full copy", full_copy), ("snapshot", Graph.snapshot)):
+        elapsed, peak = make_copies(graph, function, count)
+        print("%-10s %9.4f s %10.1f MiB" % (name, elapsed, peak / 2 ** 20))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,56 @@
+"""
+Times the bulk text loader and writer against building the same graph with add_vertex/add_edge, and the external
+(out-of-core) conversion into a memory-mapped snapshot
+Usage (from the root of the project): python -m benchmark.load_benchmark [graph file] [repeats]
+"""
+import os
+import sys
+import tempfile
+import time
+
+from domain.external_csr import load_external
+from domain.graph import Graph
+
+
+def load_one_by_one(path):
+    with open(path) as file:
+        n, m = map(int, file.readline().split())
+        graph = Graph(0, 0)
+        for v in range(n):
+            graph.add_vertex(v)
+        for line in file:
+            tokens = line.split()
+            if len(tokens) == 3:
+                graph.add_edge(int(tokens[0]), int(tokens[1]), int(tokens[2]))
+    return graph
+
+
+def best_of(repeats, function, *args):
+    best = None
+    for _ in range(repeats):
+        start = time.perf_counter()
+        function(*args)
+        elapsed = time.perf_counter() - start
+        if best is None or elapsed < best:
+            best = elapsed
+    return best
+
+
+def main():
+    path = sys.argv[1] if len(sys.argv) > 1 else "graph10k.txt"
+    repeats = int(sys.argv[2]) if len(sys.argv) > 2 else 5
+    graph = Graph.from_file(path)
+    output = os.path.join(tempfile.mkdtemp(), "graph_output.txt")
+    print("graph: " + path + " (" + str(graph.get_nr_vertices()) + " vertices, " + str(graph.get_nr_edges()) +
+          " edges), best of " + str(repeats))
+    print("add_vertex/add_edge loop: %.4f s" % best_of(repeats, load_one_by_one, path))
+    print("Graph.from_file:          %.4f s" % best_of(repeats, Graph.from_file, path))
+    print("Graph.to_file:            %.4f s" % best_of(repeats, graph.to_file, output))
+    os.remove(output)
+    snapshot = os.path.join(os.path.dirname(output), "graph.csr")
+    print("load_external:            %.4f s" % best_of(repeats, load_external, path, snapshot))
+    os.remove(snapshot)
+
+
+if __name__ == "__main__":
+    main()
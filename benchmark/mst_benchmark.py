@@ -0,0 +1,64 @@
+"""
+Compares Prim's and Kruskal's algorithms (and BFS against union-find components) on random undirected graphs
+of growing density
+Usage (from the root of the project): python -m benchmark.mst_benchmark [nr of vertices] [repeats]
+"""
+import random
+import sys
+import time
+
+from domain.graph import Graph
+from service.service import Service
+
+
+def random_undirected_graph(n, m, seed=0):
+    """
+    :return: a connected undirected graph (every edge stored in both directions) with n vertices and about m edges
+    """
+    rng = random.Random(seed)
+    graph = Graph(0, 0)
+    for v in range(n):
+        graph.add_vertex(v)
+    pairs = set()
+    for v in range(1, n):               # a random spanning tree keeps the graph connected
+        pairs.add((rng.randrange(v), v))
+    while len(pairs) < m:
+        v1, v2 = rng.randrange(n), rng.randrange(n)
+        if v1 != v2 and (v1, v2) not in pairs and (v2, v1) not in pairs:
+            pairs.add((v1, v2))
+    for v1, v2 in pairs:
+        cost = rng.randint(1, 1000)
+        graph.add_edge(v1, v2, cost)
+        graph.add_edge(v2, v1, cost)
+    return graph
+
+
+def best_of(repeats, function, *args):
+    best = None
+    for _ in range(repeats):
+        start = time.perf_counter()
+        result = function(*args)
+        elapsed = time.perf_counter() - start
+        if best is None or elapsed < best:
+            best = elapsed
+    return best, result
+
+
+def main():
+    n = int(sys.argv[1]) if len(sys.argv) > 1 else 2000
+    repeats = int(sys.argv[2]) if len(sys.argv) > 2 else 3
+    print("%8s %10s %10s %10s %10s %10s" % ("V", "E", "prim", "kruskal", "bfs", "union-find"))
+    for density in (2, 8, 32, 128):
+        m = min(n * density, n * (n - 1) // 2)
+        srv = Service()
+        srv.add_graph(random_undirected_graph(n, m))
+        prim_time, (prim_edges, prim_cost) = best_of(repeats, srv.prim_algorithm, 0, 0)
+        kruskal_time, (kruskal_edges, kruskal_cost) = best_of(repeats, srv.kruskal_algorithm, 0)
+        assert prim_cost == kruskal_cost
+        bfs_time, _ = best_of(repeats, srv.label_components, 0)
+        union_find_time, _ = best_of(repeats, srv.components_union_find, 0)
+        print("%8d %10d %9.4fs %9.4fs %9.4fs %9.4fs" % (n, m, prim_time, kruskal_time, bfs_time, union_find_time))
+
+
+if __name__ == "__main__":
+    main()
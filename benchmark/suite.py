@@ -0,0 +1,197 @@
+"""
+Benchmark suite timing the main Service algorithms on synthetic graphs of growing size and recording their peak
+memory, so that runs made before and after a change can be compared
+Every graph is undirected (each edge is stored in both directions with the same cost), as Prim's algorithm and the
+Hamiltonian cycle approximation expect
+Usage (from the root of the project):
+    python -m benchmark.suite [--sizes 1000 10000 100000] [--generators random grid scale_free] [--repeats 3]
+                              [--output results.json] [--compare old_results.json] [--no-memory]
+"""
+import argparse
+import json
+import math
+import os
+import platform
+import random
+import sys
+import tempfile
+import time
+import tracemalloc
+
+from domain.graph import Graph
+from domain.graph_file import write_graph_file
+from service.service import Service
+
+
+def random_edges(n, degree, rng):
+    """:return: the dictionary {(v1, v2): cost} of a connected random graph with about degree * n / 2 edges"""
+    edges = {}
+    for v in range(1, n):               # a random spanning tree keeps the graph connected
+        edges[(rng.randrange(v), v)] = rng.randint(1, 1000)
+    target = max(n - 1, degree * n // 2)
+    while len(edges) < target:
+        v1, v2 = rng.randrange(n), rng.randrange(n)
+        if v1 != v2 and (v2, v1) not in edges:
+            edges[(v1, v2)] = rng.randint(1, 1000)
+    return edges
+
+
+def grid_edges(n, degree, rng):
+    """:return: the dictionary {(v1, v2): cost} of a square grid with about n vertices (degree is ignored)"""
+    side = max(1, int(math.sqrt(n)))
+    edges = {}
+    for row in range(side):
+        for column in range(side):
+            v = row * side + column
+            if column + 1 < side:
+                edges[(v, v + 1)] = rng.randint(1, 1000)
+            if row + 1 < side:
+                edges[(v, v + side)] = rng.randint(1, 1000)
+    return edges
+
+
+def scale_free_edges(n, degree, rng):
+    """
+    :return: the dictionary {(v1, v2): cost} of a Barabasi-Albert graph: every new vertex is linked to degree / 2
+             existing vertices chosen with a probability proportional to their degree
+    """
+    links = max(1, degree // 2)
+    edges = {}
+    ends = []           # every vertex appears once for each of its edges
+    for v in range(1, n):
+        targets = set()
+        while len(targets) < min(links, v):
+            targets.add(rng.choice(ends) if ends and rng.random() < 0.9 else rng.randrange(v))
+        for u in targets:
+            edges[(u, v)] = rng.randint(1, 1000)
+            ends.append(u)
+            ends.append(v)
+    return edges
+
+
+GENERATORS = {"random": random_edges, "grid": grid_edges, "scale_free": scale_free_edges}
+
+
+def write_undirected(path, edges):
+    """Writes the graph with every edge in both directions and returns its number of vertices"""
+    n = 1 + max(max(pair) for pair in edges) if edges else 1
+    both = dict(edges)
+    both.update(((v2, v1), cost) for (v1, v2), cost in edges.items())
+    write_graph_file(path, n, both)
+    return n
+
+
+def measure(repeats, memory, setup, function):
+    """
+    :param setup: a function called before every run, whose result is passed to function (and is not timed)
+    :return: the pair (best time in seconds, peak memory in bytes or None) of function
+    """
+    best = None
+    for _ in range(repeats):
+        argument = setup()
+        start = time.perf_counter()
+        function(argument)
+        elapsed = time.perf_counter() - start
+        if best is None or elapsed < best:
+            best = elapsed
+    peak = None
+    if memory:
+        argument = setup()
+        tracemalloc.start()
+        function(argument)
+        peak = tracemalloc.get_traced_memory()[1]
+        tracemalloc.stop()
+    return best, peak
+
+
+def run_graph(path, repeats, memory, tsp_mode):
+    """
+    :return: the list of (operation, seconds, peak bytes) measured on the graph file. The long algorithms are timed
+             on both engines: on the editable graph, which a cost edit (not timed) before every run keeps from being
+             converted to its CSR form after DENSE_AFTER runs, and, as "<operation>[csr]", on a frozen CSR copy
+    """
+    srv = Service(cache_limit=0)
+    gi = srv.load_graph(path)
+    srv.freeze_graph(gi)
+    frozen = srv.get_nr_graphs() - 1
+    last = max(srv.get_vertices(gi))
+    neighbour = srv.get_n_out(0, gi)[0]
+    cost = srv.get_cost_of_edge(0, neighbour, gi)
+
+    def edited():
+        srv.set_cost_of_edge(0, neighbour, cost, gi)    # a new version, so the next run starts on the dict engine
+        return gi
+
+    def fresh_copy(_):
+        srv.create_copy(gi)
+        srv.delete_graph(srv.get_nr_graphs() - 1)
+
+    operations = [
+        ("load", lambda: path, Graph.from_file),
+        ("bfs_components", lambda: gi, lambda g: srv.bfs_components(g, materialise=False)),
+        ("create_copy", lambda: gi, fresh_copy),
+    ]
+    for name, function in [("dijkstra_algorithm", lambda g: srv.dijkstra_algorithm(g, last, 0)),
+                           ("prim_algorithm", lambda g: srv.prim_algorithm(g, 0)),
+                           ("tsp_approximation", lambda g: srv.tsp_approximation(g, 0, tsp_mode))]:
+        operations.append((name, edited, function))
+        operations.append((name + "[csr]", lambda: frozen, function))
+    results = []
+    for name, setup, function in operations:
+        seconds, peak = measure(repeats, memory, setup, function)
+        results.append((name, seconds, peak))
+    return results
+
+
+def compare(results, baseline_path):
+    with open(baseline_path) as file:
+        baseline = {(r["generator"], r["vertices"], r["operation"]): r["seconds"] for r in json.load(file)["results"]}
+    print("\n%-11s %9s %-24s %10s %10s %8s" % ("generator", "V", "operation", "before", "after", "speedup"))
+    for r in results:
+        before = baseline.get((r["generator"], r["vertices"], r["operation"]))
+        if before is not None:
+            print("%-11s %9d %-24s %9.4fs %9.4fs %7.2fx" % (r["generator"], r["vertices"], r["operation"], before,
+                                                          r["seconds"], before / r["seconds"] if r["seconds"] else 0))
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Times the Service algorithms on synthetic graphs.")
+    parser.add_argument("--sizes", type=int, nargs="+", default=[1000, 10000, 100000],
+                        help="the numbers of vertices of the generated graphs")
+    parser.add_argument("--generators", nargs="+", choices=sorted(GENERATORS), default=sorted(GENERATORS))
+    parser.add_argument("--degree", type=int, default=8, help="the average degree of the random/scale-free graphs")
+    parser.add_argument("--repeats", type=int, default=3, help="every operation is timed this many times")
+    parser.add_argument("--tsp-mode", choices=["double_tree", "christofides"], default="double_tree")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--output", default="benchmark_results.json", help="the JSON file the results are written in")
+    parser.add_argument("--compare", help="a JSON results file of an earlier run to compare with")
+    parser.add_argument("--no-memory", dest="memory", action="store_false", help="do not measure the peak memory")
+    args = parser.parse_args()
+
+    results = []
+    directory = tempfile.mkdtemp()
+    print("%-11s %9s %10s %-24s %10s %10s" % ("generator", "V", "E", "operation", "seconds", "peak MiB"))
+    for generator in args.generators:
+        for size in args.sizes:
+            edges = GENERATORS[generator](size, args.degree, random.Random(args.seed))
+            path = os.path.join(directory, generator + "_" + str(size) + ".txt")
+            n = write_undirected(path, edges)
+            m = 2 * len(edges)
+            for operation, seconds, peak in run_graph(path, args.repeats, args.memory, args.tsp_mode):
+                results.append({"generator": generator, "vertices": n, "edges": m, "operation": operation,
+                                "seconds": seconds, "peak_bytes": peak})
+                print("%-11s %9d %10d %-24s %9.4fs %10s" % (generator, n, m, operation, seconds,
+                                                             "-" if peak is None else "%.1f" % (peak / 2 ** 20)))
+            os.remove(path)
+    os.rmdir(directory)
+    report = {"python": sys.version.split()[0], "platform": platform.platform(), "time": time.time(),
+              "repeats": args.repeats, "degree": args.degree, "seed": args.seed, "results": results}
+    with open(args.output, "w") as file:
+        json.dump(report, file, indent=1)
+    print("\nresults written in " + args.output)
+    if args.compare:
+        compare(results, args.compare)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,73 @@
+"""
+Times the bulk removal of vertices from a graph, against the same removal done on neighbour lists with list.remove,
+as the graph used to store them. Some hub vertices linked in both directions with every other vertex are added to the
+graph first and the other vertices are removed, so the neighbour lists of the hubs shrink by one on every removal
+Usage (from the root of the project):
+    python -m benchmark.vertex_removal_benchmark [graph file] [nr of vertices] [nr of hubs]
+"""
+import sys
+import time
+
+from domain.graph import Graph
+
+
+def add_hubs(graph, count):
+    vertices = list(graph.get_vertices())
+    ops = []
+    for hub in range(-count, 0):
+        graph.add_vertex(hub)
+        for v in vertices:
+            ops.append(("add", hub, v, 1))
+            ops.append(("add", v, hub, 1))
+    graph.apply_batch(ops)
+
+
+def remove_with_lists(graph, vertices):
+    outs = {v: list(graph.get_n_out(v)) for v in graph.get_vertices()}
+    ins = {v: list(graph.get_n_in(v)) for v in graph.get_vertices()}
+    costs = graph.get_copy_of_edges()
+    start = time.perf_counter()
+    for v1 in vertices:
+        for out_v in outs.pop(v1):
+            costs.pop((v1, out_v))
+            if out_v != v1:
+                ins[out_v].remove(v1)
+        for v in ins.pop(v1):
+            if v != v1:
+                costs.pop((v, v1))
+                outs[v].remove(v1)
+    return time.perf_counter() - start
+
+
+def remove_with_graph(graph, vertices):
+    start = time.perf_counter()
+    for v in vertices:
+        graph.remove_vertex(v)
+    return time.perf_counter() - start
+
+
+def check(graph):
+    for v in graph.get_vertices():
+        for x in graph.get_n_out(v):
+            assert v in graph.get_n_in(x) and graph.is_edge(v, x)
+        for x in graph.get_n_in(v):
+            assert v in graph.get_n_out(x) and graph.is_edge(x, v)
+    assert graph.get_nr_edges() == sum(graph.get_out_degree(v) for v in graph.get_vertices())
+
+
+def main():
+    path = sys.argv[1] if len(sys.argv) > 1 else "graph10k.txt"
+    graph = Graph.from_file(path)
+    count = int(sys.argv[2]) if len(sys.argv) > 2 else graph.get_nr_vertices() // 2
+    add_hubs(graph, int(sys.argv[3]) if len(sys.argv) > 3 else 10)
+    vertices = [v for v in graph.get_vertices() if v >= 0][:count]
+    print("graph: " + path + " (" + str(graph.get_nr_vertices()) + " vertices, " + str(graph.get_nr_edges()) +
+          " edges), removing " + str(len(vertices)) + " vertices")
+    print("neighbour lists:     %.4f s" % remove_with_lists(graph, vertices))
+    print("Graph.remove_vertex: %.4f s" % remove_with_graph(graph, vertices))
+    check(graph)
+    print("left: " + str(graph.get_nr_vertices()) + " vertices, " + str(graph.get_nr_edges()) + " edges")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,249 @@
+"""
+Non-interactive runner of the console queries: the queries are read from a file, dispatched to the same Service
+methods the Console menu uses and their results are streamed to an output file as JSON lines, followed by a report
+of the throughput and of the latency percentiles
+Input formats (one query per line):
+    JSON lines - {"op": "shortest_path", "args": [0, 5], "id": 17, "graph": 0}  ("id" and "graph" are optional)
+    CSV        - shortest_path,0,5  (lines starting with # are skipped)
+Usage (from the root of the project):
+    python -m console.batch graph_file query_file [--output results.jsonl] [--format jsonl|csv] [--snapshot]
+                                                  [--string-ids]
+"""
+import argparse
+import csv
+import json
+import math
+import sys
+import time
+
+from domain.graph_file import parse_number, parse_vertex
+from errors.exceptions import GraphError
+from service.service import Service
+
+
+def percentile(ordered, fraction):
+    """
+    :param ordered: the sorted list of values
+    :param fraction: the wanted percentile, between 0 and 1
+    :return: the nearest-rank percentile of the values (0 if there are none)
+    """
+    if not ordered:
+        return 0
+    rank = max(1, math.ceil(fraction * len(ordered)))
+    return ordered[rank - 1]
+
+
+class BatchRunner:
+    def __init__(self, service):
+        self.__srv = service
+        self.__query_list = {"nr_vertices": self.__nr_vertices,
+                             "vertices": self.__vertices,
+                             "is_edge": self.__is_edge,
+                             "degree": self.__degree,
+                             "out_edges": self.__out_edges,
+                             "in_edges": self.__in_edges,
+                             "cost": self.__cost,
+                             "set_cost": self.__set_cost,
+                             "add_edge": self.__add_edge,
+                             "remove_edge": self.__remove_edge,
+                             "add_vertex": self.__add_vertex,
+                             "remove_vertex": self.__remove_vertex,
+                             "create_copy": self.__create_copy,
+                             "components": self.__components,
+                             "shortest_path": self.__shortest_path,
+                             "mst": self.__mst,
+                             "hamiltonian": self.__hamiltonian,
+                             }
+
+    def get_query_names(self):
+        """:return: the names of the supported queries"""
+        return list(self.__query_list)
+
+    def execute(self, op, args, gi=0):
+        """
+        Runs one query
+        :param op: the name of the query
+        :param args: the list of its arguments
+        :param gi: the index of the graph the query is run on
+        :return: the result of the query, made only of JSON types
+        """
+        if op not in self.__query_list:
+            raise GraphError("Unknown query: " + str(op))
+        if not 0 <= gi < self.__srv.get_nr_graphs():
+            raise GraphError("Nonexistent graph!")
+        return self.__query_list[op](gi, *args)
+
+    def run(self, queries, output):
+        """
+        Runs a sequence of queries, writing one JSON line for each of them; a failed query gets an "error" instead
+        of a "result" and does not stop the batch
+        :param queries: an iterable of dictionaries {"op", "args", optionally "id" and "graph"} or of JSON lines
+                        holding them, which are parsed one by one so that a malformed line is only a failed query
+        :param output: a text file-like object the results are written to
+        :return: the report dictionary with the number of queries and errors, the total seconds, the queries per
+                 second and the p50/p95/p99/max latencies in milliseconds
+        """
+        latencies = []
+        errors = 0
+        start = time.perf_counter()
+        for number, query in enumerate(queries):
+            line = {"id": number, "op": None}
+            began = time.perf_counter()
+            try:
+                if isinstance(query, str):
+                    query = json.loads(query)
+                if not isinstance(query, dict):
+                    raise GraphError("A query must be a JSON object!")
+                line["id"], line["op"] = query.get("id", number), query.get("op")
+                line["result"] = self.execute(query.get("op"), query.get("args", []), query.get("graph", 0))
+            except (GraphError, KeyError, ValueError, TypeError) as error:
+                line["error"] = str(error) if isinstance(error, GraphError) else \
+                    type(error).__name__ + ": " + str(error)
+                errors += 1
+            elapsed = time.perf_counter() - began
+            latencies.append(elapsed)
+            line["ms"] = round(elapsed * 1000, 3)
+            output.write(json.dumps(line) + "\n")
+        total = time.perf_counter() - start
+        latencies.sort()
+        return {"queries": len(latencies), "errors": errors, "seconds": total,
+                "queries_per_second": len(latencies) / total if total > 0 else 0.0,
+                "p50_ms": percentile(latencies, 0.50) * 1000, "p95_ms": percentile(latencies, 0.95) * 1000,
+                "p99_ms": percentile(latencies, 0.99) * 1000, "max_ms": (latencies[-1] if latencies else 0) * 1000}
+
+    def __check_vertices(self, gi, *vertices):
+        for v in vertices:
+            if not self.__srv.check_if_vertex(v, gi):
+                raise GraphError("Nonexistent vertex!")
+
+    def __check_edge(self, gi, v1, v2):
+        self.__check_vertices(gi, v1, v2)
+        if not self.__srv.check_if_edge(v1, v2, gi):
+            raise GraphError("Nonexistent edge!")
+
+    def __nr_vertices(self, gi):
+        return self.__srv.get_nr_vertices(gi)
+
+    def __vertices(self, gi):
+        return sorted(self.__srv.get_vertices(gi))
+
+    def __is_edge(self, gi, v1, v2):
+        self.__check_vertices(gi, v1, v2)
+        return self.__srv.check_if_edge(v1, v2, gi)
+
+    def __degree(self, gi, v1):
+        self.__check_vertices(gi, v1)
+        return {"in": self.__srv.get_in_degree(v1, gi), "out": self.__srv.get_out_degree(v1, gi)}
+
+    def __out_edges(self, gi, v1):
+        self.__check_vertices(gi, v1)
+        return [[v, u, cost] for (v, u), cost in self.__srv.get_outbound_edges(v1, gi).items()]
+
+    def __in_edges(self, gi, v1):
+        self.__check_vertices(gi, v1)
+        return [[v, u, cost] for (v, u), cost in self.__srv.get_inbound_edges(v1, gi).items()]
+
+    def __cost(self, gi, v1, v2):
+        self.__check_edge(gi, v1, v2)
+        return self.__srv.get_cost_of_edge(v1, v2, gi)
+
+    def __set_cost(self, gi, v1, v2, new_cost):
+        self.__check_edge(gi, v1, v2)
+        self.__srv.set_cost_of_edge(v1, v2, new_cost, gi)
+        return True
+
+    def __add_edge(self, gi, v1, v2, cost):
+        self.__check_vertices(gi, v1, v2)
+        return self.__srv.add_new_edge(v1, v2, cost, gi)
+
+    def __remove_edge(self, gi, v1, v2):
+        self.__check_edge(gi, v1, v2)
+        return self.__srv.remove_an_edge(v1, v2, gi)
+
+    def __add_vertex(self, gi, v1):
+        if self.__srv.check_if_vertex(v1, gi):
+            raise GraphError("Vertex already exists!")
+        self.__srv.add_new_vertex(v1, gi)
+        return True
+
+    def __remove_vertex(self, gi, v1):
+        self.__check_vertices(gi, v1)
+        self.__srv.remove_vertex(v1, gi)
+        return True
+
+    def __create_copy(self, gi):
+        self.__srv.create_copy(gi)
+        return self.__srv.get_nr_graphs() - 1
+
+    def __components(self, gi):
+        return [vertices for vertices, index in self.__srv.bfs_components(gi, materialise=False)]
+
+    def __shortest_path(self, gi, v1, v2):
+        self.__check_vertices(gi, v1, v2)
+        path, cost = self.__srv.shortest_path(gi, v1, v2)
+        return {"path": path, "cost": cost}
+
+    def __mst(self, gi, start_vertex):
+        self.__check_vertices(gi, start_vertex)
+        edges, total_cost = self.__srv.prim_algorithm(gi, start_vertex)
+        return {"edges": sorted(edges), "cost": total_cost}
+
+    def __hamiltonian(self, gi, start_vertex, mode="double_tree", time_budget=0.0):
+        self.__check_vertices(gi, start_vertex)
+        tour, cost = self.__srv.tsp_approximation(gi, start_vertex, mode, time_budget)
+        return {"tour": tour, "cost": cost}
+
+
+def read_queries(file, input_format, string_ids=False):
+    """
+    Generator that parses the queries of a file one line at a time
+    :param file: a text file-like object
+    :param input_format: "jsonl" or "csv"
+    :param string_ids: if True, the CSV arguments which are not numbers are read as string vertices instead of
+                       being an error
+    :return: an iterator of dictionaries {"op", "args", ...} (for JSON lines, of the lines themselves, which
+             BatchRunner.run parses)
+    """
+    if input_format == "jsonl":
+        for line in file:
+            if line.strip():
+                yield line
+    else:
+        parse = parse_vertex if string_ids else parse_number
+        for row in csv.reader(file):
+            if row and not row[0].startswith("#"):
+                yield {"op": row[0].strip(), "args": [parse(token.strip()) for token in row[1:]]}
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Runs a file of graph queries without the interactive menu.")
+    parser.add_argument("graph", help="the graph file the queries are run on (the graph with the index 0)")
+    parser.add_argument("queries", help="the query file, in JSON lines or CSV")
+    parser.add_argument("--output", help="the file the results are written to, as JSON lines (default: stdout)")
+    parser.add_argument("--format", choices=["jsonl", "csv"], help="the query format (default: by the extension)")
+    parser.add_argument("--snapshot", action="store_true", help="the graph file is a binary snapshot")
+    parser.add_argument("--string-ids", action="store_true",
+                        help="read the vertices which are not numbers (in the graph and CSV files) as strings")
+    args = parser.parse_args()
+
+    srv = Service()
+    if args.snapshot:
+        srv.open_snapshot(args.graph)
+    else:
+        srv.load_graph(args.graph, args.string_ids)
+    input_format = args.format or ("csv" if args.queries.endswith(".csv") else "jsonl")
+    output = open(args.output, "w") if args.output else sys.stdout
+    try:
+        with open(args.queries, newline="") as file:
+            report = BatchRunner(srv).run(read_queries(file, input_format, args.string_ids), output)
+    finally:
+        if output is not sys.stdout:
+            output.close()
+    print(("%d queries (%d errors) in %.3f s: %.1f queries/s, latency p50 %.3f ms, p95 %.3f ms, p99 %.3f ms, "
+           "max %.3f ms") % (report["queries"], report["errors"], report["seconds"], report["queries_per_second"],
+                             report["p50_ms"], report["p95_ms"], report["p99_ms"], report["max_ms"]),
+          file=sys.stderr)
+
+
+if __name__ == "__main__":
+    main()
@@ -26,18 +26,16 @@ class Console:
 
     def __find_hamiltonian_path_ui(self, gi):
         start_vertex = int(input("Introduce the starting vertex:\n"))
-        # Applying Prim's algorithm to find the MST
-        edges, total_cost = self.__srv.prim_algorithm(gi, start_vertex)
-        edges = list(edges)
-        # Creating a 100% Eulerian graph
-        self.__srv.create_graph_from_list(edges, gi+1)
-        # Applying the algorithm to find an Eulerian tour
-        euler_path = self.__srv.find_euler_tour(start_vertex, gi+1)
+        if not self.__srv.check_if_vertex(start_vertex, gi):
+            raise GraphError("Nonexistent vertex!")
+        choice = input("Use the Christofides approximation instead of the double tree one?(Y/N)\n")
+        mode = "christofides" if choice.lower() == "y" else "double_tree"
+        time_budget = float(input("How many seconds may be spent improving the cycle? (0 for none)\n"))
+        tour, cost = self.__srv.tsp_approximation(gi, start_vertex, mode, time_budget)
         # Printing the result
-        for v in euler_path:
+        for v in tour:
             print(str(v)+" ", end="")
-        print(start_vertex, end="")
-        self.__srv.delete_graph(gi+1)
+        print("\nThe cycle has the cost of "+str(cost)+".\n")
 
     def __find_minimum_spanning_tree_ui(self, gi):
         start_vertex = int(input("Introduce the starting vertex:\n"))
@@ -52,23 +50,40 @@ class Console:
     def __find_shortest_path_ui(self, gi):
         start_vertex = int(input("Introduce the starting vertex:"))
         end_vertex = int(input("Introduce the ending vertex:"))
-        dist, next_verticies = self.__srv.dijkstra_algorithm(gi, end_vertex, start_vertex)
-        if len(dist) != 1:
-            print("\n>>>The cost from the vertex "+str(start_vertex)+" and the vertex "+str(end_vertex)+" is "+str(dist[start_vertex])+".")
+        if not self.__srv.check_if_vertex(start_vertex, gi) or not self.__srv.check_if_vertex(end_vertex, gi):
+            raise GraphError("Nonexistent vertex!")
+        path, cost = self.__srv.shortest_path(gi, start_vertex, end_vertex)
+        if cost is not None:
+            print("\n>>>The cost from the vertex "+str(start_vertex)+" and the vertex "+str(end_vertex)+" is "+str(cost)+".")
             print("•A path between these two vertices is the following:")
             print("•Starting from vertex "+str(start_vertex)+"...")
-            current_vertex = start_vertex
-            while current_vertex != end_vertex:
-                print("\tnext["+str(current_vertex)+"] = "+str(next_verticies[current_vertex])+";", end="")
-                current_vertex = next_verticies[current_vertex]
+            for current_vertex, next_vertex in zip(path, path[1:]):
+                print("\tnext["+str(current_vertex)+"] = "+str(next_vertex)+";", end="")
             print("...and here, we end our journey, in vertex "+str(end_vertex)+".")
         else:
             print("There could not be found any walk from vertex "+str(start_vertex)+" to vertex "+str(end_vertex)+"!\n")
 
     def __find_connected_components_ui(self, gi):
+        choice = input("Do you also want every component as a separate graph?(Y/N)\n")
+        materialise = choice.lower() == "y"
         print("Starting the traversal...\n")
-        self.__srv.bfs_components(gi)
-        print("Traversal completed. You may now see the connected components as separate graphs!\n")
+        components = self.__srv.bfs_components(gi, materialise)
+        for number, (vertices, index) in enumerate(components):
+            print("Component number " + str(number + 1) + ":\n{ ", end=" ")
+            for v in vertices:
+                print(str(v) + " ", end=" ")
+            print("}")
+            if index is not None:
+                print("With the edges { ", end=" ")
+                for v in vertices:
+                    for k in self.__srv.get_outbound_edges(v, index):
+                        print(str(k) + " ", end=" ")
+                print("}; stored as the graph " + str(index))
+            print()
+        if materialise:
+            print("Traversal completed. You may now see the connected components as separate graphs!\n")
+        else:
+            print("Traversal completed.\n")
 
     def __overwrite_main_graph_ui(self, gi):
         while True:
@@ -90,8 +105,7 @@ class Console:
 
     def __remove_vertex_ui(self, gi):
         v1 = int(input("\n>>>Introduce the desired vertex: "))
-        keys = self.__srv.get_vertices(gi)
-        if v1 in keys:
+        if self.__srv.check_if_vertex(v1, gi):
             self.__srv.remove_vertex(v1, gi)
             print("Vertex removed successfully\n")
         else:
@@ -99,8 +113,7 @@ class Console:
 
     def __add_vertex_ui(self, gi):
         v1 = int(input("\n>>>Introduce the desired vertex: "))
-        keys = self.__srv.get_vertices(gi)
-        if v1 not in keys:
+        if not self.__srv.check_if_vertex(v1, gi):
             self.__srv.add_new_vertex(v1, gi)
             print("Vertex added successfully\n")
         else:
@@ -109,8 +122,7 @@ class Console:
     def __remove_edge_ui(self, gi):
         v1 = int(input("\n>>>Introduce the starting vertex: "))
         v2 = int(input("\n>>>Introduce the ending vertex: "))
-        keys = self.__srv.get_vertices(gi)
-        if v1 in keys and v2 in keys:
+        if self.__srv.check_if_vertex(v1, gi) and self.__srv.check_if_vertex(v2, gi):
             if self.__srv.check_if_edge(v1, v2, gi):
                 status = self.__srv.remove_an_edge(v1, v2, gi)
                 if status:
@@ -126,8 +138,7 @@ class Console:
         v1 = int(input("\n>>>Introduce the starting vertex: "))
         v2 = int(input("\n>>>Introduce the ending vertex: "))
         cost = int(input("\n>>>Introduce the cost of the edge: "))
-        keys = self.__srv.get_vertices(gi)
-        if v1 in keys and v2 in keys:
+        if self.__srv.check_if_vertex(v1, gi) and self.__srv.check_if_vertex(v2, gi):
             if not self.__srv.check_if_edge(v1, v2, gi):
                 status = self.__srv.add_new_edge(v1, v2, cost, gi)
                 if status:
@@ -143,8 +154,7 @@ class Console:
         v1 = int(input("\n>>>Introduce the first desired vertex: "))
         v2 = int(input("\n>>>Introduce the second desired vertex: "))
         new_cost = int(input("\n>>>Introduce the new cost of the edge: "))
-        keys = self.__srv.get_vertices(gi)
-        if v1 in keys and v2 in keys:
+        if self.__srv.check_if_vertex(v1, gi) and self.__srv.check_if_vertex(v2, gi):
             if self.__srv.check_if_edge(v1, v2, gi):
                 self.__srv.set_cost_of_edge(v1, v2, new_cost, gi)
                 print("The cost of the edge [" + str(v1) + ", " + str(v2) + "] " + "is now: " + str(new_cost))
@@ -156,8 +166,7 @@ class Console:
     def __get_cost_edge_ui(self, gi):
         v1 = int(input("\n>>>Introduce the first desired vertex: "))
         v2 = int(input("\n>>>Introduce the second desired vertex: "))
-        keys = self.__srv.get_vertices(gi)
-        if v1 in keys and v2 in keys:
+        if self.__srv.check_if_vertex(v1, gi) and self.__srv.check_if_vertex(v2, gi):
             if self.__srv.check_if_edge(v1, v2, gi):
                 cost = self.__srv.get_cost_of_edge(v1, v2, gi)
                 print("The cost of the edge [" + str(v1) + ", " + str(v2) + "] " + "is: " + str(cost))
@@ -168,8 +177,7 @@ class Console:
 
     def __get_inbound_edges_ui(self, gi):
         v1 = int(input("\n>>>Introduce the desired vertex: "))
-        keys = self.__srv.get_vertices(gi)
-        if v1 in keys:
+        if self.__srv.check_if_vertex(v1, gi):
             edges = self.__srv.get_inbound_edges(v1, gi)
             if len(edges) > 0:
                 for e in edges:
@@ -182,8 +190,7 @@ class Console:
 
     def __get_outbound_edges_ui(self, gi):
         v1 = int(input("\n>>>Introduce the desired vertex: "))
-        keys = self.__srv.get_vertices(gi)
-        if v1 in keys:
+        if self.__srv.check_if_vertex(v1, gi):
             edges = self.__srv.get_outbound_edges(v1, gi)
             if len(edges) > 0:
                 for e in edges:
@@ -196,8 +203,7 @@ class Console:
 
     def __get_degrees_ui(self, gi):
         v1 = int(input("\n>>>Introduce the desired vertex: "))
-        keys = self.__srv.get_vertices(gi)
-        if v1 in keys:
+        if self.__srv.check_if_vertex(v1, gi):
             in_degree = self.__srv.get_in_degree(v1, gi)
             out_degree = self.__srv.get_out_degree(v1, gi)
             print("The vertex " + str(v1) + " has an IN degree of " + str(in_degree) + " and an OUT degree of " + str(
@@ -208,8 +214,7 @@ class Console:
     def __check_if_edge_ui(self, gi):
         v1 = int(input("\n>>>Introduce the first vertex: "))
         v2 = int(input("\n>>>Introduce the second vertex: "))
-        keys = self.__srv.get_vertices(gi)
-        if v1 in keys and v2 in keys:
+        if self.__srv.check_if_vertex(v1, gi) and self.__srv.check_if_vertex(v2, gi):
             edge = self.__srv.check_if_edge(v1, v2, gi)
             if edge:
                 cost = self.__srv.get_cost_of_edge(v1, v2, gi)
@@ -251,7 +256,7 @@ class Console:
                     "13. Create a new copy.",
                     "14. Overwrite the main graph",
                     "15. Find the connected components (Breath First Traversal)",
-                    "16. Find the shortest path between two vertices (Reverse Dijkstra Algorithm - must be DIRECTED)",
+                    "16. Find the shortest path between two vertices (Bidirectional Dijkstra Algorithm - must be DIRECTED)",
                     "17. Find the minimum spanning tree (Prim's Algorithm - must be UNDIRECTED)",
                     "18. Find a Hamiltonian cycle of no more than twice the minimum cost",
                     "0. Exit the current graph.",
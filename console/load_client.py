@@ -0,0 +1,114 @@
+"""
+Load generator for console.server: a number of connections send random queries, each one keeping a window of
+requests in flight, and the throughput and latency percentiles of the answers are reported
+Usage (from the root of the project):
+    python -m console.load_client [--port 8765 | --unix path] [--connections 4] [--requests 1000] [--window 16]
+                                  [--mix shortest_path degree is_edge] [--graph 0] [--seed 0]
+"""
+import argparse
+import asyncio
+import json
+import random
+import time
+
+from console.batch import percentile
+
+TWO_VERTEX_QUERIES = frozenset(["shortest_path", "is_edge", "cost"])
+
+
+def random_queries(vertices, mix, count, graph, rng):
+    """:return: a list of count random queries picked from mix, over the given vertices"""
+    queries = []
+    for number in range(count):
+        op = rng.choice(mix)
+        if op in TWO_VERTEX_QUERIES:
+            args = [rng.choice(vertices), rng.choice(vertices)]
+        elif op in ("nr_vertices", "components"):
+            args = []
+        else:
+            args = [rng.choice(vertices)]
+        queries.append({"id": number, "op": op, "args": args, "graph": graph})
+    return queries
+
+
+async def _open(host, port, unix_path):
+    if unix_path is not None:
+        return await asyncio.open_unix_connection(unix_path, limit=1 << 24)
+    return await asyncio.open_connection(host, port, limit=1 << 24)
+
+
+async def _request(host, port, unix_path, query):
+    reader, writer = await _open(host, port, unix_path)
+    writer.write((json.dumps(query) + "\n").encode())
+    response = json.loads(await reader.readline())
+    writer.close()
+    return response
+
+
+async def _connection(host, port, unix_path, queries, window, latencies, errors):
+    reader, writer = await _open(host, port, unix_path)
+    slots = asyncio.Semaphore(window)
+    sent = {}
+
+    async def receive():
+        for _ in range(len(queries)):
+            response = json.loads(await reader.readline())
+            latencies.append(time.perf_counter() - sent.pop(response["id"]))
+            if "error" in response:
+                errors.append(response["error"])
+            slots.release()
+
+    receiver = asyncio.ensure_future(receive())
+    for query in queries:
+        await slots.acquire()
+        sent[query["id"]] = time.perf_counter()
+        writer.write((json.dumps(query) + "\n").encode())
+        await writer.drain()
+    await receiver
+    writer.close()
+
+
+async def run_load(host, port, unix_path, connections, requests, window, mix, graph, seed):
+    """
+    :return: the report dictionary with the number of requests and errors, the seconds, the requests per second
+             and the p50/p95/p99/max latencies in milliseconds
+    """
+    answer = await _request(host, port, unix_path, {"id": 0, "op": "vertices", "graph": graph})
+    if "error" in answer:
+        raise RuntimeError(answer["error"])
+    vertices = answer["result"]
+    rng = random.Random(seed)
+    latencies, errors = [], []
+    start = time.perf_counter()
+    await asyncio.gather(*(_connection(host, port, unix_path, random_queries(vertices, mix, requests, graph, rng),
+                                       window, latencies, errors) for _ in range(connections)))
+    total = time.perf_counter() - start
+    latencies.sort()
+    return {"requests": len(latencies), "errors": len(errors), "seconds": total,
+            "requests_per_second": len(latencies) / total if total > 0 else 0.0,
+            "p50_ms": percentile(latencies, 0.50) * 1000, "p95_ms": percentile(latencies, 0.95) * 1000,
+            "p99_ms": percentile(latencies, 0.99) * 1000, "max_ms": (latencies[-1] if latencies else 0) * 1000}
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Measures the throughput of a running graph query server.")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--unix", help="connect to this Unix socket path instead of TCP")
+    parser.add_argument("--connections", type=int, default=4)
+    parser.add_argument("--requests", type=int, default=1000, help="the number of requests of every connection")
+    parser.add_argument("--window", type=int, default=16, help="the requests in flight on every connection")
+    parser.add_argument("--mix", nargs="+", default=["shortest_path", "degree", "is_edge"],
+                        help="the queries picked at random")
+    parser.add_argument("--graph", type=int, default=0)
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+    report = asyncio.run(run_load(args.host, args.port, args.unix, args.connections, args.requests, args.window,
+                                  args.mix, args.graph, args.seed))
+    print(("%d requests (%d errors) in %.3f s: %.1f requests/s, latency p50 %.3f ms, p95 %.3f ms, p99 %.3f ms, "
+           "max %.3f ms") % (report["requests"], report["errors"], report["seconds"], report["requests_per_second"],
+                             report["p50_ms"], report["p95_ms"], report["p99_ms"], report["max_ms"]))
+
+
+if __name__ == "__main__":
+    main()
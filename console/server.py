@@ -0,0 +1,218 @@
+"""
+Asyncio server answering graph queries over TCP or a Unix socket, so that many clients share the graphs loaded once
+in a Service. The protocol is made of JSON lines: every request is a query in the format of console.batch
+({"id": 17, "op": "shortest_path", "args": [0, 5], "graph": 0}) and gets one response line with the same id and a
+"result" or an "error". Requests are pipelined: a client may send many of them without waiting, and the responses
+come back as soon as they are ready, so not necessarily in the order of the requests.
+The CPU-heavy queries run in a pool of worker processes on a memory-mapped snapshot of the graph, written again
+(in a thread) only after the graph has changed, so the event loop stays responsive; all the other queries run on
+the loop. An old snapshot is removed once no queued query uses it anymore.
+Usage (from the root of the project):
+    python -m console.server graph_file [graph_file ...] [--port 8765 | --unix path] [--workers 2] [--snapshot]
+                                                         [--string-ids]
+"""
+import argparse
+import asyncio
+import json
+import os
+import shutil
+import tempfile
+from collections import OrderedDict
+from concurrent.futures import ProcessPoolExecutor
+
+from console.batch import BatchRunner
+from errors.exceptions import GraphError
+from service.service import Service
+
+HEAVY_QUERIES = frozenset(["shortest_path", "mst", "components", "hamiltonian"])
+MAX_PENDING = 64        # the number of requests of one connection which may be in progress at once
+LINE_LIMIT = 1 << 24    # the longest accepted request line, in bytes
+WORKER_GRAPHS = 4       # the number of snapshots a worker process keeps open
+
+_worker_runners = OrderedDict()     # snapshot path -> BatchRunner over it, in the current worker process
+
+
+def _run_heavy(path, op, args):
+    runner = _worker_runners.get(path)
+    if runner is None:
+        srv = Service()
+        srv.open_snapshot(path)
+        runner = _worker_runners[path] = BatchRunner(srv)
+        while len(_worker_runners) > WORKER_GRAPHS:
+            _worker_runners.popitem(last=False)
+    else:
+        _worker_runners.move_to_end(path)
+    return runner.execute(op, args, 0)
+
+
+class GraphServer:
+    def __init__(self, service, workers=2):
+        """
+        :param service: the service holding the graphs
+        :param workers: the number of worker processes for the heavy queries (0 runs them on the event loop)
+        """
+        self.__srv = service
+        self.__runner = BatchRunner(service)
+        self.__pool = ProcessPoolExecutor(max_workers=workers) if workers > 0 else None
+        self.__directory = tempfile.mkdtemp(prefix="graph_server_")
+        self.__snapshots = {}       # gi -> (version, future of the path) of the latest snapshot of the graph
+        self.__files = {}           # path -> the number of pending queries using it, for every snapshot on disk
+        self.__written = 0
+        self.__served = 0
+
+    def get_served(self):
+        """:return: the number of requests answered so far"""
+        return self.__served
+
+    async def handle(self, reader, writer):
+        """Serves one connection until the client closes it"""
+        slots = asyncio.Semaphore(MAX_PENDING)
+        pending = set()
+        try:
+            while True:
+                line = await reader.readline()
+                if not line:
+                    break
+                if not line.strip():
+                    continue
+                await slots.acquire()
+                task = asyncio.ensure_future(self.__answer(line, writer, slots))
+                pending.add(task)
+                task.add_done_callback(pending.discard)
+            if pending:
+                await asyncio.gather(*pending)
+        except (ConnectionError, asyncio.IncompleteReadError, asyncio.LimitOverrunError, ValueError):
+            pass
+        finally:
+            writer.close()
+
+    async def __answer(self, line, writer, slots):
+        response = {"id": None}
+        try:
+            query = json.loads(line)
+            if not isinstance(query, dict):
+                raise GraphError("A request must be a JSON object!")
+            response["id"] = query.get("id")
+            response["result"] = await self.__execute(query.get("op"), query.get("args", []), query.get("graph", 0))
+        except Exception as error:     # any failure is reported to the client, the connection stays open
+            response["error"] = str(error) if isinstance(error, GraphError) else \
+                type(error).__name__ + ": " + str(error)
+        try:
+            writer.write((json.dumps(response) + "\n").encode())
+            await writer.drain()
+        except ConnectionError:
+            pass
+        finally:
+            self.__served += 1
+            slots.release()
+
+    async def __execute(self, op, args, gi):
+        if op in HEAVY_QUERIES and self.__pool is not None:
+            path = await self.__snapshot_path(gi)
+            if path is not None:
+                self.__files[path] += 1     # the snapshot is kept on disk until its last query has run
+                try:
+                    loop = asyncio.get_running_loop()
+                    return await loop.run_in_executor(self.__pool, _run_heavy, path, op, list(args))
+                finally:
+                    self.__files[path] -= 1
+                    self.__remove_unused()
+        return self.__runner.execute(op, args, gi)
+
+    async def __snapshot_path(self, gi):
+        # the workers read a snapshot of the current version of the graph, written again only after it has changed
+        if not isinstance(gi, int) or not 0 <= gi < self.__srv.get_nr_graphs():
+            raise GraphError("Nonexistent graph!")
+        while True:
+            version = self.__srv.get_version(gi)
+            entry = self.__snapshots.get(gi)
+            if entry is None or entry[0] != version:
+                entry = self.__snapshots[gi] = (version, asyncio.ensure_future(self.__write_snapshot(gi)))
+                self.__remove_unused()
+            try:
+                path = await entry[1]
+            except BaseException:
+                if self.__snapshots.get(gi) is entry:   # the next query tries to write it again
+                    del self.__snapshots[gi]
+                raise
+            if path is None or path in self.__files:
+                return path
+            # the graph changed while the snapshot was written and it was already replaced: take the newer one
+
+    async def __write_snapshot(self, gi):
+        self.__written += 1
+        path = os.path.join(self.__directory, "graph_" + str(gi) + "_" + str(self.__written) + ".csr")
+        loop = asyncio.get_running_loop()
+        try:
+            await loop.run_in_executor(None, self.__srv.save_snapshot, gi, path)
+        except GraphError:      # graphs with vertices other than integers can not be snapshotted
+            if os.path.exists(path):
+                os.remove(path)
+            return None
+        self.__files[path] = 0
+        return path
+
+    def __remove_unused(self):
+        # removes the snapshots which are neither the latest one of their graph nor used by a pending query; the
+        # workers that still map one keep its pages until they drop it
+        latest = set(entry[1].result() for entry in self.__snapshots.values()
+                     if entry[1].done() and not entry[1].cancelled() and entry[1].exception() is None)
+        for path, users in list(self.__files.items()):
+            if users == 0 and path not in latest:
+                del self.__files[path]
+                os.remove(path)
+
+    def close(self):
+        """Stops the worker processes and removes the snapshots"""
+        if self.__pool is not None:
+            self.__pool.shutdown()
+        shutil.rmtree(self.__directory, ignore_errors=True)
+
+
+async def serve(server, host="127.0.0.1", port=8765, unix_path=None):
+    """
+    Runs the server until it is cancelled
+    :param server: the GraphServer
+    :param host: the TCP host (ignored if unix_path is given)
+    :param port: the TCP port (ignored if unix_path is given)
+    :param unix_path: the path of the Unix socket, or None for TCP
+    """
+    if unix_path is not None:
+        listener = await asyncio.start_unix_server(server.handle, path=unix_path, limit=LINE_LIMIT)
+    else:
+        listener = await asyncio.start_server(server.handle, host, port, limit=LINE_LIMIT)
+    async with listener:
+        print("Serving on " + (unix_path or host + ":" + str(port)), flush=True)
+        await listener.serve_forever()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Serves graph queries as JSON lines over TCP or a Unix socket.")
+    parser.add_argument("graphs", nargs="+", help="the graph files, loaded with the indices 0, 1, ...")
+    parser.add_argument("--snapshot", action="store_true", help="the graph files are binary snapshots")
+    parser.add_argument("--string-ids", action="store_true",
+                        help="read the vertices which are not numbers in the graph files as strings")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--unix", help="listen on this Unix socket path instead of TCP")
+    parser.add_argument("--workers", type=int, default=2, help="worker processes for the heavy queries")
+    args = parser.parse_args()
+
+    srv = Service()
+    for path in args.graphs:
+        if args.snapshot:
+            srv.open_snapshot(path)
+        else:
+            srv.load_graph(path, args.string_ids)
+    server = GraphServer(srv, args.workers)
+    try:
+        asyncio.run(serve(server, args.host, args.port, args.unix))
+    except KeyboardInterrupt:
+        pass
+    finally:
+        print("Served " + str(server.get_served()) + " requests.")
+        server.close()
+
+
+if __name__ == "__main__":
+    main()
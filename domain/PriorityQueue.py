@@ -1,30 +1,181 @@
 """
 The priority queue Class which will help us in the Dijkstra's Algorithm and Prim's Algorithm implementation
 """
+import heapq
 
 
 class PriorityQueue:
+    """
+    Binary min-heap with a position index, so that every object is stored at most once and its priority can be
+    changed in O(log n) (decrease-key) instead of scanning all the entries on every pop
+    """
     def __init__(self):
-        self.__values = {}
+        self.__heap = []        # the list of [priority, object] pairs ordered as a binary heap
+        self.__position = {}    # the dictionary holding on key obj its current index in the heap
+
+    def __len__(self):
+        return len(self.__heap)
 
     def is_empty(self):
-        return len(self.__values) == 0
+        return len(self.__heap) == 0
+
+    def peek_priority(self):
+        """:return: the priority of the object that would be popped next"""
+        return self.__heap[0][0]
 
     def pop(self):
-        top_priority = None
-        top_object = None
-        for obj in self.__values:
-            obj_priority = self.__values[obj]
-            if top_priority is None or top_priority > obj_priority:
-                top_priority = obj_priority
-                top_object = obj
-        del self.__values[top_object]
+        heap = self.__heap
+        top_object = heap[0][1]
+        last = heap.pop()
+        del self.__position[top_object]
+        if heap:
+            heap[0] = last
+            self.__position[last[1]] = 0
+            self.__sift_down(0)
         return top_object
 
+    def pop_with_priority(self):
+        """:return: the (object, priority) pair with the smallest priority, removing it from the queue"""
+        priority = self.__heap[0][0]
+        return self.pop(), priority
+
     def add(self, obj, priority):
-        self.__values[obj] = priority
+        """
+        Adds an object to the queue or, if it is already in the queue, replaces its priority
+        :param obj: the object to be added
+        :param priority: the priority of the object (the smaller, the sooner it is popped)
+        """
+        index = self.__position.get(obj)
+        if index is None:
+            self.__heap.append([priority, obj])
+            index = len(self.__heap) - 1
+            self.__position[obj] = index
+            self.__sift_up(index)
+        elif priority < self.__heap[index][0]:
+            self.__heap[index][0] = priority
+            self.__sift_up(index)
+        else:
+            self.__heap[index][0] = priority
+            self.__sift_down(index)
+
+    def decrease_key(self, obj, priority):
+        """
+        Lowers the priority of an object that is already in the queue; a higher priority is ignored
+        :param obj: the object whose priority is lowered
+        :param priority: the new priority
+        :return: True if the priority was lowered or False otherwise
+        """
+        index = self.__position[obj]
+        if priority < self.__heap[index][0]:
+            self.__heap[index][0] = priority
+            self.__sift_up(index)
+            return True
+        return False
 
     def contains(self, val):
-        return val in self.__values
+        return val in self.__position
+
+    def __sift_up(self, index):
+        heap = self.__heap
+        position = self.__position
+        entry = heap[index]
+        while index > 0:
+            parent = (index - 1) >> 1
+            parent_entry = heap[parent]
+            if entry[0] < parent_entry[0]:
+                heap[index] = parent_entry
+                position[parent_entry[1]] = index
+                index = parent
+            else:
+                break
+        heap[index] = entry
+        position[entry[1]] = index
+
+    def __sift_down(self, index):
+        heap = self.__heap
+        position = self.__position
+        size = len(heap)
+        entry = heap[index]
+        child = 2 * index + 1
+        while child < size:
+            right = child + 1
+            if right < size and heap[right][0] < heap[child][0]:
+                child = right
+            child_entry = heap[child]
+            if child_entry[0] < entry[0]:
+                heap[index] = child_entry
+                position[child_entry[1]] = index
+                index = child
+                child = 2 * index + 1
+            else:
+                break
+        heap[index] = entry
+        position[entry[1]] = index
+
+
+class LazyPriorityQueue:
+    """
+    Priority queue backed by heapq which never moves entries: changing a priority pushes a new entry and the stale
+    one is skipped (lazily deleted) when it reaches the top. Cheaper per operation than PriorityQueue when the
+    priorities of the same object change often, at the cost of a bigger heap
+    """
+    def __init__(self):
+        self.__heap = []        # the list of (priority, counter, object) triples ordered as a binary heap
+        self.__entry = {}       # the dictionary holding on key obj its current (valid) heap entry
+        self.__counter = 0      # tie breaker, so that the objects themselves are never compared
+
+    def __len__(self):
+        return len(self.__entry)
 
+    def is_empty(self):
+        return len(self.__entry) == 0
+
+    def peek_priority(self):
+        """:return: the priority of the object that would be popped next"""
+        self.__drop_stale()
+        return self.__heap[0][0]
+
+    def pop(self):
+        self.__drop_stale()
+        priority, counter, obj = heapq.heappop(self.__heap)
+        del self.__entry[obj]
+        return obj
+
+    def pop_with_priority(self):
+        """:return: the (object, priority) pair with the smallest priority, removing it from the queue"""
+        self.__drop_stale()
+        priority, counter, obj = heapq.heappop(self.__heap)
+        del self.__entry[obj]
+        return obj, priority
+
+    def add(self, obj, priority):
+        """
+        Adds an object to the queue or, if it is already in the queue, replaces its priority
+        :param obj: the object to be added
+        :param priority: the priority of the object (the smaller, the sooner it is popped)
+        """
+        self.__counter += 1
+        entry = (priority, self.__counter, obj)
+        self.__entry[obj] = entry
+        heapq.heappush(self.__heap, entry)
+
+    def decrease_key(self, obj, priority):
+        """
+        Lowers the priority of an object that is already in the queue; a higher priority is ignored
+        :param obj: the object whose priority is lowered
+        :param priority: the new priority
+        :return: True if the priority was lowered or False otherwise
+        """
+        if priority < self.__entry[obj][0]:
+            self.add(obj, priority)
+            return True
+        return False
+
+    def contains(self, val):
+        return val in self.__entry
 
+    def __drop_stale(self):
+        heap = self.__heap
+        current = self.__entry
+        while current.get(heap[0][2]) is not heap[0]:
+            heapq.heappop(heap)
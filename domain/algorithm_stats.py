@@ -0,0 +1,119 @@
+"""
+The statistics Class which the instrumented algorithms of the service fill in when they are given one: operation
+counters, the wall time of every phase and, optionally, a cProfile profile of the whole call
+"""
+import cProfile
+import io
+import pstats
+import time
+
+
+class AlgorithmStats:
+    """
+    Statistics of one algorithm call. The algorithm calls start, then phase at the end of every one of its phases
+    (the time since the previous mark is added to that phase), count for its counters and finally stop, also when
+    it fails, so that the profiler is always disabled
+    """
+    def __init__(self, profile=False):
+        """
+        :param profile: if True, the call is also run under cProfile (which slows it down noticeably)
+        """
+        self.__algorithm = None
+        self.__counters = {}
+        self.__phases = {}      # phase name -> seconds, in the order the phases ended first
+        self.__total = 0.0
+        self.__mark = None
+        self.__start = None
+        self.__profiler = cProfile.Profile() if profile else None
+
+    def start(self, algorithm):
+        """
+        Marks the beginning of the call
+        :param algorithm: the name of the algorithm
+        """
+        self.__algorithm = algorithm
+        if self.__profiler is not None:
+            self.__profiler.enable()
+        self.__start = self.__mark = time.perf_counter()
+
+    def phase(self, name):
+        """
+        Marks the end of a phase: the time since the start or since the end of the previous phase is added to it
+        :param name: the name of the phase
+        """
+        now = time.perf_counter()
+        self.__phases[name] = self.__phases.get(name, 0.0) + now - self.__mark
+        self.__mark = now
+
+    def count(self, name, amount=1):
+        """
+        Adds to a counter
+        :param name: the name of the counter
+        :param amount: the number added
+        """
+        self.__counters[name] = self.__counters.get(name, 0) + amount
+
+    def stop(self):
+        """Marks the end of the call"""
+        self.__total += time.perf_counter() - self.__start
+        if self.__profiler is not None:
+            self.__profiler.disable()
+
+    def get_algorithm(self):
+        """:return: the name of the algorithm that filled the statistics"""
+        return self.__algorithm
+
+    def get_counters(self):
+        """:return: a copy of the dictionary {counter name: value}"""
+        return dict(self.__counters)
+
+    def get_phases(self):
+        """:return: a copy of the dictionary {phase name: seconds}"""
+        return dict(self.__phases)
+
+    def get_total_time(self):
+        """:return: the wall time of the whole call, in seconds"""
+        return self.__total
+
+    def get_profile(self, sort="cumulative", limit=20):
+        """
+        :param sort: the pstats key the functions are sorted by
+        :param limit: the number of functions listed
+        :return: the cProfile report as text, or None if the call was not profiled
+        """
+        if self.__profiler is None:
+            return None
+        text = io.StringIO()
+        pstats.Stats(self.__profiler, stream=text).sort_stats(sort).print_stats(limit)
+        return text.getvalue()
+
+    def as_dict(self):
+        """:return: the statistics as a dictionary, ready to be written as JSON"""
+        return {"algorithm": self.__algorithm, "total_seconds": self.__total, "phases": self.get_phases(),
+                "counters": self.get_counters()}
+
+    def __str__(self):
+        lines = [str(self.__algorithm) + ": %.6f s" % self.__total]
+        for name, seconds in self.__phases.items():
+            lines.append("    phase %-20s %.6f s" % (name, seconds))
+        for name, value in self.__counters.items():
+            lines.append("    %-26s %d" % (name, value))
+        return "\n".join(lines)
+
+
+class _NoStats:
+    """Stand-in used when no statistics are requested: every method does nothing"""
+    def start(self, algorithm):
+        pass
+
+    def phase(self, name):
+        pass
+
+    def count(self, name, amount=1):
+        pass
+
+    def stop(self):
+        pass
+
+
+NO_STATS = _NoStats()
@@ -0,0 +1,350 @@
+from array import array
+from bisect import bisect_left
+from collections import deque
+from heapq import heappop, heappush
+from types import MappingProxyType
+
+from domain.graph import Graph
+from domain.graph_file import split_vertices, write_graph_file
+from domain.vertex_interner import VertexInterner
+from errors.exceptions import GraphError
+
+INFINITY = float("inf")
+
+
+def weight_array(costs, keep_types=False):
+    """
+    Packs a sequence of edge costs into the most compact array that can hold them
+    :param costs: an iterable with the costs of the edges
+    :param keep_types: if True, costs that no array holds as they are (integers mixed with reals, or integers out of
+                       the 64-bit range) are returned in a list instead of being converted to doubles
+    :return: an array of signed 64-bit integers if every cost is an integer, an array of doubles otherwise
+    """
+    costs = list(costs)
+    if all(type(c) is int for c in costs):
+        try:
+            return array('q', costs)
+        except OverflowError:
+            pass
+    if keep_types and not all(type(c) is float for c in costs):
+        return costs
+    return array('d', costs)
+
+
+class CSRGraph:
+    """
+    Immutable directed graph stored in compressed sparse row form: the outbound neighbours of the vertex with
+    index i are out_targets[out_offsets[i]:out_offsets[i + 1]] (sorted, with the costs at the same positions in
+    out_weights) and a second, reverse CSR holds the inbound neighbours. It answers the same queries as Graph
+    using a few flat arrays instead of a dictionary of lists and a dictionary keyed by tuples
+    """
+    def __init__(self, vertices, out_offsets, out_targets, out_weights, in_offsets, in_sources, in_weights):
+        """
+        The constructor of a CSR graph from already built buffers (arrays, memoryviews or any indexable sequences)
+        :param vertices: the sequence (or VertexInterner) with the vertex on every index or None if the vertices are
+                         exactly 0..n-1
+        :param out_offsets: the n+1 offsets of every vertex's row in out_targets/out_weights
+        :param out_targets: the indices of the outbound neighbours, sorted inside every row
+        :param out_weights: the costs of the outbound edges
+        :param in_offsets: the n+1 offsets of every vertex's row in in_sources/in_weights
+        :param in_sources: the indices of the inbound neighbours, sorted inside every row
+        :param in_weights: the costs of the inbound edges
+        """
+        self.__n = len(out_offsets) - 1
+        if vertices is not None and not isinstance(vertices, VertexInterner):
+            vertices = VertexInterner(vertices)
+        self.__vertices = vertices      # the VertexInterner of the vertices, or None if they are 0..n-1
+        self.__out_offsets = out_offsets
+        self.__out_targets = out_targets
+        self.__out_weights = out_weights
+        self.__in_offsets = in_offsets
+        self.__in_sources = in_sources
+        self.__in_weights = in_weights
+
+    @classmethod
+    def from_graph(cls, graph, keep_types=False):
+        """
+        Freezes a graph into its CSR form
+        :param graph: the graph (anything exposing get_vertices, get_n_out, get_n_in and get_edges)
+        :param keep_types: if True, the costs keep their types even when they can not be packed into an array (see
+                           weight_array), so that the sums computed on the CSR form equal the ones on the graph
+        :return: the equivalent CSRGraph
+        """
+        vertices = VertexInterner(graph.get_vertices())
+        identity = all(type(v) is int and v == i for i, v in enumerate(vertices))
+        indices_of, vertices_at = vertices.indices_of, vertices.vertices_at
+        costs = graph.get_edges()
+        out_offsets, out_targets, out_costs = array('q', [0]), array('q'), []
+        in_offsets, in_sources, in_costs = array('q', [0]), array('q'), []
+        for v in vertices:
+            row = sorted(indices_of(graph.get_n_out(v)))
+            out_targets.extend(row)
+            out_costs.extend([costs[v, u] for u in vertices_at(row)])
+            out_offsets.append(len(out_targets))
+            row = sorted(indices_of(graph.get_n_in(v)))
+            in_sources.extend(row)
+            in_costs.extend([costs[u, v] for u in vertices_at(row)])
+            in_offsets.append(len(in_sources))
+        return cls(None if identity else vertices, out_offsets, out_targets, weight_array(out_costs, keep_types),
+                   in_offsets, in_sources, weight_array(in_costs, keep_types))
+
+    def to_graph(self):
+        """
+        Thaws the CSR graph back into an editable Graph
+        :return: the equivalent Graph
+        """
+        graph = Graph(self.__n, self.get_nr_edges())
+        graph.set_n_out({v: self.get_n_out(v) for v in self.get_vertices()})
+        graph.set_n_in({v: self.get_n_in(v) for v in self.get_vertices()})
+        graph.set_costs(self.get_copy_of_edges())
+        return graph
+
+    def to_file(self, path):
+        """
+        Writes the graph in the same text format that Graph.from_file reads
+        :param path: the path of the file
+        """
+        n, isolated = split_vertices(self.get_vertices(), lambda v: self.get_out_degree(v) or self.get_in_degree(v))
+        write_graph_file(path, n, self.get_edges(), isolated)
+
+    def get_buffers(self):
+        """:return: the tuple (vertices, out_offsets, out_targets, out_weights, in_offsets, in_sources, in_weights)"""
+        return (self.__vertices, self.__out_offsets, self.__out_targets, self.__out_weights,
+                self.__in_offsets, self.__in_sources, self.__in_weights)
+
+    def index_of(self, v):
+        """
+        :param v: a vertex of the graph
+        :return: the dense index (0..n-1) of the vertex v
+        """
+        if self.__vertices is None:
+            if type(v) is not int or not 0 <= v < self.__n:
+                raise KeyError(v)
+            return v
+        return self.__vertices.index_of(v)
+
+    def vertex_at(self, i):
+        """
+        :param i: a dense index (0..n-1)
+        :return: the vertex stored on index i
+        """
+        if self.__vertices is None:
+            return i
+        return self.__vertices[i]
+
+    def vertices_at(self, indices):
+        """
+        :param indices: an iterable of dense indices
+        :return: the list of the vertices stored on those indices, in the same order
+        """
+        if self.__vertices is None:
+            return list(indices)
+        return self.__vertices.vertices_at(indices)
+
+    def get_version(self):
+        """
+        :return: the version of the graph, which never changes since the graph is immutable
+        """
+        return 0
+
+    def get_nr_vertices(self):
+        """
+        :return: JUST the number of the vertices
+        """
+        return self.__n
+
+    def get_nr_edges(self):
+        """
+        :return: JUST the number of the edges
+        """
+        return len(self.__out_targets)
+
+    def get_vertices(self):
+        """
+        :return: a sequence with all the vertices of the graph in the order of their indices, with an O(1) membership
+                 test
+        """
+        if self.__vertices is None:
+            return range(self.__n)
+        return self.__vertices
+
+    def __row(self, indices, start, end):
+        if self.__vertices is None:
+            return tuple(indices[start:end])
+        vertices = self.__vertices
+        return tuple(vertices[j] for j in indices[start:end])
+
+    def get_n_out(self, v):
+        """
+        :param v: the vertex of which we want to get all the outbound neighbours
+        :return: a read-only tuple with all the outbound neighbours of v
+        """
+        i = self.index_of(v)
+        return self.__row(self.__out_targets, self.__out_offsets[i], self.__out_offsets[i + 1])
+
+    def get_n_in(self, v):
+        """
+        :param v: the vertex of which we want to get all the inbound neighbours
+        :return: a read-only tuple with all the inbound neighbours of v
+        """
+        i = self.index_of(v)
+        return self.__row(self.__in_sources, self.__in_offsets[i], self.__in_offsets[i + 1])
+
+    def get_out_degree(self, v):
+        """
+        :param v: the vertex of which we want the number of outbound neighbours
+        :return: the OUT degree of v
+        """
+        i = self.index_of(v)
+        return self.__out_offsets[i + 1] - self.__out_offsets[i]
+
+    def get_in_degree(self, v):
+        """
+        :param v: the vertex of which we want the number of inbound neighbours
+        :return: the IN degree of v
+        """
+        i = self.index_of(v)
+        return self.__in_offsets[i + 1] - self.__in_offsets[i]
+
+    def __find(self, v1, v2):
+        i = self.index_of(v1)
+        j = self.index_of(v2)
+        end = self.__out_offsets[i + 1]
+        position = bisect_left(self.__out_targets, j, self.__out_offsets[i], end)
+        if position < end and self.__out_targets[position] == j:
+            return position
+        return -1
+
+    def is_edge(self, v1, v2):
+        """
+        Method that checks if there is an edge from vertex v1 to vertex v2
+        :param v1: starting vertex
+        :param v2: ending vertex
+        :return: True if there is an edge between v1 and v2 or False otherwise
+        """
+        return self.__find(v1, v2) >= 0
+
+    def get_cost(self, v1, v2):
+        """
+        Method that returns the cost of the edge from v1 to v2
+        :param v1: starting vertex
+        :param v2: ending vertex
+        :return: the cost from v1 to v2
+        """
+        position = self.__find(v1, v2)
+        if position < 0:
+            raise KeyError((v1, v2))
+        return self.__out_weights[position]
+
+    def get_edges(self):
+        """
+        Method that provides the list of edges in the graph (built on demand, in O(E))
+        :return: a read-only view of the dictionary {(v1, v2): cost} with all the edges
+        """
+        return MappingProxyType(self.get_copy_of_edges())
+
+    def get_copy_of_outs(self):
+        """:return: a copy of the outbound edge dictionary, safe to be mutated by the caller"""
+        return {v: list(self.get_n_out(v)) for v in self.get_vertices()}
+
+    def get_copy_of_ins(self):
+        """:return: a copy of the inbound edge dictionary, safe to be mutated by the caller"""
+        return {v: list(self.get_n_in(v)) for v in self.get_vertices()}
+
+    def get_copy_of_edges(self):
+        """:return: a copy of the dictionary of edge-costs, safe to be mutated by the caller"""
+        return {(v1, v2): cost for v1, v2, cost in self.iter_edges()}
+
+    def iter_edges(self):
+        """
+        Generator that yields the edges one by one straight from the flat arrays, row by row
+        :return: an iterator of triples (v1, v2, cost)
+        """
+        offsets, targets, weights = self.__out_offsets, self.__out_targets, self.__out_weights
+        for i in range(self.__n):
+            v = self.vertex_at(i)
+            for position in range(offsets[i], offsets[i + 1]):
+                yield v, self.vertex_at(targets[position]), weights[position]
+
+    def distances_from_index(self, source):
+        """
+        Method that computes the distances from one vertex to every vertex (Dijkstra's algorithm) working directly on
+        the dense indices and the flat arrays, without building any dictionary
+        :param source: the dense index of the source vertex
+        :return: the array holding on position i the distance to the vertex with index i (inf if it is not reached)
+        """
+        offsets, targets, weights = self.__out_offsets, self.__out_targets, self.__out_weights
+        dist = array('d', [INFINITY]) * self.__n
+        dist[source] = 0
+        settled = bytearray(self.__n)
+        heap = [(0, source)]
+        while heap:
+            d, x = heappop(heap)
+            if settled[x]:
+                continue
+            settled[x] = 1
+            for position in range(offsets[x], offsets[x + 1]):
+                y = targets[position]
+                new_dist = d + weights[position]
+                if new_dist < dist[y]:
+                    dist[y] = new_dist
+                    heappush(heap, (new_dist, y))
+        return dist
+
+    def breadth_first_order(self, start, visited):
+        """
+        Method that traverses the graph in a BF manner in O(V + E), following the outbound edges
+        :param start: starting vertex
+        :param visited: the set of already visited nodes, in order to not visit the same vertex twice (it is updated)
+        :return: the list of vertices reached from start, in the order they were visited
+        """
+        q = deque([start])
+        visited.add(start)
+        acc = [start]
+        while q:
+            x = q.popleft()
+            for i in self.get_n_out(x):
+                if i not in visited:
+                    visited.add(i)
+                    acc.append(i)
+                    q.append(i)
+        return acc
+
+    def breadth_first_traversal(self, start, visited):
+        """
+        Method that simply traverses the graph in a BF manner
+        :param start: starting vertex
+        :param visited: the set of already visited nodes, in order to not visit the same vertex twice (it is updated)
+        :return: the list of edges of the connected component and the list of vertices
+        """
+        acc = self.breadth_first_order(start, visited)
+        cost_fake = {}
+        for x in acc:
+            for i in self.get_n_out(x):
+                cost = self.get_cost(x, i)
+                cost_fake[(x, i)] = cost
+                cost_fake[(i, x)] = cost
+        return cost_fake, acc
+
+    def snapshot(self):
+        """
+        :return: the graph itself, since a frozen graph never changes and can be shared freely
+        """
+        return self
+
+    def __immutable(self, *args):
+        raise GraphError("The graph is frozen! Thaw it into a Graph in order to change it.")
+
+    add_edge = __immutable
+    add_double_edge = __immutable
+    apply_batch = __immutable
+    remove_edge = __immutable
+    set_cost = __immutable
+    add_vertex = __immutable
+    remove_vertex = __immutable
+    set_n_out = __immutable
+    set_n_in = __immutable
+    set_costs = __immutable
+    set_nr_vertices = __immutable
+    set_nr_edges = __immutable
+    adopt = __immutable
@@ -0,0 +1,63 @@
+"""
+The disjoint-set (union-find) Class which will help us in the Kruskal's Algorithm and in finding connected components
+"""
+
+
+class DisjointSet:
+    """
+    Disjoint sets over the dense indices 0..n-1 with path compression and union by rank, so that any sequence of
+    find/union operations runs in almost constant amortised time per operation
+    """
+    def __init__(self, n):
+        """
+        The constructor of n singleton sets {0}, {1}, ..., {n-1}
+        :param n: the number of elements
+        """
+        self.__parent = list(range(n))
+        self.__rank = bytearray(n)      # the rank is at most log2(n), so a byte is always enough
+        self.__sets = n
+
+    def get_nr_sets(self):
+        """:return: the number of disjoint sets"""
+        return self.__sets
+
+    def find(self, x):
+        """
+        :param x: an element
+        :return: the representative of the set containing x
+        """
+        parent = self.__parent
+        root = x
+        while parent[root] != root:
+            root = parent[root]
+        while parent[x] != root:        # path compression: every node on the path now points to the root
+            parent[x], x = root, parent[x]
+        return root
+
+    def union(self, x, y):
+        """
+        Merges the sets containing x and y
+        :param x: an element
+        :param y: another element
+        :return: True if the two sets were merged or False if x and y were already in the same set
+        """
+        root_x = self.find(x)
+        root_y = self.find(y)
+        if root_x == root_y:
+            return False
+        rank = self.__rank
+        if rank[root_x] < rank[root_y]:
+            root_x, root_y = root_y, root_x
+        self.__parent[root_y] = root_x
+        if rank[root_x] == rank[root_y]:
+            rank[root_x] += 1
+        self.__sets -= 1
+        return True
+
+    def connected(self, x, y):
+        """
+        :param x: an element
+        :param y: another element
+        :return: True if x and y are in the same set or False otherwise
+        """
+        return self.find(x) == self.find(y)
@@ -0,0 +1,230 @@
+"""
+The dynamic minimum spanning tree Class which keeps the MST of a graph up to date while the graph is being edited
+"""
+from collections import deque
+from operator import itemgetter
+
+from domain.disjoint_set import DisjointSet
+
+
+class DynamicMST:
+    """
+    Minimum spanning forest of a graph taken as undirected (the edge {u, v} exists if [u, v] or [v, u] exists and
+    costs the minimum of the two) which is updated after every change instead of being recomputed:
+        - a new edge or a cheaper edge {u, v} outside the tree replaces the most expensive edge on the tree path
+          between u and v, if it is cheaper than it (cycle property)
+        - a removed or more expensive tree edge splits its tree in two and the cheapest edge reconnecting the two
+          parts, searched only around the smaller part, takes its place (cut property)
+    If the graph is changed without notifying the tree, the tree is rebuilt when it is next read.
+    The tree path of a new edge is found by a breadth-first search of the forest, so an insertion costs O(V) in the
+    worst case (the size of the tree holding its ends) instead of the O(log V) of a path-max structure such as
+    link-cut trees; it is still far below the O(E log E) of a rebuild
+    """
+    def __init__(self, graph):
+        """
+        :param graph: the graph (a Graph or a CSRGraph) whose minimum spanning forest is maintained
+        """
+        self.__graph = graph
+        self.__tree = {}        # the adjacency of the forest: tree[u][v] = cost of the tree edge {u, v}
+        self.__total_cost = 0
+        self.__version = None   # the version of the graph the forest corresponds to
+        self.rebuild()
+
+    def rebuild(self):
+        """Recomputes the whole forest from scratch with Kruskal's algorithm"""
+        graph = self.__graph
+        vertices = list(graph.get_vertices())
+        index = {v: i for i, v in enumerate(vertices)}
+        weights = {}
+        for (v1, v2), cost in graph.get_edges().items():
+            if v1 != v2:
+                key = (v1, v2) if index[v1] < index[v2] else (v2, v1)
+                if key not in weights or cost < weights[key]:
+                    weights[key] = cost
+        sets = DisjointSet(len(vertices))
+        self.__tree = {v: {} for v in vertices}
+        self.__total_cost = 0
+        for (v1, v2), cost in sorted(weights.items(), key=itemgetter(1)):
+            if sets.union(index[v1], index[v2]):
+                self.__link(v1, v2, cost)
+        self.__version = graph.get_version()
+
+    def get_tree(self):
+        """
+        :return: the pair (edges, total_cost) like the MST algorithms of the service, where edges is the set of the
+                 tree edges, each one oriented like an edge that exists in the graph
+        """
+        self.__ensure_current()
+        graph = self.__graph
+        edges = set()
+        done = set()
+        for u, neighbours in self.__tree.items():
+            done.add(u)
+            for v, cost in neighbours.items():
+                if v not in done:
+                    if graph.is_edge(u, v) and graph.get_cost(u, v) == cost:
+                        edges.add((u, v))
+                    else:
+                        edges.add((v, u))
+        return edges, self.__total_cost
+
+    def get_total_cost(self):
+        """:return: the total cost of the forest"""
+        self.__ensure_current()
+        return self.__total_cost
+
+    def edge_changed(self, u, v):
+        """
+        Updates the forest after the edge [u, v] was added, removed or had its cost changed in the graph
+        :param u: the starting vertex of the changed edge
+        :param v: the ending vertex of the changed edge
+        """
+        if self.__version is None or not self.__only_this_change():
+            self.rebuild()
+            return
+        if u != v:
+            cost = self.__weight(u, v)
+            if v in self.__tree[u]:
+                if cost is not None and cost <= self.__tree[u][v]:
+                    self.__total_cost += cost - self.__tree[u][v]   # a cheaper tree edge keeps the tree minimal
+                    self.__tree[u][v] = cost
+                    self.__tree[v][u] = cost
+                else:
+                    self.__cut(u, v)
+                    self.__reconnect(u, v)
+            elif cost is not None:
+                self.__insert(u, v, cost)
+        self.__version = self.__graph.get_version()
+
+    def vertex_added(self, v):
+        """
+        Updates the forest after the (isolated) vertex v was added to the graph
+        :param v: the new vertex
+        """
+        if self.__version is None or not self.__only_this_change():
+            self.rebuild()
+            return
+        self.__tree[v] = {}
+        self.__version = self.__graph.get_version()
+
+    def vertex_removed(self, v):
+        """
+        Updates the forest after the vertex v was removed, along with its edges, from the graph: the tree of v falls
+        apart in one part for every tree neighbour of v and the parts are joined again with Kruskal's algorithm,
+        using only the edges between them
+        :param v: the removed vertex
+        """
+        if self.__version is None or not self.__only_this_change() or v not in self.__tree:
+            self.rebuild()
+            return
+        neighbours = list(self.__tree[v])
+        for x in neighbours:
+            self.__cut(v, x)
+        del self.__tree[v]
+        part_of = {}
+        for number, x in enumerate(neighbours):
+            for y in self.__component(x):
+                part_of[y] = number
+        candidates = []
+        for x in part_of:
+            for y in self.__graph.get_n_out(x):
+                if y in part_of and part_of[y] != part_of[x]:
+                    candidates.append((self.__graph.get_cost(x, y), x, y))
+        candidates.sort(key=itemgetter(0))
+        sets = DisjointSet(len(neighbours))
+        for cost, x, y in candidates:
+            if sets.union(part_of[x], part_of[y]):
+                self.__link(x, y, self.__weight(x, y))
+        self.__version = self.__graph.get_version()
+
+    def __ensure_current(self):
+        if self.__version != self.__graph.get_version():
+            self.rebuild()
+
+    def __only_this_change(self):
+        # every notification follows exactly one change of the graph; anything else means we missed some change
+        return self.__graph.get_version() == self.__version + 1
+
+    def __weight(self, u, v):
+        graph = self.__graph
+        costs = [graph.get_cost(a, b) for a, b in ((u, v), (v, u)) if graph.is_edge(a, b)]
+        return min(costs) if costs else None
+
+    def __link(self, u, v, cost):
+        self.__tree[u][v] = cost
+        self.__tree[v][u] = cost
+        self.__total_cost += cost
+
+    def __cut(self, u, v):
+        cost = self.__tree[u].pop(v)
+        del self.__tree[v][u]
+        self.__total_cost -= cost
+
+    def __component(self, start):
+        seen = {start}
+        q = deque([start])
+        while q:
+            x = q.popleft()
+            for y in self.__tree[x]:
+                if y not in seen:
+                    seen.add(y)
+                    q.append(y)
+        return seen
+
+    def __smaller_side(self, u, v):
+        # both sides are explored one vertex at a time, so the work is proportional to the smaller of them
+        sides = [({u}, deque([u])), ({v}, deque([v]))]
+        while True:
+            for seen, q in sides:
+                if not q:
+                    return seen
+                x = q.popleft()
+                for y in self.__tree[x]:
+                    if y not in seen:
+                        seen.add(y)
+                        q.append(y)
+
+    def __reconnect(self, u, v):
+        side = self.__smaller_side(u, v)
+        best = None
+        graph = self.__graph
+        for x in side:
+            for y in graph.get_n_out(x):
+                if y not in side:
+                    cost = graph.get_cost(x, y)
+                    if best is None or cost < best[0]:
+                        best = (cost, x, y)
+            for y in graph.get_n_in(x):
+                if y not in side:
+                    cost = graph.get_cost(y, x)
+                    if best is None or cost < best[0]:
+                        best = (cost, x, y)
+        if best is not None:
+            self.__link(best[1], best[2], best[0])
+
+    def __tree_path(self, u, v):
+        # the path of tree vertices from v back to u (None if they are in different trees), in O(size of their tree)
+        prev = {u: None}
+        q = deque([u])
+        while q:
+            x = q.popleft()
+            if x == v:
+                path = [v]
+                while prev[path[-1]] is not None:
+                    path.append(prev[path[-1]])
+                return path
+            for y in self.__tree[x]:
+                if y not in prev:
+                    prev[y] = x
+                    q.append(y)
+        return None
+
+    def __insert(self, u, v, cost):
+        path = self.__tree_path(u, v)
+        if path is None:            # u and v were in different trees, so the new edge joins them
+            self.__link(u, v, cost)
+            return
+        heaviest = max(zip(path, path[1:]), key=lambda edge: self.__tree[edge[0]][edge[1]])
+        if cost < self.__tree[heaviest[0]][heaviest[1]]:
+            self.__cut(heaviest[0], heaviest[1])
+            self.__link(u, v, cost)
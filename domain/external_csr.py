@@ -0,0 +1,192 @@
+"""
+External-memory construction of a graph snapshot from a text graph file that does not fit in memory: the file is
+read in chunks, every run of edges is sorted in memory and written to a temporary run file (once by source, for
+the outbound rows, and once by target, for the inbound rows) and the runs are merged straight into a memory-mapped
+snapshot file. Only the runs being built and one block per run file are held in memory at a time, plus the extra
+vertices that are not numbered 0..n-1. At most MERGE_FAN_IN run files are open at once: when there are more runs,
+they are first merged in groups into longer runs, in as many passes as needed.
+"""
+import heapq
+import mmap
+import os
+import struct
+import sys
+import tempfile
+
+from domain.graph_file import CHUNK_SIZE, iter_graph_chunks, read_graph_header
+from domain.graph_snapshot import (FLAG_BIG_ENDIAN, FLAG_FLOAT_WEIGHTS, FLAG_VERTICES, HEADER, MAGIC, VERSION,
+                                   open_snapshot, snapshot_layout)
+from errors.exceptions import GraphError
+
+RUN_SIZE = 1 << 18          # the number of edges sorted in memory before they are written to a run file
+RUN_BLOCK = 1 << 12         # the number of edges read at once from every run file while merging
+MERGE_FAN_IN = 64           # the largest number of run files merged (and so open) at once
+INT_RECORD = struct.Struct("=qqq")      # (row, column, cost) with an integer cost
+FLOAT_RECORD = struct.Struct("=qqd")    # (row, column, cost) with a real cost
+
+
+def _vertex_index(v, n, extra):
+    # the dense index of a vertex: v itself for 0 <= v < n, the next free index for any other vertex
+    if type(v) is not int:
+        raise GraphError("Only graphs with integer vertices can be written in a snapshot!")
+    if 0 <= v < n:
+        return v
+    index = extra.get(v)
+    if index is None:
+        index = extra[v] = n + len(extra)
+    return index
+
+
+def _write_run(directory, run):
+    run.sort()
+    record = FLOAT_RECORD if any(type(edge[2]) is float for edge in run) else INT_RECORD
+    handle, path = tempfile.mkstemp(suffix=".run", dir=directory)
+    with os.fdopen(handle, "wb") as file:
+        file.write(b"".join(record.pack(*edge) for edge in run))
+    return path, record
+
+
+def _read_run(path, record):
+    with open(path, "rb") as file:
+        while True:
+            data = file.read(record.size * RUN_BLOCK)
+            if not data:
+                return
+            yield from record.iter_unpack(data)
+
+
+def _merge_runs(directory, runs, fan_in):
+    # merges the runs in groups of fan_in into longer runs until at most fan_in are left, and returns the merged
+    # iterator of their edges
+    while len(runs) > fan_in:
+        merged = []
+        for first in range(0, len(runs), fan_in):
+            group = runs[first:first + fan_in]
+            if len(group) == 1:
+                merged.append(group[0])
+                continue
+            record = FLOAT_RECORD if any(run[1] is FLOAT_RECORD for run in group) else INT_RECORD
+            handle, path = tempfile.mkstemp(suffix=".run", dir=directory)
+            with os.fdopen(handle, "wb") as file:
+                block = []
+                for edge in heapq.merge(*(_read_run(*run) for run in group)):
+                    block.append(record.pack(*edge))
+                    if len(block) == RUN_BLOCK:
+                        file.write(b"".join(block))
+                        block = []
+                file.write(b"".join(block))
+            for run in group:
+                os.remove(run[0])
+            merged.append((path, record))
+        runs = merged
+    return heapq.merge(*(_read_run(*run) for run in runs))
+
+
+def _fill_rows(edges, n, offsets, columns, weights, to_weight):
+    # the edges come sorted by (row, column), so every row is written right after the previous one
+    row = 0
+    position = 0
+    previous = None
+    offsets[0] = 0
+    for a, b, cost in edges:
+        if (a, b) == previous:
+            raise GraphError("Edge already exists!")
+        previous = (a, b)
+        while row < a:
+            row += 1
+            offsets[row] = position
+        columns[position] = b
+        weights[position] = to_weight(cost)
+        position += 1
+    while row < n:
+        row += 1
+        offsets[row] = position
+
+
+def build_snapshot(text_path, snapshot_path, run_size=RUN_SIZE, chunk_size=CHUNK_SIZE, temp_dir=None,
+                   fan_in=MERGE_FAN_IN):
+    """
+    Converts a text graph file into a snapshot file (in the format of domain.graph_snapshot) with external sorting
+    :param text_path: the path of the text graph file
+    :param snapshot_path: the path of the snapshot file that is written
+    :param run_size: the number of edges sorted in memory at once
+    :param chunk_size: the number of bytes read at once from the text file
+    :param temp_dir: the directory of the temporary run files (the default temporary directory if None)
+    :param fan_in: the largest number of run files merged at once (at least 2)
+    :return: the pair (n, m) with the number of vertices and edges of the graph
+    """
+    if fan_in < 2:
+        raise GraphError("At least 2 runs must be merged at once!")
+    with tempfile.TemporaryDirectory(dir=temp_dir) as directory:
+        out_runs, in_runs = [], []
+        out_run, in_run = [], []
+        m = 0
+        extra = {}      # the vertices which are not numbered 0..n-1, with their indices
+        with open(text_path, "rb") as file:
+            n = read_graph_header(file)
+            for sources, targets, costs, isolated in iter_graph_chunks(file, chunk_size):
+                for v in isolated:
+                    _vertex_index(v, n, extra)
+                for v1, v2, cost in zip(sources, targets, costs):
+                    a, b = _vertex_index(v1, n, extra), _vertex_index(v2, n, extra)
+                    out_run.append((a, b, cost))
+                    in_run.append((b, a, cost))
+                m += len(costs)
+                if len(out_run) >= run_size:
+                    out_runs.append(_write_run(directory, out_run))
+                    in_runs.append(_write_run(directory, in_run))
+                    out_run, in_run = [], []
+        if out_run:
+            out_runs.append(_write_run(directory, out_run))
+            in_runs.append(_write_run(directory, in_run))
+        del out_run, in_run
+        numbered = n
+        n += len(extra)
+        floats = any(record is FLOAT_RECORD for path, record in out_runs)
+        flags = FLAG_BIG_ENDIAN if sys.byteorder == "big" else 0
+        if extra:
+            flags |= FLAG_VERTICES
+        if floats:
+            flags |= FLAG_FLOAT_WEIGHTS
+        positions, size = snapshot_layout(n, m, bool(extra))
+        weight_format = 'd' if floats else 'q'
+        to_weight = float if floats else int
+        try:
+            with open(snapshot_path, "w+b") as file:
+                file.truncate(size)
+                mapped = mmap.mmap(file.fileno(), size)
+                view = memoryview(mapped)
+                HEADER.pack_into(view, 0, MAGIC, VERSION, flags, n, m, *positions)
+                lengths = [n if extra else 0, n + 1, m, m, n + 1, m, m]
+                formats = ['q', 'q', 'q', weight_format, 'q', 'q', weight_format]
+                sections = [view[position:position + 8 * length].cast(item_format)
+                            for position, length, item_format in zip(positions, lengths, formats)]
+                vertices, out_offsets, out_targets, out_weights, in_offsets, in_sources, in_weights = sections
+                if extra:
+                    for v in range(numbered):
+                        vertices[v] = v
+                    for v, i in extra.items():
+                        vertices[i] = v
+                _fill_rows(_merge_runs(directory, out_runs, fan_in), n,
+                           out_offsets, out_targets, out_weights, to_weight)
+                _fill_rows(_merge_runs(directory, in_runs, fan_in), n,
+                           in_offsets, in_sources, in_weights, to_weight)
+                for section in sections:
+                    section.release()
+                view.release()
+                mapped.flush()
+                mapped.close()
+        except BaseException:
+            os.remove(snapshot_path)
+            raise
+    return n, m
+
+
+def load_external(text_path, snapshot_path, run_size=RUN_SIZE, chunk_size=CHUNK_SIZE, temp_dir=None,
+                  fan_in=MERGE_FAN_IN):
+    """
+    Converts a text graph file into a snapshot file with build_snapshot and memory-maps it
+    :return: the CSRGraph backed by the mapped snapshot file, whose pages are loaded on demand
+    """
+    build_snapshot(text_path, snapshot_path, run_size, chunk_size, temp_dir, fan_in)
+    return open_snapshot(snapshot_path)
@@ -1,5 +1,7 @@
-import copy
+from collections import deque
+from collections.abc import ItemsView, Mapping
 
+from domain.graph_file import read_graph_file, split_vertices, write_graph_file
 from errors.exceptions import GraphError
 
 
@@ -11,22 +13,131 @@ class Graph:
         """
         self.__vertices = n
         self.__edges = m
-        self.__edgeOut = {}
-        self.__edgeIn = {}
-        self.__cost = {}
+        self.__edgeOut = {}     # vertex -> insertion-ordered dictionary {out-neighbour: cost of the edge to it}
+        self.__edgeIn = {}      # vertex -> insertion-ordered dictionary {in-neighbour: None}, used as an ordered set
+        self.__version = 0      # incremented on every change, so that results computed on the graph can be invalidated
+        # copy-on-write state: the two dictionaries may be shared with snapshots of the graph, and so may the
+        # neighbour rows, except those of the vertices in owned_out / owned_in, which were cloned since
+        self.__shared_out_table = False
+        self.__shared_in_table = False
+        self.__shared_lists = False
+        self.__owned_out = set()
+        self.__owned_in = set()
+
+    @classmethod
+    def from_file(cls, path, string_ids=False):
+        """
+        Builds a graph from a text file in one pass, without the per-edge checks of add_edge
+        :param path: the path of a file in the format 'n m' followed by 'v1 v2 cost' lines
+        :param string_ids: if True, the vertices which are not numbers are read as strings instead of being an error
+        :return: the new graph with the vertices 0..n-1 (plus any other vertex mentioned in the file)
+        """
+        n, sources, targets, costs, isolated = read_graph_file(path, string_ids=string_ids)
+        graph = cls(n, len(costs))
+        edge_out = {v: {} for v in range(n)}
+        edge_in = {v: {} for v in range(n)}
+        for v in isolated:
+            if v not in edge_out:
+                edge_out[v] = {}
+                edge_in[v] = {}
+        for v1, v2, cost in zip(sources, targets, costs):
+            if v1 not in edge_out:
+                edge_out[v1] = {}
+                edge_in[v1] = {}
+            if v2 not in edge_out:
+                edge_out[v2] = {}
+                edge_in[v2] = {}
+            edge_out[v1][v2] = cost
+            edge_in[v2][v1] = None
+        if sum(map(len, edge_out.values())) != len(costs):
+            raise GraphError("Edge already exists!")
+        graph.__edgeOut = edge_out
+        graph.__edgeIn = edge_in
+        graph.__vertices = len(edge_out)
+        return graph
+
+    def to_file(self, path):
+        """
+        Writes the graph in the same text format that from_file reads
+        :param path: the path of the file
+        """
+        n, isolated = split_vertices(self.__edgeOut, lambda v: self.__edgeOut[v] or self.__edgeIn[v])
+        write_graph_file(path, n, self.get_edges(), isolated)
+
+    def snapshot(self):
+        """
+        Creates a copy of the graph in O(1): the copy shares its storage with this graph and every one of them
+        clones only what it changes afterwards (on its first change the dictionary of rows it changes, without the
+        rows, and then the rows of the vertices whose edges change, the costs being kept in the outbound rows). The
+        copy starts with the version of this graph, as it has the same contents
+        :return: the new graph
+        """
+        copy = Graph(self.__vertices, self.__edges)
+        copy.adopt(self)
+        copy.__version = self.__version
+        return copy
+
+    def adopt(self, other):
+        """
+        Replaces the vertices and edges of this graph with those of another graph, sharing the storage in a
+        copy-on-write manner like snapshot does
+        :param other: the graph whose contents are taken
+        """
+        self.__vertices = other.__vertices
+        self.__edges = other.__edges
+        self.__edgeOut = other.__edgeOut
+        self.__edgeIn = other.__edgeIn
+        self.__version += 1
+        for graph in (self, other):
+            graph.__shared_out_table = True
+            graph.__shared_in_table = True
+            graph.__shared_lists = True
+            graph.__owned_out = set()
+            graph.__owned_in = set()
+
+    def __own_tables(self):
+        # the first change after a snapshot clones the dictionaries it changes, in O(V), but not the rows they hold
+        if self.__shared_out_table:
+            self.__edgeOut = dict(self.__edgeOut)
+            self.__shared_out_table = False
+        if self.__shared_in_table:
+            self.__edgeIn = dict(self.__edgeIn)
+            self.__shared_in_table = False
+
+    def __own_out(self, v):
+        # a changed row is cloned once, with the costs it holds, so a change copies only the rows it touches
+        if self.__shared_out_table:
+            self.__edgeOut = dict(self.__edgeOut)
+            self.__shared_out_table = False
+        if self.__shared_lists and v not in self.__owned_out:
+            self.__edgeOut[v] = self.__edgeOut[v].copy()
+            self.__owned_out.add(v)
+
+    def __own_in(self, v):
+        if self.__shared_in_table:
+            self.__edgeIn = dict(self.__edgeIn)
+            self.__shared_in_table = False
+        if self.__shared_lists and v not in self.__owned_in:
+            self.__edgeIn[v] = self.__edgeIn[v].copy()
+            self.__owned_in.add(v)
+
+    def get_version(self):
+        """
+        :return: the version of the graph, which changes every time the graph is changed
+        """
+        return self.__version
 
     def get_nr_vertices(self):
         """
         :return: JUST the number of the vertices
         """
-        verts = copy.deepcopy(self.__vertices)
-        return verts
+        return self.__vertices
 
     def get_nr_edges(self):
         """
         :return: JUST the number of the edges
         """
-        return len(self.__cost.keys())
+        return self.__edges
 
     def get_vertices(self):
         """
@@ -37,31 +148,59 @@ class Graph:
     def get_n_out(self, v):
         """
         :param v: the vertex of which we want to get all the outbound neighbours
-        :return: an iterable with all the outbound neighbours of v
+        :return: a read-only tuple with all the outbound neighbours of v
         """
-        return copy.deepcopy(self.__edgeOut[v])
+        return tuple(self.__edgeOut[v])
 
     def get_n_in(self, v):
         """
         :param v: the vertex of which we want to get all the inbound neighbours
-        :return: an iterable with all the inbound neighbours of v
+        :return: a read-only tuple with all the inbound neighbours of v
         """
-        return copy.deepcopy(self.__edgeIn[v])
+        return tuple(self.__edgeIn[v])
+
+    def get_out_degree(self, v):
+        """
+        :param v: the vertex of which we want the number of outbound neighbours
+        :return: the OUT degree of v
+        """
+        return len(self.__edgeOut[v])
+
+    def get_in_degree(self, v):
+        """
+        :param v: the vertex of which we want the number of inbound neighbours
+        :return: the IN degree of v
+        """
+        return len(self.__edgeIn[v])
 
     def get_copy_of_outs(self):
-        """:return: a copy of the outbound edge dictionary"""
-        return copy.deepcopy(self.__edgeOut)
+        """:return: a copy of the outbound edge dictionary, safe to be mutated by the caller"""
+        return {v: list(neighbours) for v, neighbours in self.__edgeOut.items()}
 
     def get_copy_of_ins(self):
-        """:return: a copy of the inbound edge dictionary"""
-        return copy.deepcopy(self.__edgeIn)
+        """:return: a copy of the inbound edge dictionary, safe to be mutated by the caller"""
+        return {v: list(neighbours) for v, neighbours in self.__edgeIn.items()}
 
     def get_edges(self):
         """
         Method that provides the list of edges in the graph
-        :return: an iterable with all the edges
+        :return: a read-only mapping {(v1, v2): cost} with all the edges (valid until the graph is changed)
         """
-        return copy.deepcopy(self.__cost)
+        return _EdgeCosts(self.__edgeOut, self.__edges)
+
+    def get_copy_of_edges(self):
+        """:return: a copy of the dictionary of edge-costs, safe to be mutated by the caller"""
+        return {(v1, v2): cost for v1, row in self.__edgeOut.items() for v2, cost in row.items()}
+
+    def iter_edges(self):
+        """
+        Generator that yields the edges one by one, without copying them (the graph must not be changed while the
+        iteration is running)
+        :return: an iterator of triples (v1, v2, cost)
+        """
+        for v1, row in self.__edgeOut.items():
+            for v2, cost in row.items():
+                yield v1, v2, cost
 
     def get_cost(self, v1, v2):
         """
@@ -70,8 +209,10 @@ class Graph:
         :param v2: ending vertex
         :return: the cost from v1 to v2
         """
-        pair = (v1, v2)
-        return self.__cost[pair]
+        try:
+            return self.__edgeOut[v1][v2]
+        except KeyError:
+            raise KeyError((v1, v2))
 
     def set_cost(self, v1, v2, new_cost):
         """
@@ -80,8 +221,11 @@ class Graph:
         :param v2: ending vertex
         :param new_cost: the new cost that will be assigned to edge [v1, v2]
         """
-        pair = (v1, v2)
-        self.__cost[pair] = new_cost
+        if v2 not in self.__edgeOut.get(v1, ()):
+            raise GraphError("Nonexistent edge!")
+        self.__own_out(v1)
+        self.__edgeOut[v1][v2] = new_cost
+        self.__version += 1
 
     def is_edge(self, v1, v2):
         """
@@ -95,11 +239,16 @@ class Graph:
         return False
 
     def add_double_edge(self, v1, v2, c):
-        self.__edges += 1
-        pair = (v1, v2)
-        self.__edgeOut[v1].append(v2)
-        self.__edgeIn[v2].append(v1)
-        self.__cost[pair] = c
+        """
+        Method that adds the edge from v1 to v2 without checking if it already exists (its cost is replaced if it does)
+        """
+        if v2 not in self.__edgeOut[v1]:
+            self.__edges += 1
+        self.__version += 1
+        self.__own_out(v1)
+        self.__own_in(v2)
+        self.__edgeOut[v1][v2] = c
+        self.__edgeIn[v2][v1] = None
 
     def add_edge(self, v1, v2, c):
         """
@@ -107,45 +256,75 @@ class Graph:
         :param v1: starting vertex
         :param v2: ending vertex
         :param c: the cost from v1 to v2
-        :return:
-                - true: if the adding was successful
-                - false: otherwise
+        :return: True (a GraphError is raised if the edge already exists or one of its vertices does not)
         """
-        self.__edges += 1
-        pair = (v1, v2)
-        if pair not in self.__cost.keys():
-            self.__edgeOut[v1].append(v2)
-            self.__edgeIn[v2].append(v1)
-            self.__cost[pair] = c
-            if pair in self.__cost.keys() and \
-                    v1 in self.__edgeIn[v2] and \
-                    v2 in self.__edgeOut[v1]:
-                return True
-            return False
-        else:
+        if v2 in self.__edgeOut.get(v1, ()):
             raise GraphError("Edge already exists!")
+        if v1 not in self.__edgeOut or v2 not in self.__edgeOut:
+            raise GraphError("Nonexistent vertex!")
+        self.__edges += 1
+        self.__version += 1
+        self.__own_out(v1)
+        self.__own_in(v2)
+        self.__edgeOut[v1][v2] = c
+        self.__edgeIn[v2][v1] = None
+        return True
 
     def remove_edge(self, v1, v2):
         """
         Method that removes a specific edge that starts in the vertex v1 and ends in v2
         :param v1: starting vertex
         :param v2: ending vertex
-        :return:
-                - true: if the removing was successful
-                - false: otherwise
+        :return: True (a GraphError is raised if the edge does not exist)
         """
+        if v2 not in self.__edgeOut.get(v1, ()):
+            raise GraphError("Nonexistent edge!")
         self.__edges -= 1
-        pair = (v1, v2)
-        v1_succs = self.__edgeOut[v1]
-        v2_preds = self.__edgeIn[v2]
-        v1_succs.remove(v2)
-        v2_preds.remove(v1)
-        self.__cost.pop(pair)
-        if pair not in self.__cost.keys() and \
-                v1 not in self.__edgeIn[v2] and \
-                v2 not in self.__edgeOut[v1]:
-            return True
-        return False
+        self.__version += 1
+        self.__own_out(v1)
+        self.__own_in(v2)
+        del self.__edgeOut[v1][v2]
+        del self.__edgeIn[v2][v1]
+        return True
+
+    def apply_batch(self, ops):
+        """
+        Applies a sequence of edge operations as one transaction, in one pass and in O(1) per operation: either all
+        of them are applied or, as soon as one of them is invalid, the ones already applied are undone and a
+        GraphError naming the invalid operation is raised
+        :param ops: an iterable of tuples ("add", v1, v2, cost), ("remove", v1, v2) or ("set_cost", v1, v2, cost)
+        :return: the number of applied operations
+        """
+        undo = []       # (kind, v1, v2, cost) of the operation reverting every applied one, in order
+        number, op = 0, None
+        try:
+            for number, op in enumerate(ops):
+                kind = op[0] if op else None
+                if kind == "add" and len(op) == 4:
+                    self.add_edge(op[1], op[2], op[3])
+                    undo.append(("remove", op[1], op[2], None))
+                elif kind == "remove" and len(op) == 3:
+                    cost = self.__edgeOut.get(op[1], {}).get(op[2])
+                    self.remove_edge(op[1], op[2])
+                    undo.append(("add", op[1], op[2], cost))
+                elif kind == "set_cost" and len(op) == 4:
+                    if op[2] not in self.__edgeOut.get(op[1], ()):
+                        raise GraphError("Nonexistent edge!")
+                    undo.append(("set_cost", op[1], op[2], self.__edgeOut[op[1]][op[2]]))
+                    self.set_cost(op[1], op[2], op[3])
+                else:
+                    raise GraphError("Unknown operation!")
+        except GraphError as error:
+            for kind, v1, v2, cost in reversed(undo):
+                if kind == "add":
+                    self.add_edge(v1, v2, cost)
+                elif kind == "remove":
+                    self.remove_edge(v1, v2)
+                else:
+                    self.set_cost(v1, v2, cost)
+            raise GraphError("Operation " + str(number) + " " + str(op) + " failed: " + str(error) +
+                             " The batch was rolled back.")
+        return len(undo)
 
     def add_vertex(self, v1):
         """
@@ -153,45 +332,69 @@ class Graph:
         :param v1: the new vertex that will be added
         """
         self.__vertices += 1
-        self.__edgeOut[v1] = []
-        self.__edgeIn[v1] = []
+        self.__version += 1
+        self.__own_tables()
+        self.__edgeOut[v1] = {}
+        self.__edgeIn[v1] = {}
+        self.__owned_out.add(v1)
+        self.__owned_in.add(v1)
 
     def remove_vertex(self, v1):
         """
-        Method that removes a vertex along side with all it's connected edges
+        Method that removes a vertex along side with all it's connected edges, in O(1) per edge
         :param v1: the to-be-removed vertex
         """
+        if v1 not in self.__edgeOut:
+            raise GraphError("Nonexistent vertex!")
         self.__vertices -= 1
-        for out_v in self.__edgeOut[v1]:
-            pair = (v1, out_v)
-            self.__cost.pop(pair)
-        self.__edgeOut.pop(v1)
-        for v in self.__edgeIn[v1]:
-            pair = (v, v1)
-            self.__cost.pop(pair)
-            self.__edgeOut[v].remove(v1)
-        self.__edgeIn.pop(v1)
+        self.__version += 1
+        self.__own_tables()
+        succs = self.__edgeOut.pop(v1)
+        preds = self.__edgeIn.pop(v1)
+        for out_v in succs:
+            if out_v != v1:
+                self.__own_in(out_v)
+                del self.__edgeIn[out_v][v1]
+        for v in preds:
+            if v != v1:
+                self.__own_out(v)
+                del self.__edgeOut[v][v1]
+        self.__edges -= len(succs) + len(preds) - (v1 in succs)
+        self.__owned_out.discard(v1)
+        self.__owned_in.discard(v1)
 
     def set_n_out(self, out_neighbours):
         """
         Method that replaces graph's current dictionary of out-bound neighbours with a new one
-        :param out_neighbours: the new dictionary of out-neighbours (copied from another graph)
+        :param out_neighbours: the new dictionary of out-neighbours (copied from another graph), as {vertex: iterable}
+                               (the edges have no cost until set_costs gives them one)
         """
-        self.__edgeOut = out_neighbours
+        self.__edgeOut = {v: dict.fromkeys(neighbours) for v, neighbours in out_neighbours.items()}
+        self.__shared_out_table = False
+        self.__owned_out = set(out_neighbours)
+        self.__version += 1
 
     def set_n_in(self, in_neighbours):
         """
         Method that replaces graph's current dictionary of in-bound neighbours with a new one
-        :param in_neighbours: the new dictionary of in-neighbours (copied from another graph)
+        :param in_neighbours: the new dictionary of in-neighbours (copied from another graph), as {vertex: iterable}
         """
-        self.__edgeIn = in_neighbours
+        self.__edgeIn = {v: dict.fromkeys(neighbours) for v, neighbours in in_neighbours.items()}
+        self.__shared_in_table = False
+        self.__owned_in = set(in_neighbours)
+        self.__version += 1
 
     def set_costs(self, new_costs):
         """
         Method that replaces graph's current dictionary of costs with a new one
-        :param new_costs: the new dictionary of edge-costs (copied from another graph)
-        """
-        self.__cost = new_costs
+        :param new_costs: the new dictionary of edge-costs (copied from another graph), whose edges are the ones of
+                          the out-bound neighbours
+        """
+        for (v1, v2), cost in new_costs.items():
+            self.__own_out(v1)
+            self.__edgeOut[v1][v2] = cost
+        self.__edges = len(new_costs)
+        self.__version += 1
 
     def set_nr_vertices(self, new_verts):
         """
@@ -199,6 +402,7 @@ class Graph:
         :param new_verts: the new number of vertices (copied from another graph)
         """
         self.__vertices = new_verts
+        self.__version += 1
 
     def set_nr_edges(self, new_edges):
         """
@@ -206,30 +410,84 @@ class Graph:
         :param new_edges: the new number of edges (copied from another graph)
         """
         self.__edges = new_edges
+        self.__version += 1
+
+    def breadth_first_order(self, start, visited):
+        """
+        Method that traverses the graph in a BF manner in O(V + E), following the outbound edges
+        :param start: starting vertex
+        :param visited: the set of already visited nodes, in order to not visit the same vertex twice (it is updated)
+        :return: the list of vertices reached from start, in the order they were visited
+        """
+        q = deque([start])
+        visited.add(start)
+        acc = [start]
+        while q:
+            x = q.popleft()
+            for i in self.__edgeOut[x]:
+                if i not in visited:
+                    visited.add(i)
+                    acc.append(i)
+                    q.append(i)
+        return acc
 
     def breadth_first_traversal(self, start, visited):
         """
         Method that simply traverses the graph in a BF manner
         :param start: starting vertex
-        :param visited: the already visited nodes, in order to not visit the same vertex twice
+        :param visited: the set of already visited nodes, in order to not visit the same vertex twice (it is updated)
         :return: the list of edges of the connected component and the list of vertices
         """
-        q = []
-        acc = []
-        q.append(start)
-        visited.append(start)
-        acc.append(start)
+        acc = self.breadth_first_order(start, visited)
         cost_fake = {}
-        while len(q) > 0:
-            x = q.pop(0)
-            for i in self.__edgeOut[x]:
-                pair1 = (x, i)
-                pair2 = (i, x)
-                cost_fake[pair1] = self.get_cost(x, i)
-                cost_fake[pair2] = self.get_cost(x, i)
-                if i not in visited:
-                    visited.append(i)
-                    acc.append(i)
-                    q.append(i)
+        for x in acc:
+            for i, cost in self.__edgeOut[x].items():
+                cost_fake[(x, i)] = cost
+                cost_fake[(i, x)] = cost
         return cost_fake, acc
 
+
+class _EdgeCosts(Mapping):
+    """
+    Read-only mapping {(v1, v2): cost} over the rows of a graph, which hold the costs of the outbound edges
+    """
+    def __init__(self, edge_out, nr_edges):
+        self.__edge_out = edge_out
+        self.__nr_edges = nr_edges
+
+    def __getitem__(self, pair):
+        try:
+            return self.__edge_out[pair[0]][pair[1]]
+        except (KeyError, IndexError, TypeError):
+            raise KeyError(pair)
+
+    def __contains__(self, pair):
+        try:
+            return pair[1] in self.__edge_out[pair[0]]
+        except (KeyError, IndexError, TypeError):
+            return False
+
+    def __iter__(self):
+        for v1, row in self.__edge_out.items():
+            for v2 in row:
+                yield v1, v2
+
+    def __len__(self):
+        return self.__nr_edges
+
+    def items(self):
+        return _EdgeCostItems(self.__edge_out, self.__nr_edges)
+
+
+class _EdgeCostItems(ItemsView):
+    """
+    The items of an _EdgeCosts mapping, read straight from the rows instead of looking every pair up again
+    """
+    def __init__(self, edge_out, nr_edges):
+        super().__init__(_EdgeCosts(edge_out, nr_edges))
+        self.__edge_out = edge_out
+
+    def __iter__(self):
+        for v1, row in self.__edge_out.items():
+            for v2, cost in row.items():
+                yield (v1, v2), cost
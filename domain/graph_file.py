@@ -0,0 +1,159 @@
+"""
+Bulk reading and writing of the text graph format used by the files of the project:
+    n m             - the number of vertices (numbered from 0 to n-1) and the number of edges
+    v1 v2 cost      - one line for every edge
+    v               - (optional) one line for every extra, isolated vertex
+The vertices are numbers; a reader asked for string IDs also reads any token which is not a number as the string
+ID of a vertex.
+"""
+from errors.exceptions import GraphError
+
+CHUNK_SIZE = 1 << 20        # the number of bytes read from the file at once
+WRITE_BATCH = 1 << 15       # the number of lines formatted before writing them at once
+
+
+def parse_number(token):
+    """
+    :param token: the bytes/str token holding a number
+    :return: the token as an int or, if it is not an integer, as a float
+    """
+    try:
+        return int(token)
+    except ValueError:
+        try:
+            return float(token)
+        except ValueError:
+            raise GraphError("Invalid number in the graph file: " + repr(token))
+
+
+def parse_vertex(token):
+    """
+    :param token: the bytes/str token holding a vertex
+    :return: the token as a number (like parse_number) or, if it is not a number, as a string ID
+    """
+    try:
+        return parse_number(token)
+    except GraphError:
+        return token.decode() if isinstance(token, bytes) else token
+
+
+def _parse_lines(lines, sources, targets, costs, isolated, parse_id):
+    for line in lines:
+        tokens = line.split()
+        if len(tokens) == 3:
+            sources.append(parse_id(tokens[0]))
+            targets.append(parse_id(tokens[1]))
+            costs.append(parse_number(tokens[2]))
+        elif len(tokens) == 1:
+            isolated.append(parse_id(tokens[0]))
+        elif len(tokens) != 0:
+            raise GraphError("Invalid line in the graph file: " + repr(line))
+
+
+def _parse_chunk(chunk, sources, targets, costs, isolated, parse_id=parse_number):
+    tokens = chunk.split()
+    lines = chunk.splitlines()
+    if len(tokens) == 3 * len(lines) and all(map((3).__eq__, map(len, map(bytes.split, lines)))):
+        # fast path: every line is an edge (checked line by line, since the total number of tokens alone may add
+        # up for malformed lines), so the whole chunk is converted at once and split by striding
+        try:
+            values = list(map(int, tokens))
+        except ValueError:
+            values = None
+        if values is not None:
+            sources.extend(values[0::3])
+            targets.extend(values[1::3])
+            costs.extend(values[2::3])
+            return
+    _parse_lines(lines, sources, targets, costs, isolated, parse_id)
+
+
+def read_graph_header(file):
+    """
+    :param file: a graph file opened in binary mode, at its beginning
+    :return: the number of vertices n from the header line 'n m'
+    """
+    header = file.readline().split()
+    if len(header) != 2:
+        raise GraphError("The graph file must start with the line 'n m'!")
+    return parse_number(header[0])
+
+
+def _read_chunks(file, chunk_size):
+    rest = b""
+    while True:
+        chunk = file.read(chunk_size)
+        if not chunk:
+            break
+        chunk = rest + chunk
+        cut = chunk.rfind(b"\n") + 1     # the last (possibly incomplete) line is kept for the next chunk
+        rest = chunk[cut:]
+        yield chunk[:cut]
+    yield rest
+
+
+def iter_graph_chunks(file, chunk_size=CHUNK_SIZE):
+    """
+    Generator that parses the lines of a graph file one chunk at a time, so that the file is never held whole
+    :param file: a graph file opened in binary mode, after its header (see read_graph_header)
+    :param chunk_size: the number of bytes read at once
+    :return: an iterator of tuples (sources, targets, costs, isolated), one for every chunk, in the format of
+             read_graph_file
+    """
+    for chunk in _read_chunks(file, chunk_size):
+        sources, targets, costs, isolated = [], [], [], []
+        _parse_chunk(chunk, sources, targets, costs, isolated)
+        yield sources, targets, costs, isolated
+
+
+def read_graph_file(path, chunk_size=CHUNK_SIZE, string_ids=False):
+    """
+    Reads a whole graph file in chunks
+    :param path: the path of the file
+    :param chunk_size: the number of bytes read at once
+    :param string_ids: if True, the vertices which are not numbers are read as strings instead of being an error
+    :return: the tuple (n, sources, targets, costs, isolated) where the edge i goes from sources[i] to targets[i]
+             with the cost costs[i] and isolated is the list of vertices given on their own line
+    """
+    sources, targets, costs, isolated = [], [], [], []
+    with open(path, "rb") as file:
+        n = read_graph_header(file)
+        for chunk in _read_chunks(file, chunk_size):
+            _parse_chunk(chunk, sources, targets, costs, isolated, parse_vertex if string_ids else parse_number)
+    return n, sources, targets, costs, isolated
+
+
+def split_vertices(vertices, has_edges):
+    """
+    Chooses how the vertices of a graph are written, so that reading the file gives back exactly the same vertices
+    :param vertices: the vertices (a container with a fast 'in' test)
+    :param has_edges: the function telling whether a vertex has any inbound or outbound edge
+    :return: the pair (n, isolated) where n is the largest k for which the vertices 0..k-1 all exist (the number
+             written in the header) and isolated is the list of the other vertices without edges, which must be
+             written on their own line
+    """
+    n = 0
+    while n in vertices:
+        n += 1
+    return n, [v for v in vertices if not (type(v) is int and 0 <= v < n) and not has_edges(v)]
+
+
+def write_graph_file(path, nr_vertices, edges, isolated=()):
+    """
+    Writes a graph in the text format, formatting the lines in batches
+    :param path: the path of the file
+    :param nr_vertices: the number of vertices written in the header
+    :param edges: the dictionary (or mapping) {(v1, v2): cost} with all the edges
+    :param isolated: the vertices which must be written on their own line
+    """
+    with open(path, "w") as file:
+        file.write(str(nr_vertices) + " " + str(len(edges)) + "\n")
+        batch = []
+        for (v1, v2), cost in edges.items():
+            batch.append("%s %s %s\n" % (v1, v2, cost))
+            if len(batch) == WRITE_BATCH:
+                file.write("".join(batch))
+                batch = []
+        for v in isolated:
+            batch.append(str(v) + "\n")
+        file.write("".join(batch))
@@ -0,0 +1,139 @@
+"""
+Binary snapshot format of a frozen (CSR) graph, made to be memory-mapped and used without copying:
+    header          - magic, version, flags, n, m and the byte offset of every section
+    vertices        - n signed 64-bit integers (only if the vertices are not exactly 0..n-1)
+    out_offsets     - n+1 signed 64-bit integers
+    out_targets     - m signed 64-bit integers
+    out_weights     - m signed 64-bit integers or doubles
+    in_offsets      - n+1 signed 64-bit integers
+    in_sources      - m signed 64-bit integers
+    in_weights      - m signed 64-bit integers or doubles
+Every section starts on a multiple of 8 bytes. The numbers are stored in the byte order of the machine that wrote
+the snapshot, which is recorded in the flags.
+"""
+import mmap
+import struct
+import sys
+from array import array
+
+from domain.csr_graph import CSRGraph
+from errors.exceptions import GraphError
+
+MAGIC = b"GRAPHCSR"
+VERSION = 1
+HEADER = struct.Struct("=8sIIqq7q")
+
+FLAG_VERTICES = 1           # the vertices section is present
+FLAG_FLOAT_WEIGHTS = 2      # the weights are doubles instead of integers
+FLAG_BIG_ENDIAN = 4         # the snapshot was written on a big-endian machine
+
+
+def write_snapshot(graph, file):
+    """
+    Writes a graph as a binary snapshot
+    :param graph: the graph (a CSRGraph or anything CSRGraph.from_graph accepts)
+    :param file: a binary file-like object opened for writing
+    :return: the number of bytes written
+    """
+    if not isinstance(graph, CSRGraph):
+        graph = CSRGraph.from_graph(graph)
+    vertices, out_offsets, out_targets, out_weights, in_offsets, in_sources, in_weights = graph.get_buffers()
+    flags = FLAG_BIG_ENDIAN if sys.byteorder == "big" else 0
+    if vertices is not None:
+        if not all(type(v) is int for v in vertices):
+            raise GraphError("Only graphs with integer vertices can be written in a snapshot!")
+        vertices = array('q', vertices)
+        flags |= FLAG_VERTICES
+    if memoryview(out_weights).format == 'd' or memoryview(in_weights).format == 'd':
+        out_weights = array('d', out_weights)
+        in_weights = array('d', in_weights)
+        flags |= FLAG_FLOAT_WEIGHTS
+    sections = [vertices, out_offsets, out_targets, out_weights, in_offsets, in_sources, in_weights]
+    n = len(out_offsets) - 1
+    m = len(out_targets)
+    positions, size = snapshot_layout(n, m, vertices is not None)
+    file.write(HEADER.pack(MAGIC, VERSION, flags, n, m, *positions))
+    for section in sections:
+        if section is not None:
+            file.write(memoryview(section).cast('B'))
+    return size
+
+
+def snapshot_layout(n, m, has_vertices):
+    """
+    :param n: the number of vertices
+    :param m: the number of edges
+    :param has_vertices: True if the vertices section is present
+    :return: the pair (positions, size) with the byte offset of every section (in the order of the header) and the
+             total size of the snapshot
+    """
+    lengths = [n if has_vertices else 0, n + 1, m, m, n + 1, m, m]
+    positions = []
+    position = HEADER.size
+    for length in lengths:
+        positions.append(position)
+        position += 8 * length
+    return positions, position
+
+
+def snapshot_size(graph):
+    """
+    :param graph: a CSRGraph
+    :return: the number of bytes write_snapshot would write for it
+    """
+    vertices, out_offsets, out_targets = graph.get_buffers()[:3]
+    return snapshot_layout(len(out_offsets) - 1, len(out_targets), vertices is not None)[1]
+
+
+def read_snapshot(buffer):
+    """
+    Builds a CSRGraph directly on top of a snapshot held in a buffer (bytes, mmap, shared memory), without copying
+    the arrays: the graph keeps the buffer alive for as long as it is used
+    :param buffer: an object supporting the buffer protocol holding a snapshot
+    :return: the CSRGraph
+    """
+    view = memoryview(buffer).cast('B')
+    if len(view) < HEADER.size:
+        raise GraphError("Not a graph snapshot!")
+    magic, version, flags, n, m, *positions = HEADER.unpack_from(view, 0)
+    if magic != MAGIC:
+        raise GraphError("Not a graph snapshot!")
+    if version != VERSION:
+        raise GraphError("Unsupported graph snapshot version: " + str(version))
+    if bool(flags & FLAG_BIG_ENDIAN) != (sys.byteorder == "big"):
+        raise GraphError("The snapshot was written on a machine with a different byte order!")
+    weight_format = 'd' if flags & FLAG_FLOAT_WEIGHTS else 'q'
+    lengths = [n if flags & FLAG_VERTICES else None, n + 1, m, m, n + 1, m, m]
+    formats = ['q', 'q', 'q', weight_format, 'q', 'q', weight_format]
+    sections = []
+    for position, length, item_format in zip(positions, lengths, formats):
+        if length is None:
+            sections.append(None)
+            continue
+        end = position + 8 * length
+        if end > len(view):
+            raise GraphError("The graph snapshot is truncated!")
+        sections.append(view[position:end].cast(item_format))
+    return CSRGraph(*sections)
+
+
+def save_snapshot(graph, path):
+    """
+    Writes a graph as a binary snapshot file
+    :param graph: the graph (a CSRGraph or anything CSRGraph.from_graph accepts)
+    :param path: the path of the file
+    """
+    with open(path, "wb") as file:
+        write_snapshot(graph, file)
+
+
+def open_snapshot(path):
+    """
+    Memory-maps a snapshot file read-only: the pages are loaded on demand and shared by every process that maps
+    the same file
+    :param path: the path of the file
+    :return: the CSRGraph backed by the mapped file
+    """
+    with open(path, "rb") as file:
+        mapped = mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ)
+    return read_snapshot(mapped)
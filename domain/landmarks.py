@@ -0,0 +1,51 @@
+"""
+The landmarks Class which holds the preprocessing of the ALT (A*, Landmarks, Triangle inequality) shortest path search
+"""
+INFINITY = float("inf")
+
+
+class Landmarks:
+    """
+    A few landmark vertices L together with the distances d(L, v) from every landmark and d(v, L) to every landmark.
+    By the triangle inequality, for every pair of vertices v, t and every landmark L:
+        d(v, t) >= d(L, t) - d(L, v)   and   d(v, t) >= d(v, L) - d(t, L)
+    so the best of these differences is a lower bound of d(v, t) which can be used as an A* heuristic
+    """
+    def __init__(self, landmarks, dist_from, dist_to):
+        """
+        :param landmarks: the list of landmark vertices
+        :param dist_from: the list holding on position i the dictionary {v: d(landmarks[i], v)}
+        :param dist_to: the list holding on position i the dictionary {v: d(v, landmarks[i])}
+        """
+        self.__landmarks = landmarks
+        self.__tables = list(zip(dist_from, dist_to))
+
+    def get_landmarks(self):
+        """:return: the list of landmark vertices"""
+        return list(self.__landmarks)
+
+    def lower_bound(self, v, t):
+        """
+        :param v: the current vertex
+        :param t: the target vertex
+        :return: a lower bound of the distance from v to t (infinite if t is certainly unreachable from v)
+        """
+        best = 0
+        for dist_from, dist_to in self.__tables:
+            from_v = dist_from.get(v)
+            from_t = dist_from.get(t)
+            if from_t is not None:
+                if from_v is not None:
+                    if from_t - from_v > best:
+                        best = from_t - from_v
+                # L reaches t but not v: nothing can be said about d(v, t)
+            elif from_v is not None:
+                return INFINITY     # L reaches v but not t, so v can not reach t either
+            to_v = dist_to.get(v)
+            to_t = dist_to.get(t)
+            if to_t is not None:
+                if to_v is None:
+                    return INFINITY     # t reaches L but v does not, so v can not reach t either
+                if to_v - to_t > best:
+                    best = to_v - to_t
+        return best
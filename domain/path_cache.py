@@ -0,0 +1,98 @@
+"""
+The cache Class which keeps the most recently used shortest-path trees, so that repeated queries are not recomputed
+"""
+import threading
+from collections import OrderedDict
+
+
+class ShortestPathCache:
+    """
+    LRU cache of shortest-path trees keyed by (graph index, source). Every tree remembers the version of the graph
+    it was computed on and is thrown away when the graph has changed since. The memory is bounded by the total
+    number of vertices held by the cached trees: the least recently used trees are evicted when it is exceeded.
+    Every method holds an internal lock, as the service reads the cache from many threads at once
+    """
+    def __init__(self, max_vertices=1000000):
+        """
+        :param max_vertices: the maximum total number of vertices in all the cached trees (0 disables the cache)
+        """
+        self.__max_vertices = max_vertices
+        self.__entries = OrderedDict()  # (gi, source) -> (version, dist, prev), from the least to the most recent
+        self.__size = 0                 # the total number of vertices in the cached trees
+        self.__hits = 0
+        self.__misses = 0
+        self.__evictions = 0
+        self.__invalidations = 0
+        self.__lock = threading.Lock()
+
+    def get(self, gi, source, version):
+        """
+        :param gi: the index of the graph
+        :param source: the source vertex of the tree
+        :param version: the current version of the graph
+        :return: the pair (dist, prev) of the cached tree or None if there is no valid tree for this query
+        """
+        with self.__lock:
+            key = (gi, source)
+            entry = self.__entries.get(key)
+            if entry is not None and entry[0] != version:
+                self.__remove(key)
+                self.__invalidations += 1
+                entry = None
+            if entry is None:
+                self.__misses += 1
+                return None
+            self.__entries.move_to_end(key)
+            self.__hits += 1
+            return entry[1], entry[2]
+
+    def put(self, gi, source, version, dist, prev):
+        """
+        Stores a tree, evicting the least recently used ones if the memory bound is exceeded
+        :param gi: the index of the graph
+        :param source: the source vertex of the tree
+        :param version: the version of the graph the tree was computed on
+        :param dist: the dictionary {vertex: distance from source}
+        :param prev: the dictionary {vertex: its predecessor on the shortest path from source}
+        """
+        with self.__lock:
+            key = (gi, source)
+            if key in self.__entries:
+                self.__remove(key)
+            if len(dist) > self.__max_vertices:
+                return
+            self.__entries[key] = (version, dist, prev)
+            self.__size += len(dist)
+            while self.__size > self.__max_vertices:
+                self.__remove(next(iter(self.__entries)))
+                self.__evictions += 1
+
+    def invalidate_graph(self, gi):
+        """
+        Drops every tree computed on a graph
+        :param gi: the index of the graph
+        """
+        with self.__lock:
+            for key in [key for key in self.__entries if key[0] == gi]:
+                self.__remove(key)
+                self.__invalidations += 1
+
+    def clear(self):
+        """Drops every cached tree (the statistics are kept)"""
+        with self.__lock:
+            self.__entries.clear()
+            self.__size = 0
+
+    def get_stats(self):
+        """
+        :return: a dictionary with the hits, misses, evictions, invalidations, the number of cached trees and the
+                 total number of vertices they hold
+        """
+        with self.__lock:
+            return {"hits": self.__hits, "misses": self.__misses, "evictions": self.__evictions,
+                    "invalidations": self.__invalidations, "trees": len(self.__entries), "vertices": self.__size,
+                    "max_vertices": self.__max_vertices}
+
+    def __remove(self, key):
+        version, dist, prev = self.__entries.pop(key)
+        self.__size -= len(dist)
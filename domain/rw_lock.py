@@ -0,0 +1,98 @@
+"""
+The reader/writer lock Class the service uses to guard every graph: many threads may read a graph at once, while a
+thread changing it holds it alone
+"""
+import threading
+from contextlib import contextmanager
+from threading import get_ident
+
+
+class ReadWriteLock:
+    """
+    Writer-preferring reader/writer lock: once a writer waits, no new reader gets in, so a steady flow of readers can
+    not starve the writers. The lock is re-entrant per thread: a thread holding it may take it again for reading
+    (also inside a write) or, if it holds it for writing, for writing; taking it for writing while holding it only
+    for reading would deadlock, so it raises a RuntimeError. Releasing the write lock while still holding read
+    acquisitions downgrades the lock: the thread keeps it for reading, with the other readers
+    """
+    def __init__(self):
+        self.__mutex = threading.Lock()
+        self.__condition = threading.Condition(self.__mutex)
+        self.__readers = 0              # the number of threads holding the lock for reading
+        self.__writer = None            # the identifier of the thread holding the lock for writing
+        self.__waiting_writers = 0
+        self.__reads = {}               # thread identifier -> the depth of its read acquisitions
+        self.__writes = 0               # the depth of the write acquisitions of the writer
+
+    def acquire_read(self):
+        """Blocks until no thread writes and no writer waits, then holds the lock for reading"""
+        me = get_ident()
+        depth = self.__reads.get(me, 0)
+        if depth == 0 and self.__writer != me:
+            with self.__mutex:
+                while self.__writer is not None or self.__waiting_writers:
+                    self.__condition.wait()
+                self.__readers += 1
+        self.__reads[me] = depth + 1
+
+    def release_read(self):
+        me = get_ident()
+        depth = self.__reads.get(me, 0)
+        if depth == 0:
+            raise RuntimeError("The lock is not held for reading!")
+        if depth > 1:
+            self.__reads[me] = depth - 1
+            return
+        del self.__reads[me]
+        if self.__writer != me:
+            with self.__mutex:
+                self.__readers -= 1
+                if self.__readers == 0:
+                    self.__condition.notify_all()
+
+    def acquire_write(self):
+        """Blocks until no other thread holds the lock, then holds it alone"""
+        me = get_ident()
+        if self.__writer == me:
+            self.__writes += 1
+            return
+        if me in self.__reads:
+            raise RuntimeError("A lock held for reading can not be taken for writing!")
+        with self.__mutex:
+            self.__waiting_writers += 1
+            try:
+                while self.__writer is not None or self.__readers:
+                    self.__condition.wait()
+            finally:
+                self.__waiting_writers -= 1
+            self.__writer = me
+            self.__writes = 1
+
+    def release_write(self):
+        if self.__writer != get_ident():
+            raise RuntimeError("The lock is not held for writing!")
+        self.__writes -= 1
+        if self.__writes == 0:
+            with self.__mutex:
+                self.__writer = None
+                if get_ident() in self.__reads:     # downgraded: the thread now counts as one of the readers
+                    self.__readers += 1
+                self.__condition.notify_all()
+
+    @contextmanager
+    def reading(self):
+        """Context manager holding the lock for reading"""
+        self.acquire_read()
+        try:
+            yield self
+        finally:
+            self.release_read()
+
+    @contextmanager
+    def writing(self):
+        """Context manager holding the lock for writing"""
+        self.acquire_write()
+        try:
+            yield self
+        finally:
+            self.release_write()
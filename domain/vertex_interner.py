@@ -0,0 +1,72 @@
+"""
+The interning Class which gives the vertices of a graph dense integer indices, so that the algorithms can keep their
+per-vertex data in flat lists instead of dictionaries keyed by the vertices
+"""
+
+
+class VertexInterner:
+    """
+    Two-way mapping between the external IDs of the vertices (ints, strings or any other hashable values) and the
+    dense indices 0..n-1, given in the order the IDs are interned. It is also a read-only sequence of the IDs, in
+    the order of their indices, with an O(1) membership test
+    """
+    def __init__(self, ids=()):
+        """
+        :param ids: the IDs interned from the start (the repeated ones get the index of their first occurrence)
+        """
+        self.__ids = []         # the list holding on position i the ID of the vertex with the index i
+        self.__index = {}       # the dictionary holding on key ID the index of that vertex
+        for v in ids:
+            self.intern(v)
+
+    def intern(self, v):
+        """
+        :param v: the ID of a vertex
+        :return: the index of the vertex, which is given the next free index if it was not interned yet
+        """
+        index = self.__index.get(v)
+        if index is None:
+            index = self.__index[v] = len(self.__ids)
+            self.__ids.append(v)
+        return index
+
+    def index_of(self, v):
+        """
+        :param v: the ID of an interned vertex
+        :return: its dense index (a KeyError is raised for an ID that was not interned, like for a dictionary)
+        """
+        return self.__index[v]
+
+    def indices_of(self, ids):
+        """
+        :param ids: an iterable of the IDs of interned vertices
+        :return: the list of their dense indices, in the same order
+        """
+        return list(map(self.__index.__getitem__, ids))
+
+    def vertex_at(self, i):
+        """
+        :param i: a dense index (0..n-1)
+        :return: the ID of the vertex with that index
+        """
+        return self.__ids[i]
+
+    def vertices_at(self, indices):
+        """
+        :param indices: an iterable of dense indices
+        :return: the list of the IDs of those vertices, in the same order
+        """
+        ids = self.__ids
+        return [ids[i] for i in indices]
+
+    def __len__(self):
+        return len(self.__ids)
+
+    def __getitem__(self, i):
+        return self.__ids[i]
+
+    def __iter__(self):
+        return iter(self.__ids)
+
+    def __contains__(self, v):
+        return v in self.__index
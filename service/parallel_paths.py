@@ -0,0 +1,65 @@
+"""
+Multi-source shortest paths computed by a pool of worker processes which all read the same graph snapshot from
+shared memory, so the graph is written once instead of being pickled for every task
+"""
+from concurrent.futures import ProcessPoolExecutor
+from multiprocessing.shared_memory import SharedMemory
+
+from domain.csr_graph import CSRGraph
+from domain.graph_snapshot import read_snapshot, snapshot_size, write_snapshot
+
+_worker_memory = None   # the shared memory block attached by the current worker process
+_worker_graph = None    # the CSRGraph read (without copying) from that block
+
+
+class _BufferWriter:
+    """Minimal binary file-like object writing sequentially into a buffer"""
+    def __init__(self, buffer):
+        self.__buffer = buffer
+        self.__position = 0
+
+    def write(self, data):
+        data = memoryview(data).cast('B')
+        self.__buffer[self.__position:self.__position + len(data)] = data
+        self.__position += len(data)
+        return len(data)
+
+
+def _init_worker(memory_name):
+    global _worker_memory, _worker_graph
+    _worker_memory = SharedMemory(name=memory_name)
+    _worker_graph = read_snapshot(_worker_memory.buf)
+
+
+def _distances_task(source):
+    return _worker_graph.distances_from_index(source)
+
+
+def multi_source_distances(graph, sources, workers):
+    """
+    Computes the distances from every source to every vertex of a graph
+    :param graph: the graph (a CSRGraph or anything CSRGraph.from_graph accepts)
+    :param sources: the source vertices
+    :param workers: the number of worker processes (1 computes everything in the current process)
+    :return: the pair (vertices, matrix) where matrix[i][j] is the distance from sources[i] to vertices[j], as a
+             list of arrays of doubles (inf if vertices[j] is not reachable)
+    """
+    if not isinstance(graph, CSRGraph):
+        graph = CSRGraph.from_graph(graph)
+    vertices = tuple(graph.get_vertices())
+    indices = [graph.index_of(source) for source in sources]
+    if workers <= 1 or len(indices) <= 1:
+        return vertices, [graph.distances_from_index(i) for i in indices]
+    # the workers only need the dense indices, so the IDs of the vertices (which may be strings, that a snapshot
+    # can not hold) stay in this process
+    indexed = CSRGraph(None, *graph.get_buffers()[1:])
+    memory = SharedMemory(create=True, size=snapshot_size(indexed))
+    try:
+        write_snapshot(indexed, _BufferWriter(memory.buf))
+        chunk_size = max(1, len(indices) // (4 * workers))
+        with ProcessPoolExecutor(max_workers=workers, initializer=_init_worker, initargs=(memory.name,)) as pool:
+            matrix = list(pool.map(_distances_task, indices, chunksize=chunk_size))
+    finally:
+        memory.close()
+        memory.unlink()
+    return vertices, matrix
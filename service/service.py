@@ -1,37 +1,230 @@
-from copy import deepcopy
+import functools
+import inspect
+import threading
+import time
+import weakref
+from array import array
+from collections import deque
+from heapq import heappop, heappush
+from operator import itemgetter
+from types import MappingProxyType
 
 from domain.PriorityQueue import PriorityQueue
+from domain.algorithm_stats import NO_STATS
+from domain.csr_graph import CSRGraph
+from domain.disjoint_set import DisjointSet
+from domain.dynamic_mst import DynamicMST
+from domain.external_csr import RUN_SIZE, load_external
 from domain.graph import Graph
+from domain.graph_snapshot import open_snapshot, save_snapshot
+from domain.landmarks import INFINITY, Landmarks
+from domain.path_cache import ShortestPathCache
+from domain.rw_lock import ReadWriteLock
+from errors.exceptions import GraphError
+from service.parallel_paths import multi_source_distances
+from service.tsp import christofides_tour, double_tree_tour, improve_tour, tour_cost
+
+DENSE_AFTER = 3     # the number of long algorithms run on one version of an editable graph before it is converted
+
+
+def _holding_graph_lock(write):
+    """
+    Decorator of the Service methods that run holding the lock of the graph given by their 'gi' parameter
+    :param write: True for the methods that change the graph, False for the ones that only read it
+    """
+    def decorate(method):
+        position = list(inspect.signature(method).parameters).index("gi") - 1    # the position among the arguments
+
+        @functools.wraps(method)
+        def locked(self, *args, **kwargs):
+            lock = self.get_lock(kwargs["gi"] if "gi" in kwargs else args[position])
+            if write:
+                lock.acquire_write()
+                try:
+                    return method(self, *args, **kwargs)
+                finally:
+                    lock.release_write()
+            lock.acquire_read()
+            try:
+                return method(self, *args, **kwargs)
+            finally:
+                lock.release_read()
+        return locked
+    return decorate
+
+
+_reads_graph = _holding_graph_lock(False)
+_writes_graph = _holding_graph_lock(True)
 
 
 class Service:
-    def __init__(self):
+    """
+    The service is safe to use from many threads: every graph has a reader/writer lock (see get_lock), so the quick
+    queries of a graph run at the same time while its changes run alone. The long algorithms hold the read lock only
+    to take a snapshot of the graph in O(1) (see Graph.snapshot) and run on it, so they never block the writers and
+    see the graph as it was when they started
+    """
+    def __init__(self, cache_limit=1000000):
         """
         The constructor for the service class which initialises an empty list representing the list of all graphs in the
         memory at run-time
+        :param cache_limit: the maximum total number of vertices in the cached shortest-path trees (0 disables it)
         """
         self.__graph_list = []
+        self.__locks = []       # the list holding on position gi the ReadWriteLock of the graph gi
+        self.__list_lock = threading.Lock()     # taken to add or remove graphs, never while waiting for a graph lock
+        self.__landmarks = {}   # the dictionary holding on key gi the pair (graph version, ALT landmarks)
+        self.__path_cache = ShortestPathCache(cache_limit)
+        self.__dynamic_msts = {}    # the dictionary holding on key gi the DynamicMST attached to that graph
+        self.__dense_graphs = {}    # the dictionary holding on key gi the triple (graph version, number of long
+                                    # algorithms run on it, its CSR form or None while that number is too small)
+        self.__views = {}       # the dictionary holding on key gi the pair (graph version, weak reference to a snapshot)
 
     def get_nr_graphs(self):
         """ Method that returns the number of graph currently in memory"""
         return len(self.__graph_list)
 
+    def get_lock(self, gi):
+        """ Method that returns the reader/writer lock of a graph, which a caller may hold to run several calls of
+        the service as one step (the lock is re-entrant, so the calls take it again without blocking)
+        :param gi: the index of the graph
+        :return: the ReadWriteLock of the graph
+        """
+        return self.__locks[gi]
+
+    def __append(self, graph):
+        with self.__list_lock:
+            self.__locks.append(ReadWriteLock())
+            self.__graph_list.append(graph)
+            return len(self.__graph_list) - 1
+
+    def __view(self, gi):
+        # the graph as it is now, for a long read: a snapshot taken in O(1) under the read lock, which the writers
+        # do not change afterwards (their first change clones the dictionary of rows the snapshot shares, in O(V),
+        # then only the rows they touch). The snapshot of a version is reused while any reader still holds it, so
+        # that a burst of long reads between two changes makes the next change clone the dictionaries only once. The
+        # views are never changed: a caller that keeps one as a new graph takes its own snapshot of it
+        with self.__locks[gi].reading():
+            graph = self.__graph_list[gi]
+            version = graph.get_version()
+            cached = self.__views.get(gi)
+            view = cached[1]() if cached is not None and cached[0] == version else None
+            if view is None:
+                view = graph.snapshot()
+                self.__views[gi] = (version, weakref.ref(view))
+            return view
+
+    def __searchable(self, gi):
+        # the graph a long algorithm runs on, with its version: a frozen graph is used as it is, an editable one as a
+        # snapshot, or in its CSR form (whose dense vertex indices let the algorithms keep their per-vertex data in
+        # flat lists) once DENSE_AFTER long algorithms ran on the same version, so that a graph changed between the
+        # queries never pays the O(V+E) conversion. At most one CSR form is kept per graph, dropped by the first
+        # long algorithm after a change. The costs keep their types in the CSR form, so that both forms give the same
+        # results
+        with self.__locks[gi].reading():
+            graph = self.__graph_list[gi]
+            version = graph.get_version()
+            if isinstance(graph, CSRGraph):
+                return version, graph
+            entry = self.__dense_graphs.get(gi)
+            if entry is not None and entry[0] == version:
+                uses, dense = entry[1], entry[2]
+                if dense is not None:
+                    return version, dense
+            else:
+                uses = 0
+            view = self.__view(gi)
+            if uses + 1 < DENSE_AFTER:
+                self.__dense_graphs[gi] = (version, uses + 1, None)
+                return version, view
+        dense = CSRGraph.from_graph(view, keep_types=True)
+        self.__dense_graphs[gi] = (version, DENSE_AFTER, dense)
+        return version, dense
+
+    def __check_vertices(self, graph, *vertices):
+        # the vertices a long algorithm starts or stops in must be in the graph, checked before choosing its form
+        # (the searches on a graph stop before reaching some of them, so they would not raise the KeyError otherwise)
+        known = graph.get_vertices()
+        for v in vertices:
+            if v not in known:
+                raise KeyError(v)
+
     def add_graph(self, graph):
         """ Method that adds a new graph in the memory - the added graph is a copy of an existing one"""
-        self.__graph_list.append(graph)
+        self.__append(graph)
+
+    def load_graph(self, path, string_ids=False):
+        """ Method that reads a graph from a text file and adds it in the memory
+        :param path: the path of a file in the format 'n m' followed by 'v1 v2 cost' lines
+        :param string_ids: if True, the vertices which are not numbers are read as strings instead of being an error
+        :return: the index of the loaded graph
+        """
+        return self.__append(Graph.from_file(path, string_ids))
 
+    def save_graph(self, gi, path):
+        """ Method that writes a graph in a text file, in the same format load_graph reads
+        :param gi: the index of the graph that we perform operations on
+        :param path: the path of the file
+        """
+        self.__view(gi).to_file(path)
+
+    def save_snapshot(self, gi, path):
+        """ Method that writes a graph in a binary snapshot file, which can be memory-mapped by open_snapshot
+        :param gi: the index of the graph that we perform operations on
+        :param path: the path of the file
+        """
+        save_snapshot(self.__view(gi), path)
+
+    def open_snapshot(self, path):
+        """ Method that memory-maps a binary snapshot file and adds the (frozen) graph in the memory
+        :param path: the path of the file
+        :return: the index of the opened graph
+        """
+        return self.__append(open_snapshot(path))
+
+    def load_graph_external(self, path, snapshot_path, run_size=RUN_SIZE):
+        """ Method that loads a graph too big for the memory: the text file is converted with external sorting into a
+        binary snapshot file, which is memory-mapped and added as a frozen graph, so BFS and Dijkstra read its
+        neighbour rows page by page from the disk
+        :param path: the path of a file in the format 'n m' followed by 'v1 v2 cost' lines
+        :param snapshot_path: the path of the snapshot file that is created
+        :param run_size: the number of edges sorted in memory at once
+        :return: the index of the loaded graph
+        """
+        return self.__append(load_external(path, snapshot_path, run_size))
+
+    @_reads_graph
+    def get_version(self, gi):
+        """ Method that returns the version of the graph, which changes every time the graph is changed
+        :param gi: the index of the graph that we perform operations on
+        """
+        return self.__graph_list[gi].get_version()
+
+    @_reads_graph
     def get_nr_vertices(self, gi):
         """ Method that returns the total number of vertices in the graph
         :param gi: the index of the graph that we perform operations on
         """
         return self.__graph_list[gi].get_nr_vertices()
 
+    @_reads_graph
     def get_vertices(self, gi):
         """ Method that returns the vertices in the graph
         :param gi: the index of the graph that we perform operations on
+        :return: a list of the vertices, which later changes of the graph do not affect
         """
-        return self.__graph_list[gi].get_vertices()
+        return list(self.__graph_list[gi].get_vertices())
 
+    @_reads_graph
+    def check_if_vertex(self, v, gi):
+        """ Method that checks if a vertex is in the graph, in O(1)
+        :param v: the vertex
+        :param gi: the index of the graph that we perform operations on
+        :return: true if v is a vertex of the graph or false otherwise
+        """
+        return v in self.__graph_list[gi].get_vertices()
+
+    @_reads_graph
     def check_if_edge(self, v1, v2, gi):
         """ Method that checks if between 2 vertices is an edge or not
         :param v1: starting vertex
@@ -41,6 +234,7 @@ class Service:
         """
         return self.__graph_list[gi].is_edge(v1, v2)
 
+    @_reads_graph
     def get_cost_of_edge(self, v1, v2, gi):
         """ Method that gets the cost of an edge
         :param v1: starting vertex
@@ -50,6 +244,7 @@ class Service:
         """
         return self.__graph_list[gi].get_cost(v1, v2)
 
+    @_writes_graph
     def set_cost_of_edge(self, v1, v2, new_cost, gi):
         """ Method that sets the cost of an edge
         :param v1: starting vertex
@@ -58,23 +253,28 @@ class Service:
         :param gi: the index of the graph that we perform operations on
         """
         self.__graph_list[gi].set_cost(v1, v2, new_cost)
+        if gi in self.__dynamic_msts:
+            self.__dynamic_msts[gi].edge_changed(v1, v2)
 
+    @_reads_graph
     def get_in_degree(self, v1, gi):
         """ Method that gets the degree of IN-bound edges of a vertex
         :param v1: the vertex from which we need the degree IN
         :param gi: the index of the graph that we perform operations on
         :return: the degree of IN-bound edges of vertex v1
         """
-        return len(self.__graph_list[gi].get_n_in(v1))
+        return self.__graph_list[gi].get_in_degree(v1)
 
+    @_reads_graph
     def get_out_degree(self, v1, gi):
         """ Method that gets the degree of OUT-bound edges of a vertex
         :param v1: the vertex from which we need the degree OUT
         :param gi: the index of the graph that we perform operations on
         :return: the degree of OUT-bound edges of vertex v1
         """
-        return len(self.__graph_list[gi].get_n_out(v1))
+        return self.__graph_list[gi].get_out_degree(v1)
 
+    @_reads_graph
     def get_n_out(self, v1, gi):  #
         """ Method that gets the OUT-bound edges of a vertex
         :param v1: the vertex from which we need the OUT edges
@@ -83,36 +283,33 @@ class Service:
         """
         return self.__graph_list[gi].get_n_out(v1)
 
+    @_reads_graph
     def get_outbound_edges(self, v1, gi):
         """ Method that gets the OUT-bound edges of a vertex
         :param v1: the vertex from which we need the OUT edges
         :param gi: the index of the graph that we perform operations on
         :return: the list of OUT-bound edges of vertex v1 along with the cost
         """
-        out_neighs = self.__graph_list[gi].get_n_out(v1)
-        edges = self.__graph_list[gi].get_edges()
+        graph = self.__graph_list[gi]
         out_edges = {}
-        for v in out_neighs:
-            pair = (v1, v)
-            if pair in edges:
-                out_edges[pair] = edges[pair]
+        for v in graph.get_n_out(v1):
+            out_edges[(v1, v)] = graph.get_cost(v1, v)
         return out_edges
 
+    @_reads_graph
     def get_inbound_edges(self, v1, gi):
         """ Method that gets the IN-bound edges of a vertex
         :param v1: the vertex from which we need the IN edges
         :param gi: the index of the graph that we perform operations on
         :return: the list of IN-bound edges of vertex v1 along with the cost
         """
-        in_neighs = self.__graph_list[gi].get_n_in(v1)
-        edges = self.__graph_list[gi].get_edges()
+        graph = self.__graph_list[gi]
         in_edges = {}
-        for v in in_neighs:
-            pair = (v, v1)
-            if pair in edges:
-                in_edges[pair] = edges[pair]
+        for v in graph.get_n_in(v1):
+            in_edges[(v, v1)] = graph.get_cost(v, v1)
         return in_edges
 
+    @_writes_graph
     def add_new_edge(self, v1, v2, cost, gi):
         """ Method that adds a new edge in the graph
         :param v1: the starting vertex
@@ -120,150 +317,242 @@ class Service:
         :param cost: the cost of the vertex [v1, v2]
         :param gi: the index of the graph that we perform operations on
         """
-        return self.__graph_list[gi].add_edge(v1, v2, cost)
+        status = self.__graph_list[gi].add_edge(v1, v2, cost)
+        if gi in self.__dynamic_msts:
+            self.__dynamic_msts[gi].edge_changed(v1, v2)
+        return status
 
+    @_writes_graph
     def remove_an_edge(self, v1, v2, gi):
         """ Method that removes an edge from the graph
         :param v1: the starting vertex
         :param v2: the ending vertex
         :param gi: the index of the graph that we perform operations on
         """
-        return self.__graph_list[gi].remove_edge(v1, v2)
+        status = self.__graph_list[gi].remove_edge(v1, v2)
+        if gi in self.__dynamic_msts:
+            self.__dynamic_msts[gi].edge_changed(v1, v2)
+        return status
 
+    @_writes_graph
     def add_new_vertex(self, v1, gi):
         """ Method that adds a new vertex in the graph
         :param v1: the to be added vertex
         :param gi: the index of the graph that we perform operations on
         """
         self.__graph_list[gi].add_vertex(v1)
+        if gi in self.__dynamic_msts:
+            self.__dynamic_msts[gi].vertex_added(v1)
 
+    @_writes_graph
     def remove_vertex(self, v1, gi):
         """ Method that removes a vertex from the graph
         :param v1: the to be removed vertex
         :param gi: the index of the graph that we perform operations on
         """
         self.__graph_list[gi].remove_vertex(v1)
+        if gi in self.__dynamic_msts:
+            self.__dynamic_msts[gi].vertex_removed(v1)
+
+    @_writes_graph
+    def apply_batch(self, gi, ops):
+        """ Method that applies a batch of edge operations to the graph represented by its index 'gi' as one
+        transaction (see Graph.apply_batch): if one operation is invalid, none is applied and a GraphError is raised.
+        The attached dynamic MST, if any, is rebuilt the next time it is read
+        :param gi: the index of the graph that we perform operations on
+        :param ops: an iterable of tuples ("add", v1, v2, cost), ("remove", v1, v2) or ("set_cost", v1, v2, cost)
+        :return: a dictionary with the number of applied operations, the seconds it took and the operations per second
+        """
+        start = time.perf_counter()
+        count = self.__graph_list[gi].apply_batch(ops)
+        elapsed = time.perf_counter() - start
+        return {"operations": count, "seconds": elapsed, "ops_per_second": count / elapsed if elapsed > 0 else 0.0}
 
     def create_copy(self, gi):
-        """ Method that copies the current graph represented by its index 'gi'
+        """ Method that copies the current graph represented by its index 'gi', in O(1) for an editable graph:
+        the copy shares its storage with the original until one of them is changed (see Graph.snapshot)
         :param gi: the index of the graph that we perform operations on
         :return: graph_list' = graph_list + {copied graph}
         """
-        copy_nr_verts = self.__graph_list[gi].get_nr_vertices()
-        copy_nr_edges = self.__graph_list[gi].get_nr_edges()
-
-        copy_graph = Graph(copy_nr_verts, copy_nr_edges)
+        graph = self.__view(gi)
+        self.__append(graph.to_graph() if isinstance(graph, CSRGraph) else graph.snapshot())
 
-        copy_outs = self.__graph_list[gi].get_copy_of_outs()
-        copy_ins = self.__graph_list[gi].get_copy_of_ins()
-        copy_costs = self.__graph_list[gi].get_edges()
-
-        copy_graph.set_n_out(copy_outs)
-        copy_graph.set_n_in(copy_ins)
-        copy_graph.set_costs(copy_costs)
+    def freeze_graph(self, gi):
+        """ Method that creates a compact, immutable CSR copy of the graph represented by its index 'gi'
+        :param gi: the index of the graph that we perform operations on
+        :return: graph_list' = graph_list + {frozen graph}
+        """
+        self.__append(CSRGraph.from_graph(self.__view(gi)))
 
-        self.__graph_list.append(copy_graph)
+    def thaw_graph(self, gi):
+        """ Method that creates an editable copy of the (frozen) graph represented by its index 'gi'
+        :param gi: the index of the graph that we perform operations on
+        :return: graph_list' = graph_list + {editable graph}
+        """
+        self.create_copy(gi)
 
     def overwrite_main_graph(self, gi):
         """ Method that overwrites the original graph with the current graph represented by its index 'gi'
         :param gi: the index of the graph that we perform operations on
         :return: main graph' (pos 0) = current graph (pos gi)
         """
-        copy_nr_verts = self.__graph_list[gi].get_nr_vertices()
-        copy_nr_edges = self.__graph_list[gi].get_nr_edges()
-        copy_outs = self.__graph_list[gi].get_copy_of_outs()
-        copy_ins = self.__graph_list[gi].get_copy_of_ins()
-        copy_costs = self.__graph_list[gi].get_edges()
+        graph = self.__view(gi)
+        if isinstance(graph, CSRGraph):
+            graph = graph.to_graph()
+        with self.__locks[0].writing():
+            self.__graph_list[0].adopt(graph)
+
+    def label_components(self, gi):
+        """ Method that labels every vertex of the graph represented by its index 'gi' with the number of its
+        connected component, using breadth first traversals along the OUT-bound edges in O(V + E)
+        :param gi: the index of the graph that we perform the traversal on
+        :return: 3 compact sequences:
+                - vertices = the tuple of vertices, in the order of get_vertices
+                - labels = the array holding on position i the component number of vertices[i]
+                - sizes = the array holding on position c the number of vertices in component c
+        """
+        _, graph = self.__searchable(gi)
+        vertices = tuple(graph.get_vertices())
+        if isinstance(graph, CSRGraph):
+            offsets, targets = graph.get_buffers()[1:3]
+            neighbours = lambda x: targets[offsets[x]:offsets[x + 1]]
+        else:
+            index = {v: i for i, v in enumerate(vertices)}
+            neighbours = lambda x: map(index.__getitem__, graph.get_n_out(vertices[x]))
+        labels = array('l', [-1]) * len(vertices)
+        sizes = array('l')
+        for i in range(len(vertices)):
+            if labels[i] == -1:
+                component = len(sizes)
+                labels[i] = component
+                size = 1
+                q = deque([i])
+                while q:
+                    x = q.popleft()
+                    for j in neighbours(x):
+                        if labels[j] == -1:
+                            labels[j] = component
+                            size += 1
+                            q.append(j)
+                sizes.append(size)
+        return vertices, labels, sizes
+
+    def iter_bfs(self, gi, start):
+        """ Generator that yields the vertices reached from start in breadth first order along the OUT-bound edges,
+        one at a time, so that the consumer can stop early
+        :param gi: the index of the graph that we perform the traversal on
+        :param start: the starting vertex
+        :return: an iterator of vertices, start being the first one
+        """
+        graph = self.__view(gi)
+        visited = {start}
+        q = deque([start])
+        while q:
+            x = q.popleft()
+            yield x
+            for y in graph.get_n_out(x):
+                if y not in visited:
+                    visited.add(y)
+                    q.append(y)
 
-        self.__graph_list[0].set_nr_vertices(copy_nr_verts)
-        self.__graph_list[0].set_nr_edges(copy_nr_edges)
-        self.__graph_list[0].set_n_out(copy_outs)
-        self.__graph_list[0].set_n_in(copy_ins)
-        self.__graph_list[0].set_costs(copy_costs)
+    def iter_components(self, gi):
+        """ Generator that yields the connected components of the graph represented by its index 'gi' one at a time,
+        found like in label_components (and in the same order), so only one component is held at once
+        :param gi: the index of the graph that we perform the traversal on
+        :return: an iterator of lists, each one holding the vertices of a component in breadth first order
+        """
+        return self.__components(self.__view(gi))
 
-    def create_graph_from_list(self, edges, ngi):
-        """Method that creates a new editable MST from the list of edges"""
+    def __components(self, graph):
+        visited = set()
+        for v in graph.get_vertices():
+            if v not in visited:
+                yield graph.breadth_first_order(v, visited)
+
+    def materialise_component(self, gi, component):
+        """ Method that creates a new graph out of a connected component of the graph represented by its index 'gi'
+        :param gi: the index of the graph the component belongs to
+        :param component: the vertices of the component
+        :return: the index of the new graph (graph_list' = graph_list + {component graph})
+        """
+        return self.__materialise(self.__view(gi), component)
+
+    def __materialise(self, graph, component):
         new_graph = Graph(0, 0)
-        self.__graph_list.append(new_graph)
-        for edge in edges:
-            vertex1 = edge[0]
-            vertex2 = edge[1]
-            cost = self.get_cost_of_edge(vertex1, vertex2, ngi-1)
-            if vertex1 not in self.get_vertices(ngi):
-                self.__graph_list[ngi].add_vertex(vertex1)
-            if vertex2 not in self.get_vertices(ngi):
-                self.__graph_list[ngi].add_vertex(vertex2)
-            self.__graph_list[ngi].add_edge(vertex1, vertex2, cost)       # since we apply the Double-tree approximation
-            self.__graph_list[ngi].add_edge(vertex2, vertex1, cost)       # algorithm we have to double our edges and it
-            self.__graph_list[ngi].add_double_edge(vertex1, vertex2, cost)  # results in having an Eulerian multi-graph
-            self.__graph_list[ngi].add_double_edge(vertex2, vertex1, cost)  # since we have 0 vertices with odd degrees
-                                                                            # and it's connected
-            # since the edges are duplicated from the minimum spanning tree, the Eulerian tour has cost at most 2, OPT
-            # where OPT is the value of the optimal solution
-
-    def find_eluer_tour(self, start_vertex, gi):
-        """Method that creates an Eulerian path starting from a given vertex"""
-        st = [start_vertex]
-        answer = set()
-        vertices_grades = {}
-        for vert in self.__graph_list[gi].get_vertices():
-            vertices_grades[vert] = int(len(self.__graph_list[gi].get_n_out(vert)) / 2)     # we have to keep track of
-                                                                                            # how many vertices the
-        visited = []                                                                        # original graph had
-        # we are iterating through the vertices and start removing edge by edge until we are left with
-        while st:
-            some_vertex = st.pop()
-            if self.get_out_degree(some_vertex, gi) == vertices_grades[some_vertex]:
-                answer.add(some_vertex)
-            else:
-                # here we start shortcutting
-                # By the triangle inequality, the cost of the shortcut tour is at most the cost of the Eulerian tour,
-                # which is not greater than 2,OPT
-                for v in self.__graph_list[gi].get_n_out(some_vertex):
-                    if v not in visited:
-                        removed_vertex = deepcopy(v)
-                        self.__graph_list[gi].remove_edge(some_vertex, removed_vertex)
-                        self.__graph_list[gi].remove_edge(removed_vertex, some_vertex)
-                        st.append(removed_vertex)
-                        visited.append(removed_vertex)
-        return list(answer)
-
-    def bfs_components(self, gi):
+        for v in component:
+            new_graph.add_vertex(v)
+        members = set(component)
+        added = set()
+        for x in component:
+            for y in graph.get_n_out(x):
+                if y not in members:
+                    continue
+                cost = graph.get_cost(x, y)
+                for pair in ((x, y), (y, x)):
+                    if pair not in added:
+                        added.add(pair)
+                        new_graph.add_edge(pair[0], pair[1], cost)
+        return self.__append(new_graph)
+
+    def bfs_components(self, gi, materialise=True, stats=None):
         """ Method that traverses the current graph represented by its index 'gi' in a breadth first manner
         :param gi: the index of the graph that we perform the traversal on
-        The Method will create new instances of the class Graph which will be appended to the graph list
-        with every new instance being a connected component
+        :param materialise: if True, a new instance of the class Graph is appended to the graph list for every
+                            connected component (otherwise only the vertices of the components are computed)
+        :param stats: an AlgorithmStats filled with the counters and phase timings of the call (None for no statistics)
+        :return: the list of components as pairs (vertices of the component, index of its graph or None)
         """
-        index = gi + 1
+        stats = NO_STATS if stats is None else stats
+        stats.start("bfs_components")
+        try:
+            graph = self.__view(gi)
+            components = []
+            visited = 0
+            for component in self.__components(graph):
+                stats.phase("traversal")
+                index = self.__materialise(graph, component) if materialise else None
+                stats.phase("materialise")
+                components.append((component, index))
+                visited += len(component)
+            stats.phase("traversal")
+            stats.count("components", len(components))
+            stats.count("visited_vertices", visited)
+            stats.count("accessor_copies", visited)         # one copy of the out-neighbours of every visited vertex
+            stats.count("materialised_graphs", len(components) if materialise else 0)
+        finally:            # the profiler is disabled even if the algorithm fails
+            stats.stop()
+        return components
 
-        new_graph = Graph(0, 0)
-        self.__graph_list.append(new_graph)
-
-        vertices = self.__graph_list[gi].get_vertices()
-        visited = []
-        for vertex in vertices:
-            if vertex not in visited:
-                # creating the connected component
-                edges, acc = self.__graph_list[gi].breadth_first_traversal(vertex, visited)
-                print("Component number " + str(index) + ":\n{ ", end=" ")
-                # adding the vertices
-                for v in acc:
-                    self.__graph_list[index].add_vertex(v)
-                    print(str(v) + " ", end=" ")
-                # adding the edges
-                print("}; \nWith the edges { ", end=" ")
-                for k in edges:
-                    self.__graph_list[index].add_edge(k[0], k[1], edges[k])
-                    print(str(k) + " ", end=" ")
-                print("}\n")
-
-                # making room for a new component if necessary
-                if len(edges) != 0:
-                    index += 1
-                    new_graph = Graph(0, 0)
-                    self.__graph_list.append(new_graph)
-
-    def dijkstra_algorithm(self, gi, end_v, start_v):
+    def components_union_find(self, gi):
+        """ Method that finds the connected components of the graph represented by its index 'gi' by merging the
+        endpoints of every edge in a disjoint-set structure, in O(E * alpha(V)); the edges are taken as undirected
+        :param gi: the index of the graph that we perform the search on
+        :return: the same 3 compact sequences as label_components:
+                - vertices = the tuple of vertices, in the order of get_vertices
+                - labels = the array holding on position i the component number of vertices[i]
+                - sizes = the array holding on position c the number of vertices in component c
+        """
+        graph = self.__view(gi)
+        vertices = tuple(graph.get_vertices())
+        index = {v: i for i, v in enumerate(vertices)}
+        sets = DisjointSet(len(vertices))
+        for v1, v2 in graph.get_edges():
+            sets.union(index[v1], index[v2])
+        labels = array('l', [-1]) * len(vertices)
+        sizes = array('l')
+        component_of_root = {}
+        for i in range(len(vertices)):
+            root = sets.find(i)
+            component = component_of_root.get(root)
+            if component is None:
+                component = len(sizes)
+                component_of_root[root] = component
+                sizes.append(0)
+            labels[i] = component
+            sizes[component] += 1
+        return vertices, labels, sizes
+
+    def dijkstra_algorithm(self, gi, end_v, start_v, stats=None):
         """
         Method that computes the shortest path between the starting vertex and the
         ending vertex in an oriented weighted graph using the 'Greedy Algorithm' of Edsger Dijkstra
@@ -272,79 +561,757 @@ class Service:
         :param gi: the index of the graph that we perform the search on
         :param end_v: the ending vertex (the starting one in our case because of the reverse)
         :param start_v: the starting vertex (the ending one in our case because of the reverse)
+        :param stats: an AlgorithmStats filled with the counters and phase timings of the call (None for no statistics)
         :return: 2 dictionaries containing:
                 - dist = {the dictionary with the minimal distance from the vertex end_v to that specific vertex}
                 - next_vertices = {the dictionary with the next-neighbour from the vertex end_v to that specific vertex}
         """
-        found = False
+        stats = NO_STATS if stats is None else stats
+        stats.start("dijkstra_algorithm")
+        try:
+            _, graph = self.__searchable(gi)
+            self.__check_vertices(graph, end_v, start_v)
+            if isinstance(graph, CSRGraph):
+                return self.__reverse_dijkstra_dense(graph, end_v, start_v, stats)
+            return self.__reverse_dijkstra(graph, end_v, start_v, stats)
+        finally:            # the profiler is disabled even if the algorithm fails
+            stats.stop()
+
+    def __reverse_dijkstra(self, graph, end_v, start_v, stats):
+        relaxations = pushes = copies = 0   # counted once per vertex or per improvement, never per edge
         next_vertices = {}  # the dictionary containing the vertices that follow a specific vertex
         q = PriorityQueue()
         q.add(end_v, 0)     # we define the priority of the 1st vertex as being 0, since it starts the parsing
         dist = {end_v: 0}   # a dictionary containing the vertices and the shortest length path that leads to them
-        visited = set()     # a set holding the already visited vertices
-        visited.add(end_v)
-        while not q.is_empty() and not found:
+        settled = set()     # a set holding the vertices whose distance is final (already popped from the queue)
+        stats.phase("setup")
+        while not q.is_empty():
             x = q.pop()
-            for y in self.__graph_list[gi].get_n_in(x):     # since it is reversed-dijkstra we parse the IN-neighbours
+            settled.add(x)
+            if x == start_v:        # stopping the algorithm once we arrive on the destination vertex because we are
+                break               # guaranteed to have found the best path to get here, from the end vertex
+            in_neighbours = graph.get_n_in(x)   # since it is reversed-dijkstra we parse the IN-neighbours
+            copies += 1
+            relaxations += len(in_neighbours)
+            for y in in_neighbours:
+                if y in settled:            # a settled vertex can not get a shorter distance, so it is never re-pushed
+                    continue
                 # check the shortest cost
-                if y not in visited or dist[x] + self.__graph_list[gi].get_cost(y, x) < dist[y]:
-                    dist[y] = dist[x] + self.__graph_list[gi].get_cost(y, x)
-                    visited.add(y)
-                    q.add(y, dist[y])
+                new_dist = dist[x] + graph.get_cost(y, x)
+                if y not in dist or new_dist < dist[y]:
+                    dist[y] = new_dist
+                    q.add(y, new_dist)
+                    pushes += 1
                     next_vertices[y] = x
-            if x == start_v:        # stopping the algorithm once we arrive on the destination vertex because we are
-                found = True        # guaranteed to have found the best path to get here, from the end vertex
+        stats.phase("search")
+        stats.count("settled_vertices", len(settled))
+        stats.count("edge_relaxations", relaxations)
+        stats.count("queue_pushes", pushes + 1)
+        stats.count("queue_pops", len(settled))
+        stats.count("accessor_copies", copies)
         return dist, next_vertices  # return the dictionaries with the distance between end_v and all the vertices and
                                     # the "linked" vertices
 
-    def prim_algorithm(self, gi, start_vertex):
+    def __reverse_dijkstra_dense(self, dense, end_v, start_v, stats):
+        _, _, _, _, offsets, sources, weights = dense.get_buffers()
+        n = dense.get_nr_vertices()
+        end, start = dense.index_of(end_v), dense.index_of(start_v)
+        relaxations = pushes = pops = 0     # counted once per vertex or per improvement, never per edge
+        dist = [None] * n       # the list holding on index i the shortest known distance from end_v to the vertex i
+        next_index = [-1] * n   # the list holding on index i the index of the vertex that follows the vertex i
+        settled = bytearray(n)  # the flags of the vertices whose distance is final (already popped from the heap)
+        reached = [end]         # the indices of the vertices that got a distance, in the order they got it
+        dist[end] = 0           # we define the priority of the 1st vertex as being 0, since it starts the parsing
+        heap = [(0, end)]
+        stats.phase("setup")
+        while heap:
+            d, x = heappop(heap)
+            pops += 1
+            if settled[x]:      # a stale entry, left behind by a later improvement of the vertex
+                continue
+            settled[x] = 1
+            if x == start:      # stopping the algorithm once we arrive on the destination vertex because we are
+                break           # guaranteed to have found the best path to get here, from the end vertex
+            relaxations += offsets[x + 1] - offsets[x]
+            for position in range(offsets[x], offsets[x + 1]):  # since it is reversed-dijkstra we parse the
+                y = sources[position]                           # IN-neighbours
+                if settled[y]:      # a settled vertex can not get a shorter distance, so it is never re-pushed
+                    continue
+                new_dist = d + weights[position]
+                old_dist = dist[y]
+                if old_dist is None:
+                    reached.append(y)
+                elif new_dist >= old_dist:
+                    continue
+                dist[y] = new_dist
+                next_index[y] = x
+                heappush(heap, (new_dist, y))
+                pushes += 1
+        stats.phase("search")
+        stats.count("settled_vertices", sum(settled))
+        stats.count("edge_relaxations", relaxations)
+        stats.count("queue_pushes", pushes + 1)
+        stats.count("queue_pops", pops)
+        stats.count("accessor_copies", 0)   # the rows are read in place from the CSR arrays
+        vertices = dense.vertices_at(reached)
+        return dict(zip(vertices, [dist[i] for i in reached])), \
+            dict(zip(vertices[1:], dense.vertices_at([next_index[i] for i in reached[1:]])))
+
+    def bidirectional_dijkstra(self, gi, start_v, end_v):
+        """
+        Method that computes the shortest path between the starting vertex and the ending vertex in an oriented
+        graph with non-negative costs by running Dijkstra's algorithm from both ends at once: forward from start_v
+        along the OUT-bound neighbours and backward from end_v along the IN-bound neighbours. The search stops as
+        soon as the sum of the smallest keys of the two queues is no better than the best path found so far
+        :param gi: the index of the graph that we perform the search on
+        :param start_v: the starting vertex
+        :param end_v: the ending vertex
+        :return:
+                - path: the list of vertices from start_v to end_v (empty if there is no such path)
+                - cost: the total cost of the path (None if there is no such path)
+        """
+        if start_v == end_v:
+            return [start_v], 0
+        _, graph = self.__searchable(gi)
+        self.__check_vertices(graph, start_v, end_v)
+        if isinstance(graph, CSRGraph):
+            return self.__bidirectional_dijkstra_dense(graph, start_v, end_v)
+        dist_f, dist_b = {start_v: 0}, {end_v: 0}           # the distances from start_v / to end_v
+        prev_f, next_b = {}, {}                             # the forward predecessors / the backward successors
+        settled_f, settled_b = set(), set()
+        q_f, q_b = PriorityQueue(), PriorityQueue()
+        q_f.add(start_v, 0)
+        q_b.add(end_v, 0)
+        best = None         # the cost of the best path found so far
+        meeting = None      # the vertex where the best path found so far joins the two searches
+        while not q_f.is_empty() and not q_b.is_empty():
+            if best is not None and q_f.peek_priority() + q_b.peek_priority() >= best:
+                break       # no path through the unsettled vertices can be shorter than the best one
+            forward = len(q_f) <= len(q_b)      # we expand the side with the smaller frontier
+            if forward:
+                q, dist, other_dist, settled, links, neighbours = q_f, dist_f, dist_b, settled_f, prev_f, graph.get_n_out
+            else:
+                q, dist, other_dist, settled, links, neighbours = q_b, dist_b, dist_f, settled_b, next_b, graph.get_n_in
+            x = q.pop()
+            settled.add(x)
+            for y in neighbours(x):
+                if y in settled:
+                    continue
+                new_dist = dist[x] + (graph.get_cost(x, y) if forward else graph.get_cost(y, x))
+                if y not in dist or new_dist < dist[y]:
+                    dist[y] = new_dist
+                    q.add(y, new_dist)
+                    links[y] = x
+                if y in other_dist and (best is None or dist[y] + other_dist[y] < best):
+                    best = dist[y] + other_dist[y]
+                    meeting = y
+        if meeting is None:
+            return [], None
+        path = [meeting]
+        while path[-1] != start_v:
+            path.append(prev_f[path[-1]])
+        path.reverse()
+        while path[-1] != end_v:
+            path.append(next_b[path[-1]])
+        return path, best
+
+    def __bidirectional_dijkstra_dense(self, dense, start_v, end_v):
+        _, out_offsets, out_targets, out_weights, in_offsets, in_sources, in_weights = dense.get_buffers()
+        n = dense.get_nr_vertices()
+        start, end = dense.index_of(start_v), dense.index_of(end_v)
+        dist_f, dist_b = [None] * n, [None] * n             # the distances from start_v / to end_v, by index
+        prev_f, next_b = [-1] * n, [-1] * n                 # the forward predecessors / the backward successors
+        settled_f, settled_b = bytearray(n), bytearray(n)
+        dist_f[start] = 0
+        dist_b[end] = 0
+        heap_f, heap_b = [(0, start)], [(0, end)]
+        best = None         # the cost of the best path found so far
+        meeting = -1        # the index of the vertex where the best path found so far joins the two searches
+        while heap_f and heap_b:
+            if best is not None and heap_f[0][0] + heap_b[0][0] >= best:
+                break       # no path through the unsettled vertices can be shorter than the best one
+            if len(heap_f) <= len(heap_b):      # we expand the side with the smaller frontier
+                heap, dist, other_dist, settled, links = heap_f, dist_f, dist_b, settled_f, prev_f
+                offsets, neighbours, weights = out_offsets, out_targets, out_weights
+            else:
+                heap, dist, other_dist, settled, links = heap_b, dist_b, dist_f, settled_b, next_b
+                offsets, neighbours, weights = in_offsets, in_sources, in_weights
+            d, x = heappop(heap)
+            if settled[x]:      # a stale entry, left behind by a later improvement of the vertex
+                continue
+            settled[x] = 1
+            for position in range(offsets[x], offsets[x + 1]):
+                y = neighbours[position]
+                if settled[y]:
+                    continue
+                new_dist = d + weights[position]
+                if dist[y] is None or new_dist < dist[y]:
+                    dist[y] = new_dist
+                    heappush(heap, (new_dist, y))
+                    links[y] = x
+                if other_dist[y] is not None and (best is None or dist[y] + other_dist[y] < best):
+                    best = dist[y] + other_dist[y]
+                    meeting = y
+        if meeting < 0:
+            return [], None
+        path = [meeting]
+        while path[-1] != start:
+            path.append(prev_f[path[-1]])
+        path.reverse()
+        while path[-1] != end:
+            path.append(next_b[path[-1]])
+        return dense.vertices_at(path), best
+
+    def single_source_distances(self, gi, source, reverse=False):
+        """ Method that computes the distances from one vertex to every vertex it reaches (Dijkstra's algorithm)
+        :param gi: the index of the graph that we perform the search on
+        :param source: the source vertex
+        :param reverse: if True, the distances are computed along the IN-bound edges, i.e. TO the source vertex
+        :return: the dictionary {vertex: distance} with every reached vertex
+        """
+        return self.__shortest_path_tree(self.__searchable(gi)[1], source, reverse)[0]
+
+    def __shortest_path_tree(self, graph, source, reverse=False):
+        if isinstance(graph, CSRGraph):
+            return self.__shortest_path_tree_dense(graph, source, reverse)
+        neighbours = graph.get_n_in if reverse else graph.get_n_out
+        dist = {source: 0}
+        prev = {}
+        settled = set()
+        q = PriorityQueue()
+        q.add(source, 0)
+        while not q.is_empty():
+            x = q.pop()
+            settled.add(x)
+            for y in neighbours(x):
+                if y in settled:
+                    continue
+                new_dist = dist[x] + (graph.get_cost(y, x) if reverse else graph.get_cost(x, y))
+                if y not in dist or new_dist < dist[y]:
+                    dist[y] = new_dist
+                    prev[y] = x
+                    q.add(y, new_dist)
+        return dist, prev
+
+    def __shortest_path_tree_dense(self, dense, source, reverse=False):
+        buffers = dense.get_buffers()
+        offsets, neighbours, weights = buffers[4:7] if reverse else buffers[1:4]
+        n = dense.get_nr_vertices()
+        s = dense.index_of(source)
+        dist = [None] * n
+        prev = [-1] * n
+        settled = bytearray(n)
+        reached = [s]
+        dist[s] = 0
+        heap = [(0, s)]
+        while heap:
+            d, x = heappop(heap)
+            if settled[x]:
+                continue
+            settled[x] = 1
+            for position in range(offsets[x], offsets[x + 1]):
+                y = neighbours[position]
+                if settled[y]:
+                    continue
+                new_dist = d + weights[position]
+                old_dist = dist[y]
+                if old_dist is None:
+                    reached.append(y)
+                elif new_dist >= old_dist:
+                    continue
+                dist[y] = new_dist
+                prev[y] = x
+                heappush(heap, (new_dist, y))
+        vertices = dense.vertices_at(reached)
+        return dict(zip(vertices, [dist[i] for i in reached])), \
+            dict(zip(vertices[1:], dense.vertices_at([prev[i] for i in reached[1:]])))
+
+    def shortest_path_tree(self, gi, source):
+        """ Method that returns the shortest-path tree of a source vertex, from the cache if the graph has not been
+        changed since it was computed
+        :param gi: the index of the graph that we perform the search on
+        :param source: the source vertex
+        :return: 2 read-only dictionaries:
+                - dist = {the minimal distance from source to every reached vertex}
+                - prev = {the vertex before every reached vertex on a shortest path from source}
+        """
+        version, graph = self.__searchable(gi)
+        tree = self.__path_cache.get(gi, source, version)
+        if tree is None:
+            dist, prev = self.__shortest_path_tree(graph, source)
+            tree = MappingProxyType(dist), MappingProxyType(prev)
+            self.__path_cache.put(gi, source, version, *tree)
+        return tree
+
+    def cached_shortest_path(self, gi, start_v, end_v):
+        """ Method that finds the shortest path between two vertices using the cached shortest-path tree of start_v,
+        so that repeated queries from the same vertex on an unchanged graph are answered without a new search
+        :param gi: the index of the graph that we perform the search on
+        :param start_v: the starting vertex
+        :param end_v: the ending vertex
+        :return: the pair (path, cost) like shortest_path, or ([], None) if end_v can not be reached
+        """
+        return self.__path_in_tree(gi, self.shortest_path_tree(gi, start_v), start_v, end_v)
+
+    def __path_in_tree(self, gi, tree, start_v, end_v):
+        dist, prev = tree
+        if end_v not in dist:
+            if not self.check_if_vertex(end_v, gi):
+                raise KeyError(end_v)
+            return [], None
+        path = [end_v]
+        while path[-1] != start_v:
+            path.append(prev[path[-1]])
+        path.reverse()
+        return path, dist[end_v]
+
+    def multi_source_shortest_paths(self, gi, sources, workers=1):
+        """ Method that computes the distances from many sources to every vertex, running one Dijkstra search per
+        source in a pool of worker processes; the graph is frozen and placed once in shared memory, where every
+        worker reads it without copying
+        :param gi: the index of the graph that we perform the search on
+        :param sources: the list of source vertices
+        :param workers: the number of worker processes (1 runs everything in the current process)
+        :return: the pair (vertices, matrix) where matrix[i][j] is the distance from sources[i] to vertices[j],
+                 as a list of arrays of doubles (inf if vertices[j] is not reachable)
+        """
+        return multi_source_distances(self.__view(gi), sources, workers)
+
+    def floyd_warshall(self, gi):
+        """ Method that computes the distances between every pair of vertices with the Floyd-Warshall algorithm,
+        which also handles negative costs, in O(V^3). Every step k updates a whole row at once: the row i becomes
+        the element-wise minimum between itself and dist[i][k] + the row k
+        :param gi: the index of the graph that we perform the search on
+        :return: the pair (vertices, matrix) where matrix[i][j] is the distance from vertices[i] to vertices[j], as
+                 a list of arrays of doubles (inf if vertices[j] is not reachable from vertices[i])
+        """
+        graph = self.__view(gi)
+        vertices = tuple(graph.get_vertices())
+        index = {v: i for i, v in enumerate(vertices)}
+        n = len(vertices)
+        matrix = [[INFINITY] * n for _ in range(n)]
+        for i in range(n):
+            matrix[i][i] = 0
+        for (v1, v2), cost in graph.get_edges().items():
+            row = matrix[index[v1]]
+            j = index[v2]
+            if cost < row[j]:
+                row[j] = cost
+        for k in range(n):
+            row_k = matrix[k]
+            for i in range(n):
+                row_i = matrix[i]
+                d = row_i[k]
+                if d == INFINITY:       # nothing can be improved through k
+                    continue
+                matrix[i] = [old if old <= d + through else d + through for old, through in zip(row_i, row_k)]
+            if matrix[k][k] < 0:
+                raise GraphError("Negative cost cycle detected!")
+        return vertices, [array('d', row) for row in matrix]
+
+    def bellman_ford(self, gi, source):
+        """ Method that computes the distances from one vertex to every vertex it reaches, also when some costs are
+        negative, using the queue-based Bellman-Ford algorithm (SPFA): only the vertices whose distance improved in
+        the last round are relaxed again, and a shortest path can not have more than V-1 edges unless a negative
+        cost cycle is reachable
+        :param gi: the index of the graph that we perform the search on
+        :param source: the source vertex
+        :return: 2 dictionaries containing:
+                - dist = {the minimal distance from source to every reached vertex}
+                - prev = {the vertex before every reached vertex on a shortest path from source}
+        """
+        graph = self.__view(gi)
+        limit = graph.get_nr_vertices()
+        dist = {source: 0}
+        prev = {}
+        edge_count = {source: 0}    # the number of edges of the current best path to every vertex
+        frontier = deque([source])
+        in_frontier = {source}
+        while frontier:
+            x = frontier.popleft()
+            in_frontier.discard(x)
+            for y in graph.get_n_out(x):
+                new_dist = dist[x] + graph.get_cost(x, y)
+                if y not in dist or new_dist < dist[y]:
+                    dist[y] = new_dist
+                    prev[y] = x
+                    edge_count[y] = edge_count[x] + 1
+                    if edge_count[y] >= limit:
+                        raise GraphError("Negative cost cycle detected!")
+                    if y not in in_frontier:
+                        in_frontier.add(y)
+                        frontier.append(y)
+        return dist, prev
+
+    def get_cache_stats(self):
+        """ Method that returns the statistics of the shortest-path tree cache
+        :return: a dictionary with the hits, misses, evictions, invalidations, the number of cached trees and the
+                 total number of vertices they hold
+        """
+        return self.__path_cache.get_stats()
+
+    def preprocess_landmarks(self, gi, k=8):
+        """ Method that picks k landmark vertices of the graph represented by its index 'gi' and stores their
+        distances to and from every vertex, so that later A* queries on this graph use the ALT lower bounds.
+        The landmarks are picked one by one as the vertex farthest from the ones already picked
+        :param gi: the index of the graph that we perform the preprocessing on
+        :param k: the number of landmarks
+        :return: the list of landmarks
+        """
+        version, graph = self.__searchable(gi)
+        vertices = list(graph.get_vertices())
+        landmarks, dist_from, dist_to = [], [], []
+        closeness = dict.fromkeys(vertices, INFINITY)   # the distance between every vertex and its closest landmark
+        candidate = max(vertices, key=graph.get_out_degree) if vertices else None
+        while candidate is not None and len(landmarks) < k:
+            landmarks.append(candidate)
+            dist_from.append(self.__shortest_path_tree(graph, candidate)[0])
+            dist_to.append(self.__shortest_path_tree(graph, candidate, reverse=True)[0])
+            for v in vertices:
+                distance = min(dist_from[-1].get(v, INFINITY), dist_to[-1].get(v, INFINITY))
+                if distance < closeness[v]:
+                    closeness[v] = distance
+            candidate = None    # the next landmark is the vertex farthest from the landmarks, among the ones they reach
+            for v in vertices:
+                if 0 < closeness[v] < INFINITY and (candidate is None or closeness[v] > closeness[candidate]):
+                    candidate = v
+        self.__landmarks[gi] = (version, Landmarks(landmarks, dist_from, dist_to))
+        return landmarks
+
+    def a_star_algorithm(self, gi, start_v, end_v, heuristic=None):
+        """
+        Method that computes the shortest path between the starting vertex and the ending vertex using the A*
+        algorithm: the vertices are explored in the order of dist(start_v, v) + heuristic(v, end_v), so that the
+        search is led towards end_v. With an admissible heuristic (one that never overestimates the remaining
+        distance) the found path is a shortest one
+        :param gi: the index of the graph that we perform the search on
+        :param start_v: the starting vertex
+        :param end_v: the ending vertex
+        :param heuristic: a callable heuristic(v, end_v) giving a lower bound of the distance from v to end_v;
+                          by default the ALT bounds of preprocess_landmarks are used or, if the graph was not
+                          preprocessed, no heuristic at all (plain Dijkstra)
+        :return: the pair (path, cost) like shortest_path, or ([], None) if end_v can not be reached
+        """
+        graph = self.__view(gi)
+        if heuristic is None:
+            version, landmarks = self.__landmarks.get(gi, (None, None))
+            if version == graph.get_version():
+                heuristic = landmarks.lower_bound
+            else:       # the graph changed since the preprocessing, so the bounds may not hold anymore
+                heuristic = lambda v, t: 0
+        dist = {start_v: 0}
+        prev = {}
+        q = PriorityQueue()
+        q.add(start_v, heuristic(start_v, end_v))
+        while not q.is_empty():
+            x = q.pop()
+            if x == end_v:
+                path = [x]
+                while path[-1] != start_v:
+                    path.append(prev[path[-1]])
+                path.reverse()
+                return path, dist[x]
+            for y in graph.get_n_out(x):
+                new_dist = dist[x] + graph.get_cost(x, y)
+                if y not in dist or new_dist < dist[y]:
+                    estimate = heuristic(y, end_v)
+                    dist[y] = new_dist
+                    prev[y] = x
+                    if estimate != INFINITY:
+                        q.add(y, new_dist + estimate)
+        return [], None
+
+    def shortest_path(self, gi, start_v, end_v):
+        """ Method that finds the shortest path between two vertices of an oriented graph with non-negative costs,
+        reading it from the cached shortest-path tree of start_v if the graph has not been changed since it was
+        computed (a missing tree is not computed, as one bidirectional search settles far fewer vertices)
+        :param gi: the index of the graph that we perform the search on
+        :param start_v: the starting vertex
+        :param end_v: the ending vertex
+        :return: the pair (path, cost) with the list of vertices from start_v to end_v and its total cost, or
+                 ([], None) if end_v can not be reached from start_v
+        """
+        tree = self.__path_cache.get(gi, start_v, self.get_version(gi))
+        if tree is not None:
+            return self.__path_in_tree(gi, tree, start_v, end_v)
+        return self.bidirectional_dijkstra(gi, start_v, end_v)
+
+    def prim_algorithm(self, gi, start_vertex, stats=None):
         """
             Method that computes and creates a minimum spanning tree using Prim's algorithm in a greedy manner
             based on an undirected weighted graph in O(E*logV) where E = total nr of edges, V = total number of vertices
         :param gi: the index of the graph that we perform the search on
         :param start_vertex: the starting vertex
+        :param stats: an AlgorithmStats filled with the counters and phase timings of the call (None for no statistics)
         :return:
                 - edges: a list of all the edges of the MST in the finding order
                 - total_cost: the total cost of the MST (the sum of the edge's costs)
         """
-        q = PriorityQueue()
+        return self.__prim(self.__searchable(gi)[1], start_vertex, NO_STATS if stats is None else stats)
+
+    def __prim(self, graph, start_vertex, stats):
+        stats.start("prim_algorithm")
+        try:
+            if isinstance(graph, CSRGraph):
+                return self.__prim_dense(graph, start_vertex, stats)
+            relaxations = pushes = pops = copies = 0    # counted once per vertex or per improvement, never per edge
+            q = PriorityQueue()
+            total_cost = 0
+            prev = {}
+            dist = {}  #the dictionary which holds on position i the total distance from the starting vertex to the vertex i
+            edges = set()   #the set that holds the edges of the MST
+            s = start_vertex    #the starting vertex
+            visited = set()     #the set which holds the already visited vertices
+            visited.add(s)      #the tree is initially just the starting vertex
+            for vertex in graph.get_n_out(s):               #we add to the priority queue all the neighbours
+                dist[vertex] = graph.get_cost(vertex, s)    #of the starting vertex in order to get the
+                prev[vertex] = s                            #algorithm started
+                q.add(vertex, dist[vertex])
+                pushes += 1
+            stats.phase("setup")
+
+            while not q.is_empty():             #while we got vertices to check
+                x = q.pop()                     #we extract one by one
+                pops += 1
+                if x not in visited:            #and if we have not visited it before
+                    edges.add((prev[x], x))     #we add to the tree the edge from it to its previous
+                    total_cost = total_cost + graph.get_cost(x, prev[x])    #compute the total cost
+                    visited.add(x)              #we mark the vertex as being visited
+                    out_neighbours = graph.get_n_out(x)
+                    copies += 1
+                    relaxations += len(out_neighbours)
+                    for y in out_neighbours:    #we check now for its neighbours
+                        if y not in dist.keys() or graph.get_cost(x, y) < dist[y]:
+                            dist[y] = graph.get_cost(x, y)      #and take the minimum cost edge
+                            q.add(y, dist[y])                   #and add it to the MST
+                            pushes += 1
+                            prev[y] = x
+
+            stats.phase("search")
+            stats.count("settled_vertices", len(visited))
+            stats.count("edge_relaxations", relaxations)
+            stats.count("queue_pushes", pushes)
+            stats.count("queue_pops", pops)
+            stats.count("accessor_copies", copies + 1)
+            return edges, total_cost
+        finally:            # the profiler is disabled even if the algorithm fails
+            stats.stop()
+
+    def __prim_dense(self, dense, start_vertex, stats):
+        _, offsets, targets, weights = dense.get_buffers()[:4]
+        n = dense.get_nr_vertices()
+        relaxations = pushes = pops = 0     # counted once per vertex or per improvement, never per edge
         total_cost = 0
-        prev = {}
-        dist = {}  #the dictionary which holds on position i the total distance from the starting vertex to the vertex i
-        edges = set()   #the set that holds the edges of the MST
-        s = start_vertex    #the starting vertex
-        visited = set()     #the set which holds the already visited vertices
-        visited.add(s)      #the tree is initially just the starting vertex
-        for vertex in self.__graph_list[gi].get_n_out(s):               #we add to the priority queue all the neighbours
-            dist[vertex] = self.__graph_list[gi].get_cost(vertex, s)    #of the starting vertex in order to get the
-            prev[vertex] = s                                            #algorithm started
-            q.add(vertex, dist[vertex])
-
-        while not q.is_empty():             #while we got vertices to check
-            x = q.pop()                     #we extract one by one
-            if x not in visited:            #and if we have not visited it before
-                edges.add((prev[x], x))     #we add to the tree the edge from it to its previous
-                total_cost = total_cost + self.__graph_list[gi].get_cost(x, prev[x])    #compute the total cost
-                visited.add(x)              #we mark the vertex as being visited
-                for y in self.__graph_list[gi].get_n_out(x):    #we check now for its neighbours
-                    if y not in dist.keys() or self.__graph_list[gi].get_cost(x, y) < dist[y]:
-                        dist[y] = self.__graph_list[gi].get_cost(x, y)      #and take the minimum cost edge
-                        q.add(y, dist[y])                                   #and add it to the MST
-                        prev[y] = x
+        dist = [None] * n       #the cost of the cheapest known edge joining the vertex i to the tree, on index i
+        prev = [-1] * n         #the list which holds on index i the tree end of that edge
+        visited = bytearray(n)  #the flags of the vertices already in the tree
+        edges = []              #the pairs of indices of the edges of the MST, in the finding order
+        s = dense.index_of(start_vertex)    #the starting vertex
+        visited[s] = 1          #the tree is initially just the starting vertex
+        heap = []
+        for position in range(offsets[s], offsets[s + 1]):     #we add to the heap all the neighbours of the
+            y = targets[position]                               #starting vertex to get the algorithm started
+            if y != s and (dist[y] is None or weights[position] < dist[y]):
+                dist[y] = weights[position]
+                prev[y] = s
+                heappush(heap, (dist[y], y))
+                pushes += 1
+        stats.phase("setup")
 
+        while heap:                         #while we got vertices to check
+            c, x = heappop(heap)            #we extract one by one
+            pops += 1
+            if visited[x]:                  #a stale entry, the vertex was added to the tree meanwhile
+                continue
+            visited[x] = 1                  #we mark the vertex as being visited
+            edges.append((prev[x], x))      #we add to the tree the edge from it to its previous
+            total_cost = total_cost + c     #compute the total cost
+            relaxations += offsets[x + 1] - offsets[x]
+            for position in range(offsets[x], offsets[x + 1]):  #we check now for its neighbours
+                y = targets[position]
+                if visited[y]:
+                    continue
+                cost = weights[position]
+                if dist[y] is None or cost < dist[y]:
+                    dist[y] = cost                  #and take the minimum cost edge
+                    prev[y] = x
+                    heappush(heap, (cost, y))       #and add it to the MST
+                    pushes += 1
+
+        stats.phase("search")
+        stats.count("settled_vertices", sum(visited))
+        stats.count("edge_relaxations", relaxations)
+        stats.count("queue_pushes", pushes)
+        stats.count("queue_pops", pops)
+        stats.count("accessor_copies", 0)   # the rows are read in place from the CSR arrays
+        sources = dense.vertices_at([edge[0] for edge in edges])
+        return set(zip(sources, dense.vertices_at([edge[1] for edge in edges]))), total_cost
+
+    def kruskal_algorithm(self, gi):
+        """
+            Method that computes a minimum spanning tree (a minimum spanning forest, if the graph is not connected)
+            using Kruskal's algorithm: the edges are sorted once by cost and every edge that does not close a cycle,
+            checked with a disjoint-set structure, is added to the tree, in O(E*logE)
+        :param gi: the index of the graph that we perform the search on
+        :return:
+                - edges: a set of all the edges of the MST
+                - total_cost: the total cost of the MST (the sum of the edge's costs)
+        """
+        graph = self.__view(gi)
+        vertices = tuple(graph.get_vertices())
+        index = {v: i for i, v in enumerate(vertices)}
+        sets = DisjointSet(len(vertices))
+        edges = set()
+        total_cost = 0
+        needed = len(vertices) - 1      # a spanning tree has V-1 edges, so we can stop as soon as we have them
+        for (v1, v2), cost in sorted(graph.get_edges().items(), key=itemgetter(1)):
+            if sets.union(index[v1], index[v2]):
+                edges.add((v1, v2))
+                total_cost = total_cost + cost
+                if len(edges) == needed:
+                    break
         return edges, total_cost
 
-    def find_euler_tour(self, start_vertex, gi):
-        answer = {start_vertex: []}
-        stack = [start_vertex]
-        while len(stack) > 0:
-            x = stack.pop()
-            for y in self.__graph_list[gi].get_n_out(x):
-                if y not in answer.keys():
-                    answer[x].append(y)
-                    answer[y] = []
-                    stack.append(y)
+    def iter_mst_edges(self, gi):
+        """ Generator that yields the edges of the minimum spanning tree (forest) of the graph represented by its
+        index 'gi', taken as undirected, tree by tree in the order Prim's algorithm adds them. Only the tree grown so
+        far and the cheapest known edge joining every frontier vertex to it are kept (in O(V), never O(E)), so
+        stopping after the first k edges costs only the work of reaching them
+        :param gi: the index of the graph that we perform the search on
+        :return: an iterator of triples (v1, v2, cost), every edge oriented like an edge that exists in the graph
+        """
+        graph = self.__view(gi)
+        visited = set()     # the vertices already in the forest
+        for root in graph.get_vertices():
+            if root in visited:
+                continue
+            visited.add(root)
+            q = PriorityQueue()
+            best = {}       # the frontier vertex -> the triple (cost, v1, v2) of its cheapest edge joining the tree
+            x = root
+            while True:
+                for y in graph.get_n_out(x):
+                    if y not in visited:
+                        cost = graph.get_cost(x, y)
+                        if y not in best or cost < best[y][0]:
+                            best[y] = (cost, x, y)
+                            q.add(y, cost)
+                for y in graph.get_n_in(x):
+                    if y not in visited:
+                        cost = graph.get_cost(y, x)
+                        if y not in best or cost < best[y][0]:
+                            best[y] = (cost, y, x)
+                            q.add(y, cost)
+                if q.is_empty():
+                    break
+                x = q.pop()
+                visited.add(x)
+                cost, v1, v2 = best.pop(x)
+                yield v1, v2, cost
+
+    @_writes_graph
+    def attach_dynamic_mst(self, gi):
+        """ Method that computes the minimum spanning tree of the graph represented by its index 'gi' (taken as
+        undirected) and keeps it up to date while the graph is edited through the service, instead of recomputing it
+        :param gi: the index of the graph that we perform the search on
+        :return: the pair (edges, total_cost) of the current tree, like get_dynamic_mst
+        """
+        self.__dynamic_msts[gi] = DynamicMST(self.__graph_list[gi])
+        return self.__dynamic_msts[gi].get_tree()
+
+    @_writes_graph
+    def get_dynamic_mst(self, gi):
+        """ Method that returns the maintained minimum spanning tree of a graph (see attach_dynamic_mst)
+        :param gi: the index of the graph that we perform the search on
+        :return:
+                - edges: a set of all the edges of the MST (a spanning forest if the graph is not connected)
+                - total_cost: the total cost of the MST (the sum of the edge's costs)
+        """
+        if gi not in self.__dynamic_msts:
+            raise GraphError("There is no dynamic MST attached to this graph!")
+        return self.__dynamic_msts[gi].get_tree()
+
+    @_writes_graph
+    def detach_dynamic_mst(self, gi):
+        """ Method that stops maintaining the minimum spanning tree of a graph
+        :param gi: the index of the graph that we perform the search on
+        """
+        self.__dynamic_msts.pop(gi, None)
+
+    def tsp_approximation(self, gi, start_vertex, mode="double_tree", time_budget=0.0):
+        """ Method that finds a short Hamiltonian cycle (travelling salesman tour) through the vertices reached by the
+        minimum spanning tree of start_vertex, working directly on the list of tree edges
+        :param gi: the index of the graph that we perform the search on (it must be UNDIRECTED)
+        :param start_vertex: the vertex the tour starts and ends in
+        :param mode: "double_tree" for the preorder walk of the tree (at most twice the minimum cost) or
+                     "christofides" for the tree plus a greedy matching of its odd-degree vertices
+        :param time_budget: the number of seconds spent improving the tour with 2-opt and Or-opt moves (0 = none)
+        :return:
+                - tour: the list of vertices of the cycle, start_vertex being both the first and the last one
+                - cost: the total cost of the cycle
+        """
+        _, graph = self.__searchable(gi)
+        edges, total_cost = self.__prim(graph, start_vertex, NO_STATS)
+        if mode == "double_tree":
+            tour = double_tree_tour(edges, start_vertex)
+        elif mode == "christofides":
+            tour = christofides_tour(graph, edges, start_vertex)
+        else:
+            raise GraphError("Unknown approximation mode: " + str(mode))
+        if time_budget > 0:
+            tour = improve_tour(graph, tour, time_budget)
+        return tour, tour_cost(graph, tour)
+
+    def find_euler_tour(self, start_vertex, gi, stats=None):
+        """ Method that builds the depth first tree of the vertices reached from start_vertex
+        :param start_vertex: the root of the tree
+        :param gi: the index of the graph that we perform the traversal on
+        :param stats: an AlgorithmStats filled with the counters and phase timings of the call (None for no statistics)
+        :return: the dictionary {vertex: the list of its children in the tree}
+        """
+        stats = NO_STATS if stats is None else stats
+        stats.start("find_euler_tour")
+        try:
+            graph = self.__view(gi)
+            relaxations = 0
+            answer = {start_vertex: []}
+            stack = [start_vertex]
+            pops = 0
+            while len(stack) > 0:
+                x = stack.pop()
+                pops += 1
+                out_neighbours = graph.get_n_out(x)
+                relaxations += len(out_neighbours)
+                for y in out_neighbours:
+                    if y not in answer.keys():
+                        answer[x].append(y)
+                        answer[y] = []
+                        stack.append(y)
+            stats.phase("traversal")
+            stats.count("visited_vertices", len(answer))
+            stats.count("edge_relaxations", relaxations)
+            stats.count("stack_pops", pops)
+            stats.count("accessor_copies", pops)
+        finally:            # the profiler is disabled even if the algorithm fails
+            stats.stop()
         return answer
 
     def delete_graph(self, gi):
-        self.__graph_list.pop()
\ No newline at end of file
+        while True:
+            with self.__list_lock:
+                last = len(self.__graph_list) - 1
+                lock = self.__locks[last]
+            # the readers of the removed graph finish first, without holding the list lock: a reader may be adding a
+            # graph (create_copy, materialise_component) and so waiting for the list lock while holding the graph's
+            with lock.writing():
+                with self.__list_lock:
+                    if len(self.__locks) - 1 != last or self.__locks[last] is not lock:
+                        continue    # the list changed meanwhile, so the graph is no longer the last one
+                    self.__landmarks.pop(last, None)
+                    self.__dynamic_msts.pop(last, None)
+                    self.__dense_graphs.pop(last, None)
+                    self.__views.pop(last, None)
+                    self.__path_cache.invalidate_graph(last)
+                    self.__graph_list.pop()
+                    self.__locks.pop()
+                    return
@@ -0,0 +1,217 @@
+"""
+Approximations of the travelling salesman problem (a Hamiltonian cycle of minimum cost) built directly on the edge
+list of a minimum spanning tree, plus local-search improvement of the resulting tour
+"""
+import time
+
+INFINITY = float("inf")
+EPSILON = 1e-9      # the smallest gain for which a local-search move is applied
+
+
+def edge_cost(graph, u, v):
+    """
+    :return: the cost of going between u and v, in any direction (inf if there is no edge between them)
+    """
+    if graph.is_edge(u, v):
+        return graph.get_cost(u, v)
+    if graph.is_edge(v, u):
+        return graph.get_cost(v, u)
+    return INFINITY
+
+
+def tour_cost(graph, tour):
+    """
+    :param tour: a closed tour (the first vertex is repeated at the end)
+    :return: the total cost of the tour (inf if two consecutive vertices are not linked by an edge)
+    """
+    return sum(edge_cost(graph, u, v) for u, v in zip(tour, tour[1:]))
+
+
+def _adjacency(tree_edges):
+    adjacency = {}
+    for u, v in tree_edges:
+        adjacency.setdefault(u, []).append(v)
+        adjacency.setdefault(v, []).append(u)
+    return adjacency
+
+
+def double_tree_tour(tree_edges, start):
+    """
+    Double-tree approximation: doubling every tree edge gives an Eulerian multigraph whose Euler tour, shortcut to
+    the first visit of every vertex, is exactly a preorder walk of the tree; by the triangle inequality its cost is
+    at most 2 * OPT. Runs in O(V)
+    :param tree_edges: the edges of a spanning tree
+    :param start: the starting vertex
+    :return: the closed tour (start is repeated at the end)
+    """
+    adjacency = _adjacency(tree_edges)
+    tour = []
+    visited = {start}
+    stack = [start]
+    while stack:
+        x = stack.pop()
+        tour.append(x)
+        for y in reversed(adjacency.get(x, [])):
+            if y not in visited:
+                visited.add(y)
+                stack.append(y)
+    tour.append(start)
+    return tour
+
+
+def christofides_tour(graph, tree_edges, start):
+    """
+    Christofides-style approximation: the odd-degree vertices of the tree are matched in pairs and the matching
+    edges are added to the tree, which gives an Eulerian multigraph; its Euler tour is shortcut to a Hamiltonian
+    cycle. The matching is built greedily (cheapest pairs first) instead of being a minimum one, so the 1.5 * OPT
+    guarantee of the exact algorithm does not hold, although the tours are usually better than the double-tree ones.
+    Only the pairs joined by an edge of the graph are candidates, so the matching takes O(E*logE) instead of the
+    O(k^2) of all the pairs of the k odd vertices; the odd vertices left without a neighbour to match are paired in
+    their order, since every edge between them would be missing (of infinite cost) anyway
+    :param graph: the graph the tree was computed on
+    :param tree_edges: the edges of a spanning tree
+    :param start: the starting vertex
+    :return: the closed tour (start is repeated at the end)
+    """
+    edges = list(tree_edges)
+    adjacency = _adjacency(edges)
+    odd = [v for v, neighbours in adjacency.items() if len(neighbours) % 2 == 1]
+    odd_index = {v: i for i, v in enumerate(odd)}
+    pairs = []
+    for i, v in enumerate(odd):
+        for y in set(graph.get_n_out(v)).union(graph.get_n_in(v)):
+            j = odd_index.get(y)
+            if j is not None and j > i:
+                pairs.append((edge_cost(graph, v, y), i, j))
+    pairs.sort()
+    matched = set()
+    for cost, i, j in pairs:
+        if i not in matched and j not in matched:
+            matched.add(i)
+            matched.add(j)
+            edges.append((odd[i], odd[j]))
+    unmatched = [v for i, v in enumerate(odd) if i not in matched]
+    edges.extend(zip(unmatched[0::2], unmatched[1::2]))
+    # Hierholzer's algorithm: every edge of the multigraph (known by its position in edges) is used exactly once
+    incident = {start: []}
+    for number, (u, v) in enumerate(edges):
+        incident.setdefault(u, []).append((v, number))
+        incident.setdefault(v, []).append((u, number))
+    used = bytearray(len(edges))
+    position = dict.fromkeys(incident, 0)
+    stack = [start]
+    euler = []
+    while stack:
+        x = stack[-1]
+        neighbours = incident[x]
+        while position[x] < len(neighbours) and used[neighbours[position[x]][1]]:
+            position[x] += 1
+        if position[x] < len(neighbours):
+            y, number = neighbours[position[x]]
+            used[number] = 1
+            stack.append(y)
+        else:
+            euler.append(stack.pop())
+    tour = []
+    visited = set()
+    for v in reversed(euler):       # shortcutting: every vertex is kept only at its first visit
+        if v not in visited:
+            visited.add(v)
+            tour.append(v)
+    tour.append(start)
+    return tour
+
+
+def two_opt(graph, order, deadline):
+    """
+    2-opt local search: two edges (a, b), (c, d) of the tour are replaced by (a, c), (b, d), reversing the part
+    between them, as long as this makes the tour cheaper and there is time left
+    :param graph: the graph of the tour (the costs are taken as symmetric)
+    :param order: the open tour (every vertex once), improved in place; its first vertex never moves
+    :param deadline: the time.perf_counter() moment when the search has to stop
+    :return: True if the tour was improved
+    """
+    n = len(order)
+    changed = False
+    improved = True
+    while improved and time.perf_counter() < deadline:
+        improved = False
+        for i in range(n - 2):
+            if time.perf_counter() >= deadline:
+                break
+            a, b = order[i], order[i + 1]
+            cost_ab = edge_cost(graph, a, b)
+            for j in range(i + 2, n if i > 0 else n - 1):
+                c, d = order[j], order[(j + 1) % n]
+                delta = edge_cost(graph, a, c) + edge_cost(graph, b, d) - cost_ab - edge_cost(graph, c, d)
+                if delta < -EPSILON:
+                    order[i + 1:j + 1] = order[j:i:-1]
+                    b = order[i + 1]
+                    cost_ab = edge_cost(graph, a, b)
+                    improved = changed = True
+    return changed
+
+
+def or_opt(graph, order, deadline, max_segment=3):
+    """
+    Or-opt local search: a segment of 1 to max_segment consecutive vertices is moved (possibly reversed) between two
+    other consecutive vertices of the tour, as long as this makes the tour cheaper and there is time left
+    :param graph: the graph of the tour (the costs are taken as symmetric)
+    :param order: the open tour (every vertex once), improved in place; its first vertex never moves
+    :param deadline: the time.perf_counter() moment when the search has to stop
+    :param max_segment: the length of the longest moved segment
+    :return: True if the tour was improved
+    """
+    n = len(order)
+    changed = False
+    improved = True
+    while improved and time.perf_counter() < deadline:
+        improved = False
+        for length in range(1, max_segment + 1):
+            i = 1
+            while i + length <= n and time.perf_counter() < deadline:
+                segment = order[i:i + length]
+                before, after = order[i - 1], order[(i + length) % n]
+                first, last = segment[0], segment[-1]
+                gain = edge_cost(graph, before, first) + edge_cost(graph, last, after) - edge_cost(graph, before, after)
+                rest = order[:i] + order[i + length:]
+                move = None
+                for j in range(len(rest)):
+                    a, b = rest[j], rest[(j + 1) % len(rest)]
+                    if a == before:
+                        continue        # that is where the segment already is
+                    cost_ab = edge_cost(graph, a, b)
+                    added = edge_cost(graph, a, first) + edge_cost(graph, last, b) - cost_ab
+                    if added < gain - EPSILON:
+                        move, gain = (j, False), added
+                    added = edge_cost(graph, a, last) + edge_cost(graph, first, b) - cost_ab
+                    if added < gain - EPSILON:
+                        move, gain = (j, True), added
+                if move is not None:
+                    j, reverse = move
+                    if reverse:
+                        segment.reverse()
+                    order[:] = rest[:j + 1] + segment + rest[j + 1:]
+                    improved = changed = True
+                i += 1
+    return changed
+
+
+def improve_tour(graph, tour, time_budget):
+    """
+    Improves a tour with alternating 2-opt and Or-opt passes until none of them helps or the time is up
+    :param graph: the graph of the tour
+    :param tour: the closed tour (the first vertex is repeated at the end)
+    :param time_budget: the number of seconds the improvement may take
+    :return: the improved closed tour, starting in the same vertex
+    """
+    deadline = time.perf_counter() + time_budget
+    order = tour[:-1]
+    if len(order) < 4:
+        return tour
+    while time.perf_counter() < deadline:
+        improved = two_opt(graph, order, deadline)
+        improved = or_opt(graph, order, deadline) or improved
+        if not improved:
+            break
+    return order + [order[0]]
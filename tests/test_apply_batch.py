@@ -0,0 +1,68 @@
+import unittest
+
+from domain.graph import Graph
+from errors.exceptions import GraphError
+from service.service import Service
+
+
+def square_graph():
+    graph = Graph(0, 0)
+    for v in range(4):
+        graph.add_vertex(v)
+    for v in range(4):
+        graph.add_edge(v, (v + 1) % 4, 10 * (v + 1))
+    return graph
+
+
+class ApplyBatchTest(unittest.TestCase):
+    def setUp(self):
+        self.graph = square_graph()
+        self.edges = dict(self.graph.get_edges())
+
+    def assertUnchanged(self):
+        self.assertEqual(self.edges, dict(self.graph.get_edges()))
+        self.assertEqual(4, self.graph.get_nr_edges())
+        for v in range(4):
+            self.assertEqual(((v + 1) % 4,), self.graph.get_n_out(v))
+            self.assertEqual(((v - 1) % 4,), self.graph.get_n_in(v))
+
+    def test_applied(self):
+        count = self.graph.apply_batch([("add", 0, 2, 5), ("remove", 1, 2), ("set_cost", 3, 0, 1)])
+        self.assertEqual(3, count)
+        self.assertEqual({(0, 1): 10, (0, 2): 5, (2, 3): 30, (3, 0): 1}, dict(self.graph.get_edges()))
+        self.assertEqual(4, self.graph.get_nr_edges())
+
+    def test_rolled_back(self):
+        ops = [("add", 0, 2, 5), ("remove", 1, 2), ("set_cost", 3, 0, 1), ("set_cost", 0, 1, 7), ("add", 0, 9, 1)]
+        with self.assertRaises(GraphError) as raised:
+            self.graph.apply_batch(ops)
+        self.assertIn("Operation 4", str(raised.exception))
+        self.assertUnchanged()
+
+    def test_invalid_operations(self):
+        for op in [("remove", 0, 2), ("set_cost", 0, 2, 1), ("add", 0, 1, 3), ("move", 0, 1), ("add", 0, 2), ()]:
+            with self.assertRaises(GraphError):
+                self.graph.apply_batch([("set_cost", 0, 1, 99), op])
+            self.assertUnchanged()
+
+    def test_rolled_back_on_a_snapshot(self):
+        copy = self.graph.snapshot()
+        with self.assertRaises(GraphError):
+            copy.apply_batch([("remove", 0, 1), ("add", 1, 3, 2), ("remove", 0, 1)])
+        self.assertUnchanged()
+        self.assertEqual(self.edges, dict(copy.get_edges()))
+
+    def test_service_batch(self):
+        srv = Service()
+        srv.add_graph(self.graph)
+        tree = srv.attach_dynamic_mst(0)
+        with self.assertRaises(GraphError):
+            srv.apply_batch(0, [("set_cost", 0, 1, 1), ("remove", 2, 0)])
+        self.assertUnchanged()
+        self.assertEqual(tree, srv.get_dynamic_mst(0))
+        self.assertEqual(2, srv.apply_batch(0, [("set_cost", 0, 1, 1), ("remove", 1, 2)])["operations"])
+        self.assertEqual(71, srv.get_dynamic_mst(0)[1])
+
+
+if __name__ == "__main__":
+    unittest.main()
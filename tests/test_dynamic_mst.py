@@ -0,0 +1,73 @@
+import random
+import unittest
+
+from domain.dynamic_mst import DynamicMST
+from domain.graph import Graph
+from service.service import Service
+
+
+class DynamicMSTTest(unittest.TestCase):
+    """ The maintained tree always costs as much as a tree rebuilt from scratch after the same changes """
+    def setUp(self):
+        self.srv = Service()
+        self.srv.add_graph(Graph(0, 0))
+        self.gi = 0
+        self.mirror = Graph(0, 0)   # the same graph, changed directly, whose tree is rebuilt every time
+
+    def add_vertex(self, v):
+        self.srv.add_new_vertex(v, self.gi)
+        self.mirror.add_vertex(v)
+
+    def assertSameAsRebuilt(self):
+        edges, total_cost = self.srv.get_dynamic_mst(self.gi)
+        self.assertEqual(DynamicMST(self.mirror).get_total_cost(), total_cost)
+        self.assertEqual(total_cost, sum(self.mirror.get_cost(v1, v2) for v1, v2 in edges))
+        self.assertEqual(len(DynamicMST(self.mirror).get_tree()[0]), len(edges))
+
+    def test_random_changes(self):
+        rng = random.Random(13)
+        for v in range(30):
+            self.add_vertex(v)
+        self.srv.attach_dynamic_mst(self.gi)
+        next_vertex = 30
+        for _ in range(400):
+            vertices = list(self.mirror.get_vertices())
+            v1, v2 = rng.choice(vertices), rng.choice(vertices)
+            edges = list(self.mirror.get_edges())
+            kind = rng.random()
+            if kind < 0.45 and v1 != v2 and not self.mirror.is_edge(v1, v2):
+                cost = rng.randrange(1, 50)
+                self.srv.add_new_edge(v1, v2, cost, self.gi)
+                self.mirror.add_edge(v1, v2, cost)
+            elif kind < 0.65 and edges:
+                v1, v2 = rng.choice(edges)
+                self.srv.remove_an_edge(v1, v2, self.gi)
+                self.mirror.remove_edge(v1, v2)
+            elif kind < 0.9 and edges:
+                v1, v2 = rng.choice(edges)
+                cost = rng.randrange(1, 50)
+                self.srv.set_cost_of_edge(v1, v2, cost, self.gi)
+                self.mirror.set_cost(v1, v2, cost)
+            elif kind < 0.95:
+                self.add_vertex(next_vertex)
+                next_vertex += 1
+            elif len(vertices) > 2:
+                self.srv.remove_vertex(v1, self.gi)
+                self.mirror.remove_vertex(v1)
+            self.assertSameAsRebuilt()
+
+    def test_unnotified_change(self):
+        for v in range(3):
+            self.add_vertex(v)
+        self.srv.add_new_edge(0, 1, 4, self.gi)
+        self.mirror.add_edge(0, 1, 4)
+        self.srv.attach_dynamic_mst(self.gi)
+        self.srv.apply_batch(self.gi, [("add", 1, 2, 1), ("add", 0, 2, 2)])
+        for v1, v2, cost in [(1, 2, 1), (0, 2, 2)]:
+            self.mirror.add_edge(v1, v2, cost)
+        self.assertSameAsRebuilt()
+        self.assertEqual(3, self.srv.get_dynamic_mst(self.gi)[1])
+
+
+if __name__ == "__main__":
+    unittest.main()
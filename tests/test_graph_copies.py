@@ -0,0 +1,62 @@
+import unittest
+
+from domain.graph import Graph
+
+
+def cycle_graph(n):
+    graph = Graph(0, 0)
+    for v in range(n):
+        graph.add_vertex(v)
+    for v in range(n):
+        graph.add_edge(v, (v + 1) % n, v + 1)
+    return graph
+
+
+class SnapshotIsolationTest(unittest.TestCase):
+    def setUp(self):
+        self.graph = cycle_graph(5)
+        self.copy = self.graph.snapshot()
+        self.edges = dict(self.graph.get_edges())
+
+    def assertUnchanged(self, graph):
+        self.assertEqual(self.edges, dict(graph.get_edges()))
+        self.assertEqual(list(range(5)), sorted(graph.get_vertices()))
+        self.assertEqual(5, graph.get_nr_edges())
+        for v in range(5):
+            self.assertEqual(((v + 1) % 5,), graph.get_n_out(v))
+            self.assertEqual(((v - 1) % 5,), graph.get_n_in(v))
+
+    def test_changes_of_the_original(self):
+        self.graph.set_cost(0, 1, 100)
+        self.graph.add_edge(0, 2, 7)
+        self.graph.remove_edge(3, 4)
+        self.graph.add_vertex(5)
+        self.graph.remove_vertex(1)
+        self.assertUnchanged(self.copy)
+        self.assertEqual({(0, 2): 7, (2, 3): 3, (4, 0): 5}, dict(self.graph.get_edges()))
+        self.assertEqual(3, self.graph.get_nr_edges())
+
+    def test_changes_of_the_copy(self):
+        self.copy.set_cost(0, 1, 100)
+        self.copy.remove_vertex(2)
+        self.assertUnchanged(self.graph)
+        self.assertEqual(100, self.copy.get_cost(0, 1))
+
+    def test_snapshot_of_a_snapshot(self):
+        second = self.copy.snapshot()
+        second.set_cost(4, 0, 0)
+        self.copy.remove_edge(4, 0)
+        self.assertUnchanged(self.graph)
+        self.assertEqual(0, second.get_cost(4, 0))
+        self.assertFalse(self.copy.is_edge(4, 0))
+
+    def test_versions(self):
+        self.assertEqual(self.graph.get_version(), self.copy.get_version())
+        version = self.copy.get_version()
+        self.graph.set_cost(0, 1, 100)
+        self.assertNotEqual(version, self.graph.get_version())
+        self.assertEqual(version, self.copy.get_version())
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,70 @@
+import os
+import tempfile
+import unittest
+
+from domain.csr_graph import CSRGraph
+from domain.graph import Graph
+from errors.exceptions import GraphError
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+class GraphFileRoundTripTest(unittest.TestCase):
+    def setUp(self):
+        handle, self.path = tempfile.mkstemp(suffix=".txt")
+        os.close(handle)
+
+    def tearDown(self):
+        os.remove(self.path)
+
+    def assertSameGraph(self, expected, actual):
+        self.assertEqual(set(expected.get_vertices()), set(actual.get_vertices()))
+        self.assertEqual(dict(expected.get_edges()), dict(actual.get_edges()))
+
+    def test_removed_middle_vertex(self):
+        graph = Graph.from_file(os.path.join(ROOT, "random_graph_file.txt"))
+        graph.remove_vertex(3)
+        graph.to_file(self.path)
+        self.assertSameGraph(graph, Graph.from_file(self.path))
+
+    def test_isolated_vertices(self):
+        graph = Graph.from_file(os.path.join(ROOT, "random_graph_file.txt"))
+        graph.remove_vertex(3)
+        graph.add_vertex(12)
+        for v in list(graph.get_n_out(9)) + list(graph.get_n_in(9)):
+            if graph.is_edge(9, v):
+                graph.remove_edge(9, v)
+            if graph.is_edge(v, 9):
+                graph.remove_edge(v, 9)
+        graph.to_file(self.path)
+        self.assertSameGraph(graph, Graph.from_file(self.path))
+
+    def test_csr_removed_middle_vertex(self):
+        graph = Graph.from_file(os.path.join(ROOT, "random_graph_file.txt"))
+        graph.remove_vertex(3)
+        dense = CSRGraph.from_graph(graph)
+        dense.to_file(self.path)
+        self.assertSameGraph(graph, Graph.from_file(self.path))
+
+    def test_vertex_typo_is_an_error(self):
+        with open(self.path, "w") as file:
+            file.write("3 2\n0 1 5\n1 2O 7\n")
+        with self.assertRaises(GraphError):
+            Graph.from_file(self.path)
+
+    def test_malformed_lines_with_matching_token_count(self):
+        with open(self.path, "w") as file:
+            file.write("2 2\n0 1\n2 3 4 5\n")
+        with self.assertRaises(GraphError):
+            Graph.from_file(self.path)
+
+    def test_string_ids_on_request(self):
+        with open(self.path, "w") as file:
+            file.write("0 2\na b 5\nb c 7\nd\n")
+        graph = Graph.from_file(self.path, string_ids=True)
+        self.assertEqual({"a", "b", "c", "d"}, set(graph.get_vertices()))
+        self.assertEqual(7, graph.get_cost("b", "c"))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,47 @@
+import random
+import unittest
+
+from domain.graph import Graph
+from service.service import Service
+
+
+def random_graph(n, m, seed):
+    rng = random.Random(seed)
+    graph = Graph(0, 0)
+    for v in range(n):
+        graph.add_vertex(v)
+    while graph.get_nr_edges() < m:
+        v1, v2 = rng.randrange(n), rng.randrange(n)
+        if v1 != v2 and not graph.is_edge(v1, v2):
+            graph.add_edge(v1, v2, rng.randrange(1, 100))
+    return graph
+
+
+class IterMSTEdgesTest(unittest.TestCase):
+    def setUp(self):
+        self.srv = Service()
+        self.graph = random_graph(60, 150, 18)
+        self.srv.add_graph(self.graph)
+
+    def test_same_forest_cost_as_kruskal(self):
+        edges = list(self.srv.iter_mst_edges(0))
+        _, total_cost = self.srv.kruskal_algorithm(0)
+        self.assertEqual(total_cost, sum(cost for _, _, cost in edges))
+        self.assertEqual(len(self.srv.kruskal_algorithm(0)[0]), len(edges))
+        for v1, v2, cost in edges:
+            self.assertEqual(cost, self.graph.get_cost(v1, v2))
+
+    def test_isolated_vertices(self):
+        self.srv.add_new_vertex(60, 0)
+        self.srv.add_new_vertex(61, 0)
+        edges = list(self.srv.iter_mst_edges(0))
+        self.assertFalse(any(60 in edge[:2] or 61 in edge[:2] for edge in edges))
+
+    def test_stopping_early(self):
+        edges = self.srv.iter_mst_edges(0)
+        first = [next(edges) for _ in range(5)]
+        self.assertEqual(first, list(self.srv.iter_mst_edges(0))[:5])
+
+
+if __name__ == "__main__":
+    unittest.main()
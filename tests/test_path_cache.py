@@ -0,0 +1,70 @@
+import unittest
+
+from domain.graph import Graph
+from domain.path_cache import ShortestPathCache
+from service.service import Service
+
+
+def line_graph(n):
+    graph = Graph(0, 0)
+    for v in range(n):
+        graph.add_vertex(v)
+    for v in range(n - 1):
+        graph.add_edge(v, v + 1, 1)
+    return graph
+
+
+class ShortestPathCacheTest(unittest.TestCase):
+    def test_stale_version(self):
+        cache = ShortestPathCache()
+        cache.put(0, "a", 1, {"a": 0}, {})
+        self.assertEqual(({"a": 0}, {}), cache.get(0, "a", 1))
+        self.assertIsNone(cache.get(0, "a", 2))
+        self.assertIsNone(cache.get(0, "a", 1))     # the stale tree was dropped
+        stats = cache.get_stats()
+        self.assertEqual((1, 2, 1, 0), (stats["hits"], stats["misses"], stats["invalidations"], stats["trees"]))
+
+    def test_eviction(self):
+        cache = ShortestPathCache(max_vertices=3)
+        cache.put(0, "a", 1, {"a": 0, "b": 1}, {"b": "a"})
+        cache.put(0, "b", 1, {"b": 0, "c": 1}, {"c": "b"})
+        self.assertIsNone(cache.get(0, "a", 1))
+        self.assertIsNotNone(cache.get(0, "b", 1))
+        self.assertEqual(1, cache.get_stats()["evictions"])
+
+
+class ServiceCacheInvalidationTest(unittest.TestCase):
+    def setUp(self):
+        self.srv = Service()
+        self.srv.add_graph(line_graph(5))
+        self.gi = 0
+
+    def test_edits_invalidate_the_trees(self):
+        self.assertEqual(4, self.srv.shortest_path_tree(self.gi, 0)[0][4])
+        self.srv.set_cost_of_edge(3, 4, 10, self.gi)
+        self.assertEqual(13, self.srv.shortest_path_tree(self.gi, 0)[0][4])
+        self.srv.add_new_edge(0, 4, 2, self.gi)
+        self.assertEqual(([0, 4], 2), self.srv.cached_shortest_path(self.gi, 0, 4))
+        self.srv.remove_an_edge(0, 4, self.gi)
+        self.assertEqual(([0, 1, 2, 3, 4], 13), self.srv.cached_shortest_path(self.gi, 0, 4))
+        self.assertEqual(3, self.srv.get_cache_stats()["invalidations"])
+
+    def test_shortest_path_reads_the_cached_tree(self):
+        self.srv.shortest_path_tree(self.gi, 0)
+        hits = self.srv.get_cache_stats()["hits"]
+        self.assertEqual(([0, 1, 2, 3], 3), self.srv.shortest_path(self.gi, 0, 3))
+        self.assertEqual(hits + 1, self.srv.get_cache_stats()["hits"])
+        self.srv.set_cost_of_edge(0, 1, 5, self.gi)
+        self.assertEqual(([0, 1, 2, 3], 7), self.srv.shortest_path(self.gi, 0, 3))
+        self.assertEqual(([], None), self.srv.shortest_path(self.gi, 3, 0))
+
+    def test_deleted_graph(self):
+        self.srv.create_copy(self.gi)
+        self.srv.shortest_path_tree(1, 0)
+        self.srv.delete_graph(1)
+        self.srv.add_graph(line_graph(2))
+        self.assertEqual({0: 0, 1: 1}, dict(self.srv.shortest_path_tree(1, 0)[0]))
+
+
+if __name__ == "__main__":
+    unittest.main()
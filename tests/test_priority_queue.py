@@ -0,0 +1,66 @@
+import random
+import unittest
+
+from domain.PriorityQueue import LazyPriorityQueue, PriorityQueue
+
+
+class PriorityQueueTest(unittest.TestCase):
+    queue_class = PriorityQueue
+
+    def drain(self, q):
+        popped = []
+        while not q.is_empty():
+            popped.append(q.pop_with_priority())
+        return popped
+
+    def test_pops_in_priority_order(self):
+        q = self.queue_class()
+        for obj, priority in [("a", 5), ("b", 1), ("c", 3), ("d", 4), ("e", 2)]:
+            q.add(obj, priority)
+        self.assertEqual(5, len(q))
+        self.assertEqual(1, q.peek_priority())
+        self.assertEqual([("b", 1), ("e", 2), ("c", 3), ("d", 4), ("a", 5)], self.drain(q))
+
+    def test_decrease_key(self):
+        q = self.queue_class()
+        for obj, priority in [("a", 5), ("b", 1), ("c", 3)]:
+            q.add(obj, priority)
+        self.assertTrue(q.decrease_key("a", 0))
+        self.assertFalse(q.decrease_key("c", 10))   # a higher priority is ignored
+        self.assertEqual(3, len(q))
+        self.assertEqual([("a", 0), ("b", 1), ("c", 3)], self.drain(q))
+
+    def test_add_replaces_the_priority(self):
+        q = self.queue_class()
+        q.add("a", 1)
+        q.add("b", 2)
+        q.add("a", 3)       # an object is stored once, with its last priority
+        self.assertEqual(2, len(q))
+        self.assertTrue(q.contains("a"))
+        self.assertEqual([("b", 2), ("a", 3)], self.drain(q))
+        self.assertFalse(q.contains("a"))
+
+    def test_against_sorting(self):
+        rng = random.Random(7)
+        q = self.queue_class()
+        priorities = {}
+        for _ in range(2000):
+            obj = rng.randrange(300)
+            priority = rng.randrange(1000)
+            if obj in priorities and rng.random() < 0.5:
+                if q.decrease_key(obj, priority):
+                    priorities[obj] = priority
+            else:
+                q.add(obj, priority)
+                priorities[obj] = priority
+        popped = self.drain(q)
+        self.assertEqual(sorted(priorities.values()), [priority for _, priority in popped])
+        self.assertEqual(priorities, dict(popped))
+
+
+class LazyPriorityQueueTest(PriorityQueueTest):
+    queue_class = LazyPriorityQueue
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,85 @@
+import threading
+import time
+import unittest
+
+from domain.rw_lock import ReadWriteLock
+
+TIMEOUT = 5     # the number of seconds after which a thread that did not finish is taken as deadlocked
+WAIT = 0.1      # the number of seconds a blocked thread is given to (wrongly) get the lock
+
+
+class ReadWriteLockTest(unittest.TestCase):
+    def setUp(self):
+        self.lock = ReadWriteLock()
+
+    def start(self, target):
+        """ Runs target in a daemon thread and returns an event set once it returned """
+        done = threading.Event()
+
+        def run():
+            target()
+            done.set()
+
+        threading.Thread(target=run, daemon=True).start()
+        return done
+
+    def read_once(self):
+        with self.lock.reading():
+            pass
+
+    def write_once(self):
+        with self.lock.writing():
+            pass
+
+    def test_reentrant_reads_and_writes(self):
+        with self.lock.reading():
+            with self.lock.reading():
+                self.assertTrue(self.start(self.read_once).wait(TIMEOUT))    # other readers still get in
+        with self.lock.writing():
+            with self.lock.writing():
+                with self.lock.reading():
+                    pass
+            self.assertFalse(self.start(self.read_once).wait(WAIT))        # the writer still holds it alone
+        self.assertTrue(self.start(self.write_once).wait(TIMEOUT))
+
+    def test_write_while_reading_is_an_error(self):
+        with self.lock.reading():
+            with self.assertRaises(RuntimeError):
+                self.lock.acquire_write()
+        self.assertTrue(self.start(self.write_once).wait(TIMEOUT))
+
+    def test_release_without_holding_is_an_error(self):
+        with self.assertRaises(RuntimeError):
+            self.lock.release_read()
+        with self.assertRaises(RuntimeError):
+            self.lock.release_write()
+
+    def test_writers_exclude_readers(self):
+        with self.lock.writing():
+            read = self.start(self.read_once)
+            self.assertFalse(read.wait(WAIT))
+        self.assertTrue(read.wait(TIMEOUT))
+
+    def test_writer_preference(self):
+        with self.lock.reading():
+            written = self.start(self.write_once)
+            time.sleep(WAIT)                        # the writer now waits for this reader
+            read = self.start(self.read_once)
+            self.assertFalse(read.wait(WAIT))       # so a new reader waits behind it
+            self.assertFalse(written.is_set())
+        self.assertTrue(written.wait(TIMEOUT))
+        self.assertTrue(read.wait(TIMEOUT))
+
+    def test_downgrade(self):
+        self.lock.acquire_write()
+        self.lock.acquire_read()
+        self.lock.release_write()                   # the thread keeps the lock for reading only
+        self.assertTrue(self.start(self.read_once).wait(TIMEOUT))
+        written = self.start(self.write_once)
+        self.assertFalse(written.wait(WAIT))
+        self.lock.release_read()
+        self.assertTrue(written.wait(TIMEOUT))
+
+
+if __name__ == "__main__":
+    unittest.main()
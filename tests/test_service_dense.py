@@ -0,0 +1,73 @@
+import unittest
+
+from domain.graph import Graph
+from service.service import DENSE_AFTER, Service
+
+RUNS = DENSE_AFTER + 2      # enough runs for the service to switch to the CSR form of the graph
+
+
+def undirected_graph(edges):
+    graph = Graph(0, 0)
+    for v1, v2, cost in edges:
+        for v in (v1, v2):
+            if v not in graph.get_vertices():
+                graph.add_vertex(v)
+        graph.add_edge(v1, v2, cost)
+        graph.add_edge(v2, v1, cost)
+    return graph
+
+
+class DenseSwitchTest(unittest.TestCase):
+    """ The long algorithms give the same results whether they run on the graph or on its CSR form """
+    def setUp(self):
+        self.srv = Service()
+        # integer costs mixed with a real one, on a graph whose shortest paths are unique
+        self.srv.add_graph(undirected_graph([(0, 1, 4), (1, 2, 3), (0, 2, 9), (2, 3, 2.5), (3, 4, 1),
+                                         (1, 4, 8)]))
+        self.gi = 0
+        self.srv.add_new_vertex(7, self.gi)     # an isolated vertex, reached by no search
+
+    def assertSameEveryRun(self, call):
+        results = [call() for _ in range(RUNS)]
+        for result in results[1:]:
+            self.assertEqual(results[0], result)
+            self.assertEqual(repr(results[0]), repr(result))    # the same types too, e.g. 7 and not 7.0
+
+    def assertRaisesEveryRun(self, exception, call):
+        for _ in range(RUNS):
+            with self.assertRaises(exception):
+                call()
+
+    def test_dijkstra(self):
+        self.assertSameEveryRun(lambda: self.srv.dijkstra_algorithm(self.gi, 0, 2))
+        self.assertSameEveryRun(lambda: self.srv.dijkstra_algorithm(self.gi, 0, 7))
+        self.assertEqual(7, self.srv.dijkstra_algorithm(self.gi, 0, 2)[0][2])
+
+    def test_shortest_path(self):
+        self.assertSameEveryRun(lambda: self.srv.shortest_path(self.gi, 0, 4))
+        self.assertSameEveryRun(lambda: self.srv.shortest_path(self.gi, 0, 7))
+        self.assertEqual(([0, 1, 2], 7), self.srv.shortest_path(self.gi, 0, 2))
+
+    def test_single_source_distances(self):
+        self.assertSameEveryRun(lambda: self.srv.single_source_distances(self.gi, 1))
+        self.assertSameEveryRun(lambda: self.srv.single_source_distances(self.gi, 1, reverse=True))
+
+    def test_prim(self):
+        self.assertSameEveryRun(lambda: self.srv.prim_algorithm(self.gi, 0))
+        self.assertEqual(10.5, self.srv.prim_algorithm(self.gi, 0)[1])
+
+    def test_components(self):
+        self.assertSameEveryRun(lambda: self.srv.label_components(self.gi))
+
+    def test_unknown_vertices(self):
+        self.assertRaisesEveryRun(KeyError, lambda: self.srv.dijkstra_algorithm(self.gi, 0, 99))
+        self.assertRaisesEveryRun(KeyError, lambda: self.srv.dijkstra_algorithm(self.gi, 99, 0))
+        self.assertRaisesEveryRun(KeyError, lambda: self.srv.shortest_path(self.gi, 0, 99))
+        self.assertRaisesEveryRun(KeyError, lambda: self.srv.shortest_path(self.gi, 99, 0))
+        self.assertRaisesEveryRun(KeyError, lambda: self.srv.shortest_path(self.gi, 7, 99))
+        self.assertRaisesEveryRun(KeyError, lambda: self.srv.single_source_distances(self.gi, 99))
+        self.assertRaisesEveryRun(KeyError, lambda: self.srv.prim_algorithm(self.gi, 99))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,59 @@
+import threading
+import time
+import unittest
+
+from domain.graph import Graph
+from service.service import Service
+
+TIMEOUT = 5     # the number of seconds after which a thread that did not finish is taken as deadlocked
+
+
+def path_graph(n):
+    graph = Graph(0, 0)
+    for v in range(n):
+        graph.add_vertex(v)
+    for v in range(n - 1):
+        graph.add_edge(v, v + 1, 1)
+    return graph
+
+
+class ConcurrentDeleteTest(unittest.TestCase):
+    def setUp(self):
+        self.srv = Service()
+        self.srv.add_graph(path_graph(5))
+
+    def test_delete_while_a_reader_copies(self):
+        reading = threading.Event()
+
+        def copy_while_reading():
+            with self.srv.get_lock(0).reading():
+                reading.set()
+                time.sleep(0.1)             # the deletion now waits for the graph lock
+                self.srv.create_copy(0)
+
+        copied = threading.Thread(target=copy_while_reading, daemon=True)
+        deleted = threading.Thread(target=self.srv.delete_graph, args=(0,), daemon=True)
+        copied.start()
+        reading.wait(TIMEOUT)
+        deleted.start()
+        copied.join(TIMEOUT)
+        deleted.join(TIMEOUT)
+        self.assertFalse(copied.is_alive())
+        self.assertFalse(deleted.is_alive())
+        # the copy was added first, so it is the last graph, the one deleted
+        self.assertEqual(1, self.srv.get_nr_graphs())
+        self.assertEqual(list(range(5)), sorted(self.srv.get_vertices(0)))
+
+    def test_delete_releases_the_lock(self):
+        self.srv.create_copy(0)
+        lock = self.srv.get_lock(1)
+        self.srv.delete_graph(1)
+        self.assertEqual(1, self.srv.get_nr_graphs())
+        with self.assertRaises(IndexError):
+            self.srv.get_lock(1)
+        self.srv.create_copy(0)
+        self.assertIsNot(lock, self.srv.get_lock(1))
+
+
+if __name__ == "__main__":
+    unittest.main()